@@ -102,12 +102,12 @@ class BUFRProcessingDaemon(FTPDaemon):
 
         if success and self.processing_callback:
             # Process the file
-            filename = Path(remote_path).name
+            filename = remote_path.rpartition("/")[2]
             local_path = self.config.local_download_dir / filename
 
             try:
                 print(f"Processing {filename}...")
-                await asyncio.get_event_loop().run_in_executor(None, self.processing_callback, local_path)
+                await asyncio.get_running_loop().run_in_executor(None, self.processing_callback, local_path)
                 print(f"Processed {filename}")
             except Exception as e:
                 print(f"Error processing {filename}: {e}")
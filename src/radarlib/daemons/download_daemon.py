@@ -7,11 +7,12 @@ and downloads new files, similar to the process_new_files pattern in FTPRadarDae
 
 import asyncio
 import logging
+import os
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Generator, Iterator, List, Optional, Set, Tuple
 
 from radarlib.io.ftp.ftp import exponential_backoff_retry
 from radarlib.io.ftp.ftp_client import FTPError, RadarFTPClientAsync
@@ -20,6 +21,11 @@ from radarlib.utils.names_utils import build_vol_types_regex, extract_bufr_filen
 
 logger = logging.getLogger(__name__)
 
+# Finished downloads recorded per tracker transaction
+_TRACKER_BATCH_SIZE = 32
+# Traversal results checked against the tracker per query
+_DEDUP_BATCH_SIZE = 64
+
 
 class DownloadDaemonError(Exception):
     """Base class for Download Daemon errors."""
@@ -45,6 +51,7 @@ class DownloadDaemonConfig:
     bufr_download_max_retries: int = 3
     bufr_download_base_delay: float = 1
     bufr_download_max_delay: float = 30
+    ftp_keepalive_interval: float = 30
 
     def __post_init__(self):
         """Set default start_date to now UTC rounded to nearest hour if not provided."""
@@ -123,7 +130,24 @@ class DownloadDaemon:
         """
         logger.info(f"[{self.radar_name}] Starting continuous daemon with poll interval: {self.poll_interval} seconds")
 
+        client = RadarFTPClientAsync(
+            self.config.host,
+            self.config.username,
+            self.config.password,
+            max_workers=self.config.max_concurrent_downloads,
+        )
+        try:
+            await self._poll_forever(client)
+        finally:
+            client.close()
+
+    async def _poll_forever(self, client: RadarFTPClientAsync):
+        """Poll loop of run_service, sharing a single FTP client across cycles."""
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
         while True:
+            # Polls start every poll_interval seconds, however long each cycle takes
+            next_poll += self.poll_interval
             try:
                 # Determine resume date: use latest downloaded file if available and newer than start_date
                 resume_date: datetime = self.start_date  # type: ignore
@@ -151,75 +175,165 @@ class DownloadDaemon:
                     else:
                         logger.warning(f"[{self.radar_name}] No start date configured")
 
-                async with RadarFTPClientAsync(
-                    self.config.host,
-                    self.config.username,
-                    self.config.password,
-                    max_workers=self.config.max_concurrent_downloads,
-                ) as client:
-                    logger.debug(f"[{self.radar_name}] Connected to FTP server. Checking for new files...")
-                    files = self.new_bufr_files(
-                        ftp_client=client, start_date=resume_date, end_date=None, vol_types=self.vol_types
-                    )
-                    if files:
-                        tasks = []
-                        for remote, local, fname, dt, status in files:
-
-                            async def download_one(
-                                remote_path=remote, local_path=local, fname=fname, dt=dt, status=status
-                            ):
-                                components = extract_bufr_filename_components(fname)
-                                try:
-                                    await exponential_backoff_retry(
-                                        lambda: client.download_file_async(remote_path, local_path),
-                                        max_retries=self.config.bufr_download_max_retries,
-                                        base_delay=self.config.bufr_download_base_delay,
-                                        max_delay=self.config.bufr_download_max_delay,
-                                    )
-                                    # success → update DB
-                                    # Calculate checksum if enabled
-                                    checksum = None
-                                    # TODO: implement checksum calculation asynchronously
-                                    # Get file size
-                                    file_size = local_path.stat().st_size
-
-                                    self.state_tracker.mark_downloaded(
-                                        fname,
-                                        str(remote_path),
-                                        str(local_path),
-                                        file_size=file_size,
-                                        checksum=checksum,
-                                        radar_name=self.radar_name,
-                                        strategy=components["strategy"],
-                                        vol_nr=components["vol_nr"],
-                                        field_type=components["field_type"],
-                                        observation_datetime=dt,
-                                    )
-                                    logger.info(f"[{self.radar_name}] Downloaded {fname}")
-                                except FTPError as e:
-                                    self.state_tracker.mark_failed(
-                                        fname,
-                                        str(remote_path),
-                                        str(local_path),
-                                        radar_name=self.radar_name,
-                                        strategy=components["strategy"],
-                                        vol_nr=components["vol_nr"],
-                                        field_type=components["field_type"],
-                                        observation_datetime=dt,
-                                    )
-                                    logger.error(f"[{self.radar_name}] FTPError for {fname}: {e}")
-
-                            tasks.append(asyncio.create_task(download_one()))
-
-                        await asyncio.gather(*tasks)
-                        logger.info(f"[{self.radar_name}] Processed {len(files)} files.")
-                    else:
-                        logger.info(f"[{self.radar_name}] No new files.")
+                # Reuse the control connection across polls: a NOOP probe checks it and
+                # we only reconnect (and log in again) when the peer has gone away.
+                await asyncio.to_thread(client.ensure_connected)
+                logger.debug(f"[{self.radar_name}] Connected to FTP server. Checking for new files...")
+                # Candidates are produced lazily, so downloads start while the tree is still walked
+                candidates = self.new_bufr_files(
+                    ftp_client=client, start_date=resume_date, end_date=None, vol_types=self.vol_types
+                )
+                processed = await self._download_candidates(client, candidates)
+                if processed:
+                    logger.info(f"[{self.radar_name}] Processed {processed} files.")
+                else:
+                    logger.info(f"[{self.radar_name}] No new files.")
 
             except Exception as e:
                 logger.exception(f"[{self.radar_name}] Error during check_latest_folder: {e}")
 
-            await asyncio.sleep(self.poll_interval)
+            if next_poll < loop.time():
+                # The cycle overran its period: poll again right away, without bursting to catch up
+                next_poll = loop.time()
+            await self._idle(client, next_poll - loop.time())
+
+    async def _idle(self, client: RadarFTPClientAsync, seconds: float) -> None:
+        """
+        Sleep between polls, sending a NOOP every ftp_keepalive_interval seconds.
+
+        Keeps the shared control connection from being dropped by the server's
+        idle timeout. A failed NOOP is only logged: the next cycle's
+        ensure_connected reconnects.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            if remaining <= self.config.ftp_keepalive_interval:
+                await asyncio.sleep(remaining)
+                return
+            await asyncio.sleep(self.config.ftp_keepalive_interval)
+            if not await asyncio.to_thread(client.is_connected):
+                logger.debug(f"[{self.radar_name}] FTP keepalive NOOP failed; reconnecting on next poll")
+
+    async def _download_candidates(self, client: RadarFTPClientAsync, candidates: Iterator[tuple]) -> int:
+        """
+        Download candidates as they are produced, recording results as downloads finish.
+
+        The next candidate is only pulled (in a worker thread, since traversal
+        blocks on FTP listings) once one of max_concurrent_downloads slots is
+        free, so a slow traversal overlaps with downloads and a large backlog
+        does not create thousands of tasks at once. Tracker rows are written in
+        batches of _TRACKER_BATCH_SIZE as tasks complete, from a worker thread so
+        the SQLite commit never stalls the event loop.
+
+        Args:
+            client: FTP client used for traversal and downloads.
+            candidates: Iterator of (remote_path, local_path, filename, datetime, status).
+
+        Returns:
+            Number of candidates dispatched.
+        """
+        slots = asyncio.Semaphore(self.config.max_concurrent_downloads)
+        pending: Set[asyncio.Task] = set()
+        completed: List[dict] = []
+        failed: List[dict] = []
+        dispatched = 0
+
+        def collect(task: asyncio.Task) -> None:
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                logger.error(f"[{self.radar_name}] Unexpected download error: {task.exception()}")
+                return
+            ok, record = task.result()
+            (completed if ok else failed).append(record)
+
+        async def flush(force: bool = False) -> None:
+            if force or len(completed) + len(failed) >= _TRACKER_BATCH_SIZE:
+                batch_completed, batch_failed = completed[:], failed[:]
+                completed.clear()
+                failed.clear()
+                # The commit (and its fsync) runs in a worker thread so downloads keep streaming
+                await asyncio.to_thread(self._record_downloads, batch_completed, batch_failed)
+
+        try:
+            while True:
+                await slots.acquire()
+                candidate = await asyncio.to_thread(next, candidates, None)
+                if candidate is None:
+                    slots.release()
+                    break
+                remote_path, local_path, fname, dt, _status = candidate
+                task = asyncio.create_task(self._download_one(client, remote_path, local_path, fname, dt))
+                task.add_done_callback(lambda _: slots.release())
+                pending.add(task)
+                dispatched += 1
+
+                for task in [t for t in pending if t.done()]:
+                    pending.discard(task)
+                    collect(task)
+                await flush()
+        finally:
+            # Also on a traversal error: let in-flight downloads finish and record them
+            for next_done in asyncio.as_completed(pending):
+                try:
+                    await next_done
+                except Exception:
+                    pass
+            for task in pending:
+                collect(task)
+            await flush(force=True)
+
+        return dispatched
+
+    def _record_downloads(self, completed: List[dict], failed: List[dict]) -> None:
+        """Write one batch of finished downloads to the state tracker."""
+        self.state_tracker.mark_downloaded_many(completed)
+        self.state_tracker.mark_failed_many(failed)
+
+    async def _download_one(
+        self, client: RadarFTPClientAsync, remote_path, local_path: Path, fname: str, dt
+    ) -> Tuple[bool, dict]:
+        """
+        Download a single BUFR file with retries.
+
+        Returns:
+            (succeeded, record), where record holds the mark_downloaded/mark_failed arguments.
+        """
+        components = extract_bufr_filename_components(fname)
+        record = {
+            "filename": fname,
+            "remote_path": os.fspath(remote_path),
+            "local_path": os.fspath(local_path),
+            "radar_name": self.radar_name,
+            "strategy": components["strategy"],
+            "vol_nr": components["vol_nr"],
+            "field_type": components["field_type"],
+            "observation_datetime": dt,
+        }
+        try:
+            # The client reports the final file size, so no stat() is needed. BUFR volumes
+            # never change once published, so a retry continues the partial file.
+            record["file_size"] = await exponential_backoff_retry(
+                lambda: client.fetch_file_async(remote_path, local_path, resume=True),
+                max_retries=self.config.bufr_download_max_retries,
+                base_delay=self.config.bufr_download_base_delay,
+                max_delay=self.config.bufr_download_max_delay,
+                # the client wraps every FTP and socket error in FTPError; permanent 5xx
+                # replies (e.g. 550 file not found) inside it are not retried
+                retry_on=(FTPError,),
+            )
+            # Calculate checksum if enabled
+            # TODO: implement checksum calculation asynchronously
+            record["checksum"] = None
+            logger.info("[%s] Downloaded %s", self.radar_name, fname)
+            return True, record
+        except FTPError as e:
+            logger.error(f"[{self.radar_name}] FTPError for {fname}: {e}")
+            return False, record
 
     def new_bufr_files(
         self,
@@ -227,26 +341,44 @@ class DownloadDaemon:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         vol_types: Optional[re.Pattern] = None,
-    ) -> list:
+    ) -> Generator[tuple, None, None]:
         """
-        Get new BUFR files from FTP server within the specified date range.
+        Yield new BUFR files from FTP server within the specified date range.
+
+        Candidates are yielded in traversal order as soon as they are found, so
+        callers can start downloading while the tree is still being walked.
+        Files the state tracker already records as downloaded (e.g. after a
+        restart) are skipped. Traversal results are checked against the tracker
+        in batches of _DEDUP_BATCH_SIZE names, one query per batch.
 
         Args:
             ftp_client: RadarFTPClientAsync instance.
             start_date: Start date for searching files.
             end_date: End date for searching files.
-            vol_types: Optional dictionary to filter volume types.
+            vol_types: Optional compiled regex to filter volume types.
 
-        Returns:
-            List of tuples (remote_path, local_path, filename, datetime, status).
+        Yields:
+            Tuples (remote_path, local_path, filename, datetime, status).
         """
-        candidates = []
-        for dt, fname, remote in ftp_client.traverse_radar(
+        batch: List[tuple] = []
+        for entry in ftp_client.traverse_radar(
             self.radar_name, start_date, end_date, include_start=False, vol_types=vol_types
         ):
-            local_path = self.local_dir / fname
-            candidates.append((remote, local_path, fname, dt, "new"))
-        return candidates
+            batch.append(entry)
+            if len(batch) >= _DEDUP_BATCH_SIZE:
+                yield from self._skip_downloaded(batch)
+                batch = []
+        yield from self._skip_downloaded(batch)
+
+    def _skip_downloaded(self, entries: List[tuple]) -> Iterator[tuple]:
+        """Yield candidates for the (datetime, filename, remote) entries not yet downloaded."""
+        if not entries:
+            return
+        already = self.state_tracker.filter_downloaded(fname for _, fname, _ in entries)
+        for dt, fname, remote in entries:
+            if fname in already:
+                continue
+            yield remote, self.local_dir / fname, fname, dt, "new"
 
     def stop(self) -> None:
         """Stop the daemon gracefully."""
@@ -2,11 +2,15 @@
 """Date-based daemon service for BUFR file monitoring."""
 
 import asyncio
+import functools
+import hashlib
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from radarlib.io.ftp.client import FTPClient
 from radarlib.io.ftp.ftp import parse_ftp_path
@@ -14,6 +18,12 @@ from radarlib.state.sqlite_tracker import SQLiteStateTracker
 
 logger = logging.getLogger(__name__)
 
+# Volume code, volume number and field type: the 2nd-4th "_"-separated parts of a filename
+_VOLUME_FIELDS_RE = re.compile(r"[^_]*_([^_]*)_([^_]*)_([^_]*)")
+
+# Upper bound on connections used to list the MMSS directories of one hour in parallel
+_LISTING_CONCURRENCY = 8
+
 
 @dataclass
 class DateBasedDaemonConfig:
@@ -88,11 +98,25 @@ class DateBasedFTPDaemon:
             config: Daemon configuration
         """
         self.config = config
-        self.client = FTPClient(config.host, config.username, config.password)
+        self.client = FTPClient(
+            config.host, config.username, config.password, pool_size=config.max_concurrent_downloads
+        )
         self.state_tracker = SQLiteStateTracker(config.state_db)
         self._running = False
         self._download_semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._current_scan_date: Optional[datetime] = None
+        # Fixed part of every scanned path (/L2/RMA1), joined once instead of per hour
+        self._remote_prefix = f"{config.remote_base_path}/{config.radar_code}"
+        # volume_types flattened once into (vol_code, vol_number, field_type) triples
+        self._allowed_volumes: Optional[FrozenSet[Tuple[str, str, str]]] = None
+        if config.volume_types:
+            self._allowed_volumes = frozenset(
+                (vol_code, vol_number, field_type)
+                for vol_code, vol_numbers in config.volume_types.items()
+                for vol_number, field_types in vol_numbers.items()
+                for field_type in field_types
+            )
 
         # Ensure local download directory exists
         self.config.local_download_dir.mkdir(parents=True, exist_ok=True)
@@ -107,6 +131,11 @@ class DateBasedFTPDaemon:
         """
         self._running = True
         self._download_semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
+        # FTP calls block, so they run on threads of our own: one per download slot plus one
+        # for listings, instead of competing with everything else on the loop's default pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_downloads + 1, thread_name_prefix="ftp-daemon"
+        )
 
         logger.info(f"Starting date-based FTP daemon for radar '{self.config.radar_code}'")
         logger.info(f"Date range: {self.config.start_date} to {self.config.end_date or 'ongoing'}")
@@ -147,6 +176,9 @@ class DateBasedFTPDaemon:
         finally:
             self._running = False
             self.state_tracker.close()
+            self.client.close()
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def stop(self) -> None:
         """Stop the daemon gracefully."""
@@ -160,21 +192,20 @@ class DateBasedFTPDaemon:
         Returns:
             datetime to start/resume scanning
         """
-        # Check if we have any downloaded files for this radar
-        files = self.state_tracker.get_files_by_date_range(
+        # One indexed lookup of the newest download for this radar in the range
+        latest = self.state_tracker.get_latest_observation_datetime(
+            self.config.radar_code,
             self.config.start_date,
             self.config.end_date or datetime.now(self.config.start_date.tzinfo),
-            radar_code=self.config.radar_code,
         )
 
-        if files:
-            # Get the latest file info
-            latest_file = files[-1]
-            file_info = self.state_tracker.get_file_info(latest_file)
-            if file_info and file_info["observation_datetime"]:
-                resume_dt = datetime.fromisoformat(file_info["observation_datetime"])
-                logger.info(f"Resuming from last downloaded file at {resume_dt}")
-                return resume_dt
+        if latest:
+            resume_dt = datetime.fromisoformat(latest)
+            if resume_dt.tzinfo is None:
+                # Observation times parsed from FTP paths are stored naive, in the start date's zone
+                resume_dt = resume_dt.replace(tzinfo=self.config.start_date.tzinfo)
+            logger.info(f"Resuming from last downloaded file at {resume_dt}")
+            return resume_dt
 
         logger.info(f"Starting from beginning: {self.config.start_date}")
         return self.config.start_date
@@ -191,30 +222,46 @@ class DateBasedFTPDaemon:
         """
         # Build remote path for this date
         # Format: /L2/RMA1/YYYY/MM/DD/HH/
-        remote_path = (
-            f"{self.config.remote_base_path}/{self.config.radar_code}/"
-            f"{scan_date.year:04d}/{scan_date.month:02d}/{scan_date.day:02d}/"
-            f"{scan_date.hour:02d}"
+        remote_path = "%s/%04d/%02d/%02d/%02d" % (
+            self._remote_prefix,
+            scan_date.year,
+            scan_date.month,
+            scan_date.day,
+            scan_date.hour,
         )
 
         logger.debug(f"Scanning {remote_path}")
 
         try:
-            # List directories (MMSS format)
-            loop = asyncio.get_event_loop()
-            minute_dirs = await loop.run_in_executor(None, self._list_minute_directories, remote_path)
+            # One recursive listing of the hour, over a single connection, instead of one
+            # listing (and executor hop) per MMSS directory
+            loop = asyncio.get_running_loop()
+            files_by_minute = await loop.run_in_executor(self._executor, self._list_hour_files, remote_path)
+
+            # One batched lookup for the whole hour instead of an is_downloaded query per file
+            downloaded = await loop.run_in_executor(
+                self._executor,
+                self.state_tracker.filter_downloaded,
+                [filename for files in files_by_minute.values() for filename in files],
+            )
 
             new_files_count = 0
+            completed: List[Dict[str, Any]] = []
+            failed: List[Dict[str, Any]] = []
 
-            for minute_dir in minute_dirs:
-                files_dir = f"{remote_path}/{minute_dir}"
-                files = await loop.run_in_executor(None, self._list_bufr_files, files_dir)
-
-                for filename in files:
-                    if not self.state_tracker.is_downloaded(filename):
-                        remote_file_path = f"{files_dir}/{filename}"
-                        await self._download_file_async(remote_file_path, filename)
-                        new_files_count += 1
+            try:
+                for minute_dir, files in files_by_minute.items():
+                    files_dir = f"{remote_path}/{minute_dir}"
+
+                    for filename in files:
+                        if filename not in downloaded:
+                            remote_file_path = f"{files_dir}/{filename}"
+                            ok, record = await self._download_file_async(remote_file_path, filename)
+                            (completed if ok else failed).append(record)
+                            new_files_count += 1
+            finally:
+                # One commit for the whole scan instead of one per file
+                await loop.run_in_executor(self._executor, self._record_downloads, completed, failed)
 
             if new_files_count > 0:
                 logger.info(f"Downloaded {new_files_count} new files from {remote_path}")
@@ -225,41 +272,35 @@ class DateBasedFTPDaemon:
             logger.debug(f"Could not scan {remote_path}: {e}")
             return 0
 
-    def _list_minute_directories(self, remote_path: str) -> List[str]:
+    def _list_hour_files(self, remote_path: str) -> Dict[str, List[str]]:
         """
-        List minute/second directories (MMSS format).
+        List the BUFR files of an hour directory, grouped by minute/second directory.
 
         Args:
             remote_path: Path to hour directory
 
         Returns:
-            List of MMSS directory names
+            Mapping of MMSS directory name to its BUFR filenames, in MMSS order
         """
         try:
-            items = self.client.list_files(remote_path)
-            # Filter for 4-digit directories (MMSS format)
-            return [item for item in items if isinstance(item, str) and item.isdigit() and len(item) == 4]
+            entries = self.client.list_recursive(
+                remote_path,
+                max_depth=1,
+                max_concurrent=min(_LISTING_CONCURRENCY, self.config.max_concurrent_downloads),
+            )
         except Exception as e:
-            logger.debug(f"Could not list directories in {remote_path}: {e}")
-            return []
+            logger.debug(f"Could not list files in {remote_path}: {e}")
+            return {}
 
-    def _list_bufr_files(self, remote_path: str) -> List[str]:
-        """
-        List BUFR files in a directory.
+        grouped: Dict[str, List[str]] = {}
+        for entry in entries:
+            minute_dir, _, filename = entry.partition("/")
+            # Keep files in 4-digit directories (MMSS format) only
+            if not (filename and minute_dir.isdigit() and len(minute_dir) == 4 and filename.endswith(".BUFR")):
+                continue
+            grouped.setdefault(minute_dir, []).append(filename)
 
-        Args:
-            remote_path: Path to MMSS directory
-
-        Returns:
-            List of BUFR filenames
-        """
-        try:
-            items = self.client.list_files(remote_path)
-            bufr_files = [item for item in items if isinstance(item, str) and item.endswith(".BUFR")]
-            return self._filter_files_by_volume(bufr_files)
-        except Exception as e:
-            logger.debug(f"Could not list files in {remote_path}: {e}")
-            return []
+        return {minute_dir: self._filter_files_by_volume(grouped[minute_dir]) for minute_dir in sorted(grouped)}
 
     def _filter_files_by_volume(self, filenames: List[str]) -> List[str]:
         """
@@ -271,112 +312,79 @@ class DateBasedFTPDaemon:
         Returns:
             Filtered list of filenames based on volume_types config
         """
-        if not self.config.volume_types:
+        if self._allowed_volumes is None:
             # No filtering if volume_types not configured
             return filenames
 
+        debug = logger.isEnabledFor(logging.DEBUG)
         filtered = []
         for filename in filenames:
-            try:
-                # Parse filename: RMA1_0315_03_DBZH_20250925T000534Z.BUFR
-                parts = filename.split("_")
-                if len(parts) < 4:
-                    logger.debug(f"Skipping file with unexpected format: {filename}")
-                    continue
-
-                vol_code = parts[1]  # e.g., "0315"
-                vol_number = parts[2]  # e.g., "03"
-                field_type = parts[3]  # e.g., "DBZH"
-
-                # Check if volume code is in configuration
-                if vol_code not in self.config.volume_types:
-                    logger.debug(f"Skipping {filename}: volume code {vol_code} not in configured types")
-                    continue
-
-                # Check if volume number is valid for this volume code
-                vol_config = self.config.volume_types[vol_code]
-                if vol_number not in vol_config:
-                    logger.debug(
-                        f"Skipping {filename}: volume number {vol_number} not valid for volume code {vol_code}"
-                    )
-                    continue
-
-                # Check if field type is valid for this volume number
-                valid_fields = vol_config[vol_number]
-                if field_type not in valid_fields:
-                    logger.debug(
-                        f"Skipping {filename}: field type {field_type} not valid for vol {vol_code}/{vol_number}"
-                    )
-                    continue
-
-                # File passes all filters
+            # Parse filename: RMA1_0315_03_DBZH_20250925T000534Z.BUFR
+            match = _VOLUME_FIELDS_RE.match(filename)
+            if match is not None and match.groups() in self._allowed_volumes:
                 filtered.append(filename)
-                logger.debug(f"Accepted {filename}: vol {vol_code}/{vol_number}, field {field_type}")
-
-            except Exception as e:
-                logger.warning(f"Error parsing filename {filename}: {e}")
-                continue
+            elif debug:
+                logger.debug("Skipping %s: volume code/number/field not in configured volume types", filename)
 
         return filtered
 
-    async def _download_file_async(self, remote_path: str, filename: str) -> bool:
+    async def _download_file_async(self, remote_path: str, filename: str) -> Tuple[bool, Dict[str, Any]]:
         """
         Download a single file asynchronously with checksum verification.
 
+        The result is not written to the state tracker here: the caller records
+        the returned row together with the rest of the scan.
+
         Args:
             remote_path: Full remote path to file
             filename: Name of the file
 
         Returns:
-            True if successful, False otherwise
+            (succeeded, record), where record holds the mark_downloaded/mark_failed arguments
         """
         async with self._download_semaphore:
             local_path = self.config.local_download_dir / filename
+            record: Dict[str, Any] = {"filename": filename, "remote_path": remote_path, "local_path": str(local_path)}
 
+            # Parse metadata from path
             try:
-                logger.info(f"Downloading {filename}...")
+                metadata = parse_ftp_path(remote_path)
+                record["radar_name"] = metadata["radar_code"]
+                record["field_type"] = metadata["field_type"]
+                record["observation_datetime"] = metadata["datetime"].isoformat()
+            except Exception:
+                pass
 
-                # Download file
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.client.download_file, remote_path, local_path)
+            try:
+                logger.info("Downloading %s...", filename)
 
-                # Calculate checksum if enabled
-                checksum = None
-                if self.config.verify_checksums:
-                    checksum = await loop.run_in_executor(None, SQLiteStateTracker.calculate_checksum, local_path)
+                # Download file, hashing the blocks as they are written instead of reading it back
+                hasher = hashlib.sha256() if self.config.verify_checksums else None
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    self._executor, functools.partial(self.client.download_file, remote_path, local_path, hasher=hasher)
+                )
+                record["checksum"] = hasher.hexdigest() if hasher is not None else None
 
                 # Get file size
-                file_size = local_path.stat().st_size
-
-                # Parse metadata from path
-                try:
-                    metadata = parse_ftp_path(remote_path)
-                    metadata["observation_datetime"] = metadata["datetime"].isoformat()
-                except Exception:
-                    metadata = {}
-
-                # Mark as downloaded
-                self.state_tracker.mark_downloaded(
-                    filename,
-                    remote_path,
-                    str(local_path),
-                    file_size,
-                    checksum,
-                    metadata,
-                )
+                record["file_size"] = local_path.stat().st_size
 
-                logger.info(f"Successfully downloaded {filename} ({file_size} bytes)")
-                return True
+                logger.info("Successfully downloaded %s (%s bytes)", filename, record["file_size"])
+                return True, record
 
             except Exception as e:
                 logger.error(f"Failed to download {filename}: {e}")
 
-                # Mark as partial if file exists
+                # Keep the size of whatever was partially written
                 if local_path.exists():
-                    bytes_downloaded = local_path.stat().st_size
-                    self.state_tracker.mark_partial_download(filename, remote_path, str(local_path), bytes_downloaded)
+                    record["file_size"] = local_path.stat().st_size
+
+                return False, record
 
-                return False
+    def _record_downloads(self, completed: List[Dict[str, Any]], failed: List[Dict[str, Any]]) -> None:
+        """Write the finished downloads of a scan to the state tracker, one transaction per status."""
+        self.state_tracker.mark_downloaded_many(completed)
+        self.state_tracker.mark_failed_many(failed)
 
     def get_stats(self) -> dict:
         """
@@ -2,13 +2,18 @@
 """Legacy FTP daemon service for continuously monitoring and downloading BUFR files."""
 
 import asyncio
+import fnmatch
 import logging
-from dataclasses import dataclass
+import posixpath
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Set, Union
 
 from radarlib.io.ftp.client import FTPClient
 from radarlib.state.file_tracker import FileStateTracker
+from radarlib.state.sqlite_tracker import SQLiteStateTracker
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,9 @@ class FTPDaemonConfig:
         max_concurrent_downloads: Maximum simultaneous downloads
         file_pattern: Pattern to match BUFR files (e.g., "*.BUFR")
         recursive: Whether to search subdirectories recursively
+        state_db: Optional SQLite database for tracking state. When set it is used
+                  instead of state_file and can be shared with DownloadDaemon.
+        file_regex: file_pattern compiled to a regex (derived, not an init argument)
     """
 
     host: str
@@ -38,9 +46,15 @@ class FTPDaemonConfig:
     local_download_dir: Path
     state_file: Path
     poll_interval: int = 60
-    max_concurrent_downloads: int = 5
+    max_concurrent_downloads: int = 16
     file_pattern: str = "*.BUFR"
     recursive: bool = True
+    state_db: Optional[Path] = None
+    file_regex: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Translate the glob once; it is matched against every listing entry on every poll
+        self.file_regex = re.compile(fnmatch.translate(self.file_pattern))
 
 
 class FTPDaemon:
@@ -72,13 +86,22 @@ class FTPDaemon:
             config: Daemon configuration
         """
         self.config = config
-        self.client = FTPClient(config.host, config.username, config.password)
-        self.state_tracker = FileStateTracker(config.state_file)
+        self.client = FTPClient(
+            config.host, config.username, config.password, pool_size=config.max_concurrent_downloads
+        )
+        self.state_tracker: Union[FileStateTracker, SQLiteStateTracker]
+        if config.state_db is not None:
+            self.state_tracker = SQLiteStateTracker(config.state_db)
+        else:
+            self.state_tracker = FileStateTracker(config.state_file)
         self._running = False
         self._download_semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._state_executor: Optional[ThreadPoolExecutor] = None
 
-        # Ensure local download directory exists
-        self.config.local_download_dir.mkdir(parents=True, exist_ok=True)
+        # Resolve and create the download directory once; every local path is joined onto it
+        self._local_dir = Path(config.local_download_dir).resolve()
+        self._local_dir.mkdir(parents=True, exist_ok=True)
 
     async def run(self) -> None:
         """
@@ -89,21 +112,37 @@ class FTPDaemon:
         """
         self._running = True
         self._download_semaphore = asyncio.Semaphore(self.config.max_concurrent_downloads)
+        # FTP calls block, so they run on threads of our own: one per download slot plus one
+        # for listings, instead of competing with everything else on the loop's default pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_downloads + 1, thread_name_prefix="ftp-daemon"
+        )
+        # State tracker calls block too (the JSON tracker rewrites its file on every change), but
+        # the trackers are not thread-safe: they get one thread of their own, which serializes them
+        self._state_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ftp-daemon-state")
 
         logger.info(f"Starting FTP daemon monitoring '{self.config.remote_base_path}'")
         logger.info(f"Downloading to '{self.config.local_download_dir}'")
         logger.info(f"Poll interval: {self.config.poll_interval}s")
 
         try:
+            loop = asyncio.get_running_loop()
+            next_check = loop.time()
             while self._running:
+                # Checks start every poll_interval seconds, however long each cycle takes
+                next_check += self.config.poll_interval
                 try:
                     await self._check_and_download_new_files()
                 except Exception as e:
                     logger.error(f"Error during check cycle: {e}", exc_info=True)
 
-                # Wait before next check
-                logger.info(f"Waiting {self.config.poll_interval}s before next check...")
-                await asyncio.sleep(self.config.poll_interval)
+                delay = next_check - loop.time()
+                if delay < 0:
+                    # The cycle overran its period: check again right away, without bursting to catch up
+                    next_check -= delay
+                    delay = 0
+                logger.info(f"Waiting {delay:.1f}s before next check...")
+                await asyncio.sleep(delay)
 
         except asyncio.CancelledError:
             logger.info("Daemon cancelled, shutting down...")
@@ -111,6 +150,15 @@ class FTPDaemon:
         except KeyboardInterrupt:
             logger.info("Daemon interrupted, shutting down...")
             self._running = False
+        finally:
+            self.client.close()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            # Let queued state writes finish before the tracker is closed
+            self._state_executor.shutdown(wait=True)
+            self._state_executor = None
+            if isinstance(self.state_tracker, SQLiteStateTracker):
+                self.state_tracker.close()
 
     def stop(self) -> None:
         """Stop the daemon gracefully."""
@@ -134,13 +182,30 @@ class FTPDaemon:
 
         logger.info(f"Found {len(new_files)} new files to download")
 
-        # Download files concurrently (with limit)
-        tasks = [self._download_file_async(remote_path) for remote_path in new_files]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Log results
-        success_count = sum(1 for r in results if r is True)
-        error_count = sum(1 for r in results if isinstance(r, Exception))
+        # Download files concurrently, keeping only max_concurrent_downloads tasks alive at a
+        # time instead of creating one per file up front
+        remaining = iter(new_files)
+        pending: Set[asyncio.Task] = set()
+        success_count = 0
+        error_count = 0
+
+        def schedule_next() -> None:
+            remote_path = next(remaining, None)
+            if remote_path is not None:
+                pending.add(asyncio.create_task(self._download_file_async(remote_path)))
+
+        for _ in range(self.config.max_concurrent_downloads):
+            schedule_next()
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                if not task.cancelled() and task.exception() is None and task.result() is True:
+                    success_count += 1
+                else:
+                    error_count += 1
+                schedule_next()
 
         logger.info(f"Download cycle complete: {success_count} succeeded, {error_count} failed")
 
@@ -154,27 +219,40 @@ class FTPDaemon:
         new_files = []
 
         # For synchronous FTP operations, run in executor
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         try:
-            # List files in the remote directory
-            files = await loop.run_in_executor(None, self.client.list_files, self.config.remote_base_path)
+            # Stream the remote listing, keeping only names that match the pattern
+            candidates = await loop.run_in_executor(self._executor, self._list_matching_files)
 
-            # Filter for BUFR files that haven't been downloaded
-            for item in files:
-                # Handle both nlst (strings) and mlsd (tuples)
-                filename = item if isinstance(item, str) else item[0]
-
-                # Check if it matches the pattern and hasn't been downloaded
-                if filename.endswith(".BUFR") and not self.state_tracker.is_downloaded(filename):
-                    remote_path = f"{self.config.remote_base_path}/{filename}"
-                    new_files.append(remote_path)
+            # One batched lookup for the whole listing instead of a query per file
+            downloaded = await self._call_state_tracker(self.state_tracker.filter_downloaded, candidates)
+            base = self.config.remote_base_path + "/"
+            new_files = [base + name for name in candidates if name not in downloaded]
 
         except Exception as e:
             logger.error(f"Failed to discover files: {e}")
 
         return new_files
 
+    def _list_matching_files(self) -> List[str]:
+        """
+        List the remote names that match the configured file pattern.
+
+        The listing is consumed line by line, so non-matching entries are
+        dropped as they arrive instead of being held in memory.
+
+        Returns:
+            Matching file names
+        """
+        matches = []
+        for item in self.client.iter_files(self.config.remote_base_path):
+            # Handle both nlst (strings) and mlsd (tuples)
+            filename = item if isinstance(item, str) else item[0]
+            if self.config.file_regex.match(filename):
+                matches.append(filename)
+        return matches
+
     async def _download_file_async(self, remote_path: str) -> bool:
         """
         Download a single file asynchronously.
@@ -187,28 +265,43 @@ class FTPDaemon:
         """
         # Use semaphore to limit concurrent downloads
         async with self._download_semaphore:
-            filename = Path(remote_path).name
-            local_path = self.config.local_download_dir / filename
+            # Remote paths are always POSIX; skip building a Path just to take the name
+            filename = posixpath.basename(remote_path)
+            local_path = self._local_dir / filename
 
             try:
-                logger.info(f"Downloading {filename}...")
+                logger.info("Downloading %s...", filename)
 
                 # Run synchronous FTP operation in executor
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.client.download_file, remote_path, local_path)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, self.client.download_file, remote_path, local_path)
 
                 # Mark as downloaded
-                self.state_tracker.mark_downloaded(filename, remote_path)
+                await self._call_state_tracker(self.state_tracker.mark_downloaded, filename, remote_path)
 
-                logger.info(f"Successfully downloaded {filename}")
+                logger.info("Successfully downloaded %s", filename)
                 return True
 
             except Exception as e:
                 logger.error(f"Failed to download {filename}: {e}")
                 # Remove from state if it was partially added
-                self.state_tracker.remove_file(filename)
+                await self._call_state_tracker(self.state_tracker.remove_file, filename)
                 return False
 
+    async def _call_state_tracker(self, method: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a state tracker method on the daemon's state thread.
+
+        Args:
+            method: Bound state tracker method
+            *args: Positional arguments for method
+
+        Returns:
+            The method's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._state_executor, method, *args)
+
     def get_stats(self) -> dict:
         """
         Get daemon statistics.
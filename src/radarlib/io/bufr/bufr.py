@@ -243,7 +243,8 @@ def get_elevations(lib: CDLL, bufr_path: str, max_elev: int = 30, root_resources
         if arr is None:
             raise RuntimeError(f"get_elevation_data returned NULL for {bufr_path}")
 
-        result = np.asarray(list(arr.contents))
+        # Copia directa desde el buffer ctypes (sin pasar por una lista de Python)
+        result = np.array(arr.contents, dtype=np.float64)
 
         # Validate elevations are reasonable (between -1 and 90 degrees)
         valid_elevs = result[result > 0]  # Filter out zeros/invalid values
@@ -294,7 +295,8 @@ def get_raw_volume(lib: CDLL, bufr_path: str, size: int, root_resources: str | N
         if raw is None:
             raise RuntimeError(f"get_data returned NULL for {bufr_path}")
 
-        result = np.asarray(list(raw.contents))
+        # Copia directa desde el buffer ctypes (sin pasar por una lista de Python)
+        result = np.array(raw.contents, dtype=np.int64)
 
         # Validate we got the expected size
         if len(result) != size:
@@ -449,14 +451,17 @@ def decompress_sweep(sweep: dict) -> np.ndarray:
     if sweep["ngates"] > 8400:
         raise SweepConsistencyException(f"Barrido con ngates > 8400: {sweep['ngates']}")
 
-    dec_data = zlib.decompress(memoryview(sweep["compress_data"]))
+    # Cada barrido es un stream zlib independiente y su tamaño descomprimido
+    # se conoce de antemano (nrays*ngates float64): se reserva el buffer de
+    # salida de una sola vez en lugar de dejar que zlib lo vaya agrandando.
+    expected = int(sweep["nrays"]) * int(sweep["ngates"])
+    dec_data = zlib.decompress(memoryview(sweep["compress_data"]), bufsize=max(expected * 8, 1))
     arr = np.frombuffer(dec_data, dtype=np.float64)
 
     # Enmascarado de valores faltantes
     arr = np.ma.masked_equal(arr, -1.797693134862315708e308)
 
     # Reordenar a 2D (nrays, ngates)
-    expected = sweep["nrays"] * sweep["ngates"]
     if arr.size != expected:
         raise ValueError(f"Data de barrido inconsistente: obtenido {arr.size}, esperado {expected}")
 
@@ -481,8 +486,11 @@ def uniformize_sweeps(sweeps: list[dict]) -> list[dict]:
     for sw in sweeps:
         nr, ng = sw["data"].shape
         if ng < max_gates:
-            pad = np.full((nr, max_gates), np.nan, dtype=np.float64)
+            # Solo la franja de relleno se inicializa con NaN; el resto se
+            # sobreescribe con los datos del barrido.
+            pad = np.empty((nr, max_gates), dtype=np.float64)
             pad[:, :ng] = sw["data"]
+            pad[:, ng:] = np.nan
             sw["data"] = pad
             sw["ngates"] = max_gates
     return sweeps
@@ -734,7 +742,9 @@ def dec_bufr_file(
                         f"Descartado barrido inconsistente en sweep {idx}: {exc}",
                     ]
 
-            results = []
+            # Un slot por barrido: los inconsistentes quedan en None y se
+            # descartan en una sola pasada, preservando el orden original.
+            results: list[dict | None] = [None] * len(sweeps)
             if parallel:
                 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -742,20 +752,16 @@ def dec_bufr_file(
                     futures = {executor.submit(decompress_wrapper, sw, idx): idx for idx, sw in enumerate(sweeps)}
                     for future in as_completed(futures):
                         sw, log_entry = future.result()
-                        if sw is not None:
-                            results.append(sw)
+                        results[futures[future]] = sw
                         if log_entry:
                             run_log.append(log_entry)
-                # To preserve sweep order, sort by original index if needed
-                results.sort(key=lambda sw: sweeps.index(sw))
             else:
                 for idx, sw in enumerate(sweeps):
                     sw_out, log_entry = decompress_wrapper(sw, idx)
-                    if sw_out is not None:
-                        results.append(sw_out)
+                    results[idx] = sw_out
                     if log_entry:
                         run_log.append(log_entry)
-            sweeps = results
+            sweeps = [sw for sw in results if sw is not None]
 
             # Actualiza número de barridos y metadatos desde nombre de archivo
             vol_metadata["nsweeps"] = len(sweeps)
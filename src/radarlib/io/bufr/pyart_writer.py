@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
@@ -10,6 +12,22 @@ from radarlib.utils.names_utils import get_netcdf_filename_from_bufr_filename
 
 logger = logging.getLogger(__name__)
 
+try:  # optional: JIT-compiled, multi-threaded gate alignment
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _align_kernel(data, out, init):  # pragma: no cover - needs numba
+        ngates = data.shape[1]
+        for r in prange(data.shape[0]):
+            for g in range(ngates):
+                out[r, init + g] = data[r, g]
+
 
 PRODUCT_UNITS = {
     "DBZH": "dBZ",
@@ -20,30 +38,71 @@ PRODUCT_UNITS = {
 }
 
 
-def _find_reference_field(fields: List[dict]) -> int:
+# Per-field sweep geometry, one row per field (see _fields_geometry)
+_FIELD_GEOMETRY_DTYPE = np.dtype(
+    [
+        ("gate_offset", np.int64),
+        ("gate_size", np.int64),
+        ("ngates", np.int64),
+        ("nrayos", np.int64),
+        ("last_gate", np.int64),
+    ]
+)
+
+
+def _fields_geometry(fields: List[dict]) -> np.ndarray:
+    """Flatten the sweep geometry of every field into a single structured array.
+
+    Row ``i`` holds the first-sweep ``gate_offset``, ``gate_size``, ``ngates``
+    and ``nrayos`` of ``fields[i]`` plus the farthest last gate over all its
+    sweeps. Fields without sweep information get ``last_gate == -1``. Reading
+    the DataFrames once here keeps pandas out of the reference pick and the
+    per-field alignment.
+    """
+    geometry = np.zeros(len(fields), dtype=_FIELD_GEOMETRY_DTYPE)
+    geometry["last_gate"] = -1
+    for i, f in enumerate(fields):
+        sweeps = f.get("info", {}).get("sweeps")
+        if sweeps is None or sweeps.empty:
+            continue
+        gate_offset = sweeps["gate_offset"].to_numpy()
+        gate_size = sweeps["gate_size"].to_numpy()
+        ngates = sweeps["ngates"].to_numpy()
+        nrayos = sweeps["nrayos"].to_numpy()
+        last_gate = (gate_offset + gate_size * ngates).max()
+        geometry[i] = (gate_offset[0], gate_size[0], ngates[0], nrayos[0], last_gate)
+    return geometry
+
+
+def _find_reference_field(fields: List[dict], geometry: Optional[np.ndarray] = None) -> int:
     """Return the index of the field that has the farthest range.
 
     The input is expected to be a list where each element contains an
     `'info'` dict with a `'sweeps'` DataFrame including `gate_offset`,
-    `gate_size` and `ngates`.
+    `gate_size` and `ngates`. A precomputed ``_fields_geometry(fields)`` can
+    be passed to avoid reading the DataFrames again.
     """
     if not fields:
         raise ValueError("no fields provided")
 
-    # Compute a per-field maximum last_gate distance and pick the field with the largest
-    # last gate. This is robust even when the concatenated sweeps do not contain a
-    # 'vol_id' column.
-    max_last = -1
-    max_idx = 0
-    for i, f in enumerate(fields):
-        sweeps = f.get("info", {}).get("sweeps")
-        if sweeps is None or sweeps.empty:
-            continue
-        last_gate = (sweeps["gate_offset"] + sweeps["gate_size"] * sweeps["ngates"]).max()
-        if last_gate > max_last:
-            max_last = last_gate
-            max_idx = i
-    return max_idx
+    if geometry is None:
+        geometry = _fields_geometry(fields)
+    # argmax returns the first maximum, so ties keep the earliest field and
+    # fields without sweeps (last_gate == -1) are only picked if all are empty.
+    return int(geometry["last_gate"].argmax())
+
+
+def _aligned_empty(shape: tuple, dtype: Any = np.float32, align: int = 64) -> np.ndarray:
+    """Return an uninitialized C-contiguous array whose data pointer is `align`-byte aligned.
+
+    NumPy only guarantees 16-byte alignment; a 64-byte aligned destination lets
+    the large row copies in `_align_field_to_reference` use aligned vector stores.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset : offset + nbytes].view(dtype).reshape(shape)
 
 
 def _create_empty_radar(n_gates: int, n_rays: int, n_sweeps: int, radar_name: str):
@@ -58,33 +117,65 @@ def _create_empty_radar(n_gates: int, n_rays: int, n_sweeps: int, radar_name: st
     return radar
 
 
-def _align_field_to_reference(field: dict, ref_gate_offset: int, ref_gate_size: int, ref_ngates: int):
-    """Return a copy of `field` whose `data` array is aligned to the reference grid.
-
-    The returned dict has the same keys as input but `data` will have shape
-    (nrays, ref_ngates) and dtype float32.
+def _align_field_to_reference(
+    field: dict,
+    ref_gate_offset: int,
+    ref_gate_size: int,
+    ref_ngates: int,
+    field_gate_offset: Optional[int] = None,
+    field_gate_size: Optional[int] = None,
+):
+    """Return a new field dict whose `data` array is aligned to the reference grid.
+
+    The returned dict keeps every input key except `info` (which holds the
+    per-sweep DataFrame and is not serializable by Py-ART); `data` will have
+    shape (nrays, ref_ngates) and dtype float32. The field's own gate offset
+    and size are read from its sweeps DataFrame unless given explicitly.
     """
-    # Defensive copy
-    out = field.copy()
-    data = np.array(field["data"], copy=True)
+    out = {k: v for k, v in field.items() if k not in ("data", "info")}
+    # read-only view of the input (keeps a MaskedArray's mask); it is never
+    # mutated, all writes go to out_data
+    data = np.asanyarray(field["data"])
     nrays, ngates = data.shape
-    out_data = np.ma.masked_all((nrays, ref_ngates), dtype=np.float32)
 
-    field_offset = int(field["info"]["sweeps"]["gate_offset"].iloc[0])
-    field_gate_size = int(field["info"]["sweeps"]["gate_size"].iloc[0])
+    if field_gate_offset is None or field_gate_size is None:
+        sweeps = field["info"]["sweeps"]
+        field_gate_offset = int(sweeps["gate_offset"].to_numpy()[0])
+        field_gate_size = int(sweeps["gate_size"].to_numpy()[0])
 
     if field_gate_size != ref_gate_size:
         raise ValueError("gate_size mismatch not supported in align routine")
 
-    if field_offset == ref_gate_offset:
-        out_data[:, :ngates] = data
+    if field_gate_offset == ref_gate_offset:
+        init = 0
     else:
-        init = int((field_offset - ref_gate_offset) // ref_gate_size)
+        init = int((field_gate_offset - ref_gate_offset) // ref_gate_size)
         if init < 0 or init + ngates > ref_ngates:
             raise ValueError("field cannot be aligned to reference grid")
-        out_data[:, init : init + ngates] = data
 
-    out["data"] = out_data
+    # Fast path: a float32 field already on the reference grid is used as-is
+    if init == 0 and ngates == ref_ngates and data.dtype == np.float32:
+        if isinstance(data, np.ma.MaskedArray):
+            out["data"] = data
+        else:
+            out["data"] = np.ma.MaskedArray(data, mask=np.isnan(data), copy=False)
+        return out
+
+    # Plain float32 buffer with NaN as "no data"; the mask is derived once at
+    # the end instead of allocating and updating a full boolean mask up front.
+    out_data = _aligned_empty((nrays, ref_ngates), dtype=np.float32)
+    out_data.fill(np.nan)
+
+    # masked source gates are simply not copied, so they stay NaN (and masked)
+    src_mask = np.ma.getmask(data)
+    if NUMBA_AVAILABLE and src_mask is np.ma.nomask:
+        _align_kernel(np.ascontiguousarray(np.ma.getdata(data)), out_data, init)
+    else:
+        where = True if src_mask is np.ma.nomask else ~src_mask
+        with np.errstate(over="ignore"):
+            np.copyto(out_data[:, init : init + ngates], np.ma.getdata(data), casting="unsafe", where=where)
+
+    out["data"] = np.ma.MaskedArray(out_data, mask=np.isnan(out_data), copy=False)
     return out
 
 
@@ -109,23 +200,27 @@ def bufr_fields_to_pyart_radar(
         raise ValueError("fields is empty")
 
     # find reference field (the one with farthest range)
-    ref_idx = _find_reference_field(fields)
+    geometry = _fields_geometry(fields)
+    ref_idx = _find_reference_field(fields, geometry)
     ref_field = fields[ref_idx]
+    ref_geometry = geometry[ref_idx]
 
     # Get dimensions from reference field
-    ref_ngates = int(ref_field["info"]["sweeps"]["ngates"].iloc[0])
+    ref_ngates = int(ref_geometry["ngates"])
     # NOTE: nrayos is per sweep; make_empty_ppi_radar will multiply by nsweeps
-    ref_rays_per_sweep = int(ref_field["info"]["sweeps"]["nrayos"].iloc[0])
+    ref_rays_per_sweep = int(ref_geometry["nrayos"])
     ref_nsweeps = int(ref_field["info"].get("nsweeps", 1))
 
     radar_name = ref_field["info"]["metadata"].get("instrument_name", "RADAR")
     radar = _create_empty_radar(ref_ngates, ref_rays_per_sweep, ref_nsweeps, radar_name)
 
     # range axis
-    gate_size = int(ref_field["info"]["sweeps"]["gate_size"].iloc[0])
-    gate_offset = int(ref_field["info"]["sweeps"]["gate_offset"].iloc[0])
-    range_data = gate_offset + gate_size * np.arange(radar.ngates)
-    radar.range = radar.range  # keep existing structure
+    gate_size = int(ref_geometry["gate_size"])
+    gate_offset = int(ref_geometry["gate_offset"])
+    # single float32 buffer, scaled and shifted in place (no int64 temporaries)
+    range_data = np.arange(radar.ngates, dtype=np.float32)
+    range_data *= gate_size
+    range_data += gate_offset
     radar.range["data"] = range_data
     radar.range["meters_between_gates"] = gate_size
     radar.range["meters_to_center_of_first_gate"] = gate_offset
@@ -134,12 +229,13 @@ def bufr_fields_to_pyart_radar(
     rays_per_sweep = ref_field["info"]["sweeps"]["nrayos"].to_numpy()
     elevs = np.array(ref_field["info"]["sweeps"]["elevaciones"], dtype=np.float32)
     radar.elevation["data"] = np.repeat(elevs, rays_per_sweep)
-    radar.azimuth["data"] = np.concatenate([np.arange(n, dtype=np.float32) for n in rays_per_sweep])
+    # ray index within each sweep: global ray index minus the sweep start offset
+    sweep_starts = np.repeat(np.cumsum(rays_per_sweep) - rays_per_sweep, rays_per_sweep)
+    radar.azimuth["data"] = np.arange(sweep_starts.size, dtype=np.float32) - sweep_starts.astype(np.float32)
     radar.fixed_angle["data"] = elevs
 
     # metadata
-    radar.metadata = radar.metadata
-    radar.metadata.update(ref_field["info"]["metadata"])
+    radar.metadata |= ref_field["info"]["metadata"]
 
     # Load geographic coordinates
     radar.latitude["data"] = np.ndarray(1)
@@ -161,12 +257,16 @@ def bufr_fields_to_pyart_radar(
     radar.altitude["_fillValue"] = -9999.0
 
     # add fields aligned to reference
-    for field in fields:
-        aligned = _align_field_to_reference(field, gate_offset, gate_size, ref_ngates)
+    for field, field_geometry in zip(fields, geometry):
+        aligned = _align_field_to_reference(
+            field,
+            gate_offset,
+            gate_size,
+            ref_ngates,
+            field_gate_offset=int(field_geometry["gate_offset"]),
+            field_gate_size=int(field_geometry["gate_size"]),
+        )
         name = field["info"].get("tipo_producto", "UNKNOWN")
-        # remove non-serializable metadata before adding to radar
-        if "info" in aligned:
-            del aligned["info"]
         # units mapping
         units = PRODUCT_UNITS.get(name)
         if units:
@@ -185,16 +285,23 @@ def bufr_paths_to_pyart(
     config: Optional[Dict[str, Any]] = None,
     debug: bool = False,
     save_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
 ) -> Any:
-    """Decode one or more BUFR files and convert to Py-ART Radar object."""
+    """Decode one or more BUFR files and convert to Py-ART Radar object.
+
+    Decoding is independent per file and CPU bound, so when ``max_workers``
+    is greater than 1 the files are decoded in a process pool (the C decoder
+    is not thread-safe). Field order follows ``bufr_paths`` either way.
+    """
     from radarlib.io.bufr.bufr import bufr_to_dict
 
-    fields = []
-    for p in bufr_paths:
-        vol = bufr_to_dict(p, root_resources=root_resources, logger_name="bufr_to_pyart", legacy=False)
-        if vol is None:
-            continue
-        fields.append(vol)
+    decode = partial(bufr_to_dict, root_resources=root_resources, logger_name="bufr_to_pyart", legacy=False)
+    if max_workers is not None and max_workers > 1 and len(bufr_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(bufr_paths))) as executor:
+            vols = list(executor.map(decode, bufr_paths))
+    else:
+        vols = [decode(p) for p in bufr_paths]
+    fields = [vol for vol in vols if vol is not None]
     # the previous code expects a list of fields; we support passing list with a single volume
     radar = bufr_fields_to_pyart_radar(
         fields,
@@ -208,13 +315,35 @@ def bufr_paths_to_pyart(
         save_path = Path(save_path)
         save_path.mkdir(parents=True, exist_ok=True)
         # base = Path(p).stem
-        netcdf_fname = get_netcdf_filename_from_bufr_filename(str(Path(p).stem))
+        netcdf_fname = get_netcdf_filename_from_bufr_filename(str(Path(bufr_paths[-1]).stem))
         out_file = save_path / netcdf_fname
         save_radar_to_cfradial(radar, out_file)
         return radar
     return radar
 
 
+def iter_bufr_volumes_to_pyart(
+    volumes: Iterable[List[str]],
+    *,
+    root_resources: Optional[str] = None,
+    save_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[List[str], Any]]:
+    """Lazily convert many volumes (each a list of BUFR paths) to Py-ART radars.
+
+    Yields ``(bufr_paths, radar)`` one volume at a time, so a batch job that
+    only saves (``save_path``) and discards never holds more than one decoded
+    volume and radar in memory. Call ``list(...)`` to materialize all of them.
+    """
+    for bufr_paths in volumes:
+        radar = bufr_paths_to_pyart(
+            bufr_paths, root_resources=root_resources, save_path=save_path, max_workers=max_workers
+        )
+        yield bufr_paths, radar
+        # drop our reference before decoding the next volume
+        del radar
+
+
 def bufr_to_pyart(
     fields: List[dict],
     *,
@@ -258,16 +387,45 @@ def bufr_to_pyart(
     )
 
 
-def save_radar_to_cfradial(radar: Any, out_file: Path, format: str = "NETCDF4") -> Path:
+def save_radar_to_cfradial(
+    radar: Any,
+    out_file: Path,
+    format: str = "NETCDF4",
+    chunk_rays: int = 256,
+    chunk_gates: int = 1024,
+    complevel: Optional[int] = None,
+) -> Path:
     """Save a Py-ART Radar object to a CFRadial NetCDF file using pyart.io.cfradial.write_cfradial.
 
+    For NETCDF4 output, field variables are written in (chunk_rays, chunk_gates)
+    chunks (about 1 MiB of float32 with the defaults) with byte shuffling, so
+    HDF5 compresses a few large chunks instead of many small ones. ``complevel``
+    sets the deflate level (lower is faster); None keeps the netCDF default.
+    Per-field ``_ChunkSizes``/``_Shuffle``/``_DeflateLevel`` keys already
+    present on the radar take precedence and the radar is left unchanged.
+
     Returns the path to the written file.
     """
     import pyart
 
+    added: List[tuple] = []
+    if format.startswith("NETCDF4"):
+        chunks = (max(1, min(radar.nrays, chunk_rays)), max(1, min(radar.ngates, chunk_gates)))
+        defaults: Dict[str, Any] = {"_ChunkSizes": chunks, "_Shuffle": True}
+        if complevel is not None:
+            defaults["_DeflateLevel"] = complevel
+        for field in radar.fields.values():
+            for key, value in defaults.items():
+                if key not in field:
+                    field[key] = value
+                    added.append((field, key))
+
     try:
         pyart.io.cfradial.write_cfradial(str(out_file), radar, format=format)
     except Exception as exc:
         logger.error("Failed to write CFRadial file %s: %s", out_file, exc)
         raise
+    finally:
+        for field, key in added:
+            field.pop(key, None)
     return out_file
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
-from xml.dom import minidom
+from xml.etree import ElementTree as ET
 
 
 def read_xml_estrategia2(full_path_xml: str | Path, nvol: int = 0, nsweep: int = 0) -> Dict[str, Any]:
-    xmldoc = minidom.parse(str(full_path_xml))
-    vol_list = xmldoc.getElementsByTagName("volumen")
+    # The same strategy file is shared by many BUFR volumes: parse it once per
+    # (path, mtime) and hand out copies so callers cannot mutate the cache.
+    path = Path(full_path_xml)
+    info = _read_xml_estrategia2_cached(str(path), path.stat().st_mtime_ns, nvol, nsweep)
+    return dict(info)
 
-    scan_strategy = vol_list[nsweep].attributes["tipo"].value
-    longitud_celda = vol_list[nsweep].attributes["longitud_celda_m"].value
 
-    sweep_list = vol_list[nvol].getElementsByTagName("procesamiento")
-    processing_type = sweep_list[nsweep].attributes["tipo"].value
+@lru_cache(maxsize=32)
+def _read_xml_estrategia2_cached(full_path_xml: str, mtime_ns: int, nvol: int, nsweep: int) -> Dict[str, Any]:
+    root = ET.parse(full_path_xml).getroot()
+    # iter() searches all descendants (root included), like getElementsByTagName
+    vol_list = list(root.iter("volumen"))
+
+    scan_strategy = vol_list[nsweep].attrib["tipo"]
+    longitud_celda = vol_list[nsweep].attrib["longitud_celda_m"]
+
+    sweep_list = list(vol_list[nvol].iter("procesamiento"))
+    processing_type = sweep_list[nsweep].attrib["tipo"]
 
     info: Dict[str, Any] = {}
     info["scan_strategy"] = scan_strategy
@@ -21,11 +32,11 @@ def read_xml_estrategia2(full_path_xml: str | Path, nvol: int = 0, nsweep: int =
     info["longitud_celda"] = longitud_celda
 
     if processing_type in ["intensidad", "doppler", "surv", "doppler-sfr"]:
-        group_list = sweep_list[nsweep].getElementsByTagName("barrido")[0].getElementsByTagName("grupo")
-        npulsos = group_list[0].attributes["pulsos"].value
-        prp1 = group_list[0].attributes["prp_us"].value
-        pw1 = group_list[0].attributes["pw_ns"].value
-        max_range1 = group_list[0].attributes["alcance_km"].value
+        group_list = list(next(sweep_list[nsweep].iter("barrido")).iter("grupo"))
+        npulsos = group_list[0].attrib["pulsos"]
+        prp1 = group_list[0].attrib["prp_us"]
+        pw1 = group_list[0].attrib["pw_ns"]
+        max_range1 = group_list[0].attrib["alcance_km"]
 
         info.update(
             {
@@ -43,14 +54,15 @@ def read_xml_estrategia2(full_path_xml: str | Path, nvol: int = 0, nsweep: int =
         return info
 
     if processing_type == "staggered":
-        nconjuntos = sweep_list[nsweep].getElementsByTagName("barrido")[0].attributes["conjuntos"].value
-        group_list = sweep_list[nsweep].getElementsByTagName("barrido")[0].getElementsByTagName("grupo")
-        prp1 = group_list[0].attributes["prp_us"].value
-        pw1 = group_list[0].attributes["pw_ns"].value
-        max_range1 = group_list[0].attributes["alcance_km"].value
-        prp2 = group_list[1].attributes["prp_us"].value
-        pw2 = group_list[1].attributes["pw_ns"].value
-        max_range2 = group_list[1].attributes["alcance_km"].value
+        barrido = next(sweep_list[nsweep].iter("barrido"))
+        nconjuntos = barrido.attrib["conjuntos"]
+        group_list = list(barrido.iter("grupo"))
+        prp1 = group_list[0].attrib["prp_us"]
+        pw1 = group_list[0].attrib["pw_ns"]
+        max_range1 = group_list[0].attrib["alcance_km"]
+        prp2 = group_list[1].attrib["prp_us"]
+        pw2 = group_list[1].attrib["pw_ns"]
+        max_range2 = group_list[1].attrib["alcance_km"]
 
         info.update(
             {
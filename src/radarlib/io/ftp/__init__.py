@@ -10,23 +10,45 @@ Note: This module also re-exports daemon and state tracker classes for backward
       - State trackers: `from radarlib.state import SQLiteStateTracker, FileStateTracker`
 """
 
-from .client import FTPClient
-
-# Keep old files for backward compatibility during transition
-# These will be imported from their original locations
-from .ftp import (
-    FTP_IsADirectoryError,
-    FTPActionError,
-    build_ftp_path,
-    download_file_from_ftp,
-    download_ftp_folder,
-    download_multiple_files_from_ftp,
-    exponential_backoff_retry,
-    ftp_connection_manager,
-    list_files_in_remote_dir,
-    parse_ftp_path,
-)
-from .ftp_client import FTPError, RadarFTPClientAsync
+import importlib
+from typing import Any
+
+# Public names are resolved lazily (PEP 562): importing radarlib.io.ftp does not
+# pull in ftplib/asyncio-heavy submodules until one of their names is used.
+_LAZY_IMPORTS = {
+    # FTP clients
+    "FTPClient": ".client",
+    "RadarFTPClientAsync": ".ftp_client",
+    "FTPError": ".ftp_client",
+    # FTP utility functions (kept for backward compatibility)
+    "ftp_connection_manager": ".ftp",
+    "list_files_in_remote_dir": ".ftp",
+    "iter_files_in_remote_dir": ".ftp",
+    "download_file_from_ftp": ".ftp",
+    "download_multiple_files_from_ftp": ".ftp",
+    "download_ftp_folder": ".ftp",
+    "build_ftp_path": ".ftp",
+    "parse_ftp_path": ".ftp",
+    "exponential_backoff_retry": ".ftp",
+    # Exceptions
+    "FTPActionError": ".ftp",
+    "FTP_IsADirectoryError": ".ftp",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # FTP clients
@@ -39,6 +61,7 @@ __all__ = [
     # FTP utility functions
     "ftp_connection_manager",
     "list_files_in_remote_dir",
+    "iter_files_in_remote_dir",
     "download_file_from_ftp",
     "download_multiple_files_from_ftp",
     "download_ftp_folder",
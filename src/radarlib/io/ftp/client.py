@@ -1,31 +1,88 @@
 # -*- coding: utf-8 -*-
 """FTP client for downloading BUFR files from radar data servers."""
 
+import asyncio
 import ftplib
+import hashlib
 import logging
+import os
+import posixpath
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, List
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
-from .ftp import FTP_IsADirectoryError, FTPActionError, ftp_connection_manager
+from .ftp import FTP_IsADirectoryError, FTPActionError, _ftp_connection, _iter_listing_lines, _parse_mlsd_line
 
 logger = logging.getLogger(__name__)
 
+SocketOpts = Dict[Tuple[int, int], int]
+
+# Disable Nagle so the small command/response exchanges of the control channel are
+# not held back waiting for an ACK. Buffer sizes are left to the kernel: on Linux an
+# explicit SO_RCVBUF turns off receive-window autotuning, so only set it on purpose.
+DEFAULT_SOCKET_OPTS: SocketOpts = {(socket.IPPROTO_TCP, socket.TCP_NODELAY): 1}
+
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _preallocate(fd: int, size: int) -> bool:
+    """Reserve size bytes for fd where supported; returns whether the space was reserved."""
+    if not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        return False
+    return True
+
+
+def _apply_socket_opts(sock: Optional[socket.socket], opts: SocketOpts) -> None:
+    """Set every (level, option) -> value pair on sock, skipping options the platform rejects."""
+    if sock is None:
+        return
+    for (level, option), value in opts.items():
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError as e:
+            logger.debug(f"Could not set socket option {level}/{option}={value}: {e}")
+
 
 class FTPClient:
     """
     Client for interacting with FTP servers to download BUFR radar files.
 
     This class provides a high-level interface for common FTP operations,
-    with built-in error handling and connection management.
+    with built-in error handling and connection management. Authenticated
+    connections are kept in a small pool and reused across operations, so
+    only the first call (or a call after a dropped connection) pays for the
+    TCP handshake and login. Pooled connections keep their working directory,
+    so remote paths should be absolute.
 
     Example:
         >>> client = FTPClient(host="ftp.example.com", user="user", password="pass")
         >>> files = client.list_files("/L2/RMA1/2024/01/01")
         >>> client.download_file("/L2/RMA1/2024/01/01/file.BUFR", "./local.BUFR")
+        >>> client.close()
     """
 
-    def __init__(self, host: str, user: str, password: str):
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        pool_size: int = 5,
+        block_size: int = 262144,
+        listing_ttl: float = 30.0,
+        socket_opts: Optional[SocketOpts] = None,
+        idle_check: float = 15.0,
+    ):
         """
         Initialize the FTP client.
 
@@ -33,15 +90,48 @@ class FTPClient:
             host: FTP server hostname or IP address
             user: Username for authentication
             password: Password for authentication
+            pool_size: Maximum number of idle connections kept open for reuse
+            block_size: Bytes read from the data connection (and buffered for the
+                local file) per callback during downloads
+            listing_ttl: Seconds a directory listing is reused by file_exists
+            socket_opts: Socket options, as {(level, option): value}, applied to the
+                control socket and to every data socket (e.g. add
+                {(socket.SOL_SOCKET, socket.SO_RCVBUF): 1 << 20} for long-RTT links).
+                Defaults to DEFAULT_SOCKET_OPTS.
+            idle_check: Seconds a pooled connection may sit idle before it is probed
+                with NOOP on checkout, so one the server timed out between polls
+                is replaced instead of failing the next operation
         """
         self.host = host
         self.user = user
         self.password = password
+        self.pool_size = pool_size
+        self.block_size = block_size
+        self.listing_ttl = listing_ttl
+        self.socket_opts = DEFAULT_SOCKET_OPTS if socket_opts is None else socket_opts
+        self._listing_cache: Dict[str, Tuple[float, Set[str]]] = {}
+        self.idle_check = idle_check
+        # Idle connections with the monotonic time they were returned
+        self._pool: "queue.LifoQueue[Tuple[ftplib.FTP, float]]" = queue.LifoQueue(maxsize=max(pool_size, 1))
+
+    def __enter__(self) -> "FTPClient":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
 
     @contextmanager
     def connect(self) -> Generator[ftplib.FTP, None, None]:
         """
-        Create a context-managed FTP connection.
+        Borrow an authenticated FTP connection from the pool.
+
+        A new connection is opened only when no idle one is available. An idle
+        connection older than idle_check is probed with NOOP first and replaced
+        if the server has dropped it. On a clean exit the connection is returned
+        to the pool as is (the checkout probe covers it going stale later); if the
+        block raises, the connection may be mid-transfer and is discarded instead.
 
         Yields:
             ftplib.FTP: Active FTP connection
@@ -49,8 +139,23 @@ class FTPClient:
         Raises:
             ConnectionError: If connection or authentication fails
         """
-        with ftp_connection_manager(self.host, self.user, self.password) as ftp:
+        ftp = self._acquire()
+        try:
             yield ftp
+        except BaseException:
+            # The connection may be the reason for the error: drop it without waiting on QUIT
+            ftp.close()
+            raise
+        self._release(ftp)
+
+    def close(self) -> None:
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                ftp, _ = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(ftp)
 
     def list_files(self, remote_dir: str, method: str = "nlst") -> List[str]:
         """
@@ -76,6 +181,7 @@ class FTPClient:
                     file_list = list(ftp.mlsd())
                 else:
                     file_list = ftp.nlst()
+                    self._listing_cache[remote_dir] = (time.monotonic(), set(file_list))
 
                 logger.info(f"Found {len(file_list)} items")
                 return file_list
@@ -84,7 +190,90 @@ class FTPClient:
             error_message = f"Failed to list directory '{remote_dir}': {e}"
             raise FTPActionError(error_message) from e
 
-    def download_file(self, remote_path: str, local_path: Path, verify_not_directory: bool = True) -> None:
+    def iter_files(self, remote_dir: str, method: str = "nlst") -> Iterator[Union[str, Tuple[str, Dict[str, str]]]]:
+        """
+        Stream the entries of a remote directory one line at a time.
+
+        Unlike list_files, the listing is never materialized: each NLST/MLSD
+        line is yielded as it arrives on the data connection, so callers that
+        filter or stop early keep memory flat on very large directories. The
+        connection stays borrowed until the generator is exhausted or closed;
+        a listing abandoned half-way is not returned to the pool.
+
+        Args:
+            remote_dir: Path to remote directory
+            method: Listing method ("nlst" for names only, "mlsd" for metadata)
+
+        Yields:
+            File names, or tuples of (name, metadata) if using mlsd
+
+        Raises:
+            ConnectionError: If connection fails
+            FTPActionError: If listing operation fails
+        """
+        logger.info(f"Streaming listing of '{remote_dir}' on '{self.host}'...")
+        try:
+            with self.connect() as ftp:
+                ftp.cwd(remote_dir)
+
+                if method == "mlsd":
+                    for line in _iter_listing_lines(ftp, "MLSD"):
+                        yield _parse_mlsd_line(line)
+                else:
+                    yield from _iter_listing_lines(ftp, "NLST")
+
+        except ftplib.all_errors as e:
+            error_message = f"Failed to list directory '{remote_dir}': {e}"
+            raise FTPActionError(error_message) from e
+
+    def list_recursive(self, remote_dir: str, max_depth: Optional[int] = None, max_concurrent: int = 1) -> List[str]:
+        """
+        List every file below a remote directory.
+
+        The tree is walked level by level with MLSD, whose type fact tells
+        files from directories. With max_concurrent > 1 the directories of a
+        level are listed in parallel over that many pooled connections, so a
+        level of N directories costs about N / max_concurrent round-trips.
+        Servers that do not implement MLSD are walked with NLST over a single
+        connection, probing each name with CWD.
+
+        Args:
+            remote_dir: Path to remote directory
+            max_depth: Directory levels to descend below remote_dir (None for no limit).
+                On the NLST fallback, names at the last level are not probed and
+                are reported as files.
+            max_concurrent: Number of FTP connections to list with
+
+        Returns:
+            File paths relative to remote_dir (e.g. "0300/file.BUFR"), breadth-first
+
+        Raises:
+            ConnectionError: If connection fails
+            FTPActionError: If listing operation fails
+        """
+        logger.info(f"Listing '{remote_dir}' recursively on '{self.host}'...")
+        try:
+            try:
+                return self._walk_mlsd(remote_dir, max_depth, max_concurrent)
+            except ftplib.error_perm as e:
+                # 500/502: command not recognised/implemented; anything else is a real error
+                if not str(e).startswith(("500", "502")):
+                    raise
+                logger.debug(f"MLSD not supported by '{self.host}', walking with NLST")
+            with self.connect() as ftp:
+                return self._walk_nlst(ftp, remote_dir, max_depth)
+
+        except ftplib.all_errors as e:
+            error_message = f"Failed to list directory '{remote_dir}' recursively: {e}"
+            raise FTPActionError(error_message) from e
+
+    def download_file(
+        self,
+        remote_path: str,
+        local_path: Path,
+        verify_not_directory: bool = True,
+        hasher: Optional["hashlib._Hash"] = None,
+    ) -> None:
         """
         Download a single file from the FTP server.
 
@@ -92,6 +281,8 @@ class FTPClient:
             remote_path: Full path to remote file (including directory and filename)
             local_path: Local path where file will be saved
             verify_not_directory: If True, verify that remote path is not a directory
+            hasher: Optional hashlib object updated with every block as it is written,
+                so a checksum does not require reading the file back from disk
 
         Raises:
             ConnectionError: If connection fails
@@ -99,31 +290,26 @@ class FTPClient:
             FTP_IsADirectoryError: If remote path is a directory (when verify_not_directory=True)
             IOError: If local file cannot be written
         """
-        logger.info(f"Downloading '{remote_path}' to '{local_path}'")
+        logger.info("Downloading '%s' to '%s'", remote_path, local_path)
 
-        remote_path_obj = Path(remote_path)
-        remote_dir = str(remote_path_obj.parent)
-        remote_filename = remote_path_obj.name
+        remote_dir, remote_filename = self._split_remote_path(remote_path)
 
         try:
             with self.connect() as ftp:
                 ftp.cwd(remote_dir)
 
                 # Verify it's not a directory
+                size = None
                 if verify_not_directory:
-                    try:
-                        ftp.cwd(remote_filename)
-                        ftp.cwd("..")
-                        raise FTP_IsADirectoryError(f"Path '{remote_path}' is a directory, not a file")
-                    except ftplib.error_perm:
-                        # Expected error - it's a file, not a directory
-                        pass
+                    size = self._check_not_directory(ftp, remote_filename, remote_path)
 
                 # Download the file
-                with open(local_path, "wb") as local_file:
-                    ftp.retrbinary(f"RETR {remote_filename}", local_file.write)
+                self._retrieve(ftp, remote_filename, local_path, size, hasher)
 
-                logger.info(f"Successfully downloaded to '{local_path}'")
+                if size is not None:
+                    logger.info("Successfully downloaded to '%s' (%s bytes)", local_path, size)
+                else:
+                    logger.info("Successfully downloaded to '%s'", local_path)
 
         except ftplib.all_errors as e:
             error_message = f"Failed to download '{remote_path}': {e}"
@@ -132,45 +318,111 @@ class FTPClient:
             error_message = f"Failed to write to '{local_path}': {e}"
             raise IOError(error_message) from e
 
-    def download_files(self, remote_dir: str, filenames: List[str], local_dir: Path) -> None:
+    def download_files(
+        self,
+        remote_dir: str,
+        filenames: List[str],
+        local_dir: Path,
+        verify_not_directory: bool = False,
+        max_concurrent: int = 1,
+    ) -> None:
         """
         Download multiple files from the same remote directory.
 
-        Uses a single connection for efficiency.
+        With the default max_concurrent=1 a single connection is used for the
+        whole batch. Larger values spread the batch over that many pooled
+        connections, one worker thread each. The names normally come from a listing
+        the caller just made, so the per-file directory check is off by default.
+
+        This call blocks until the batch is done and does not use asyncio, so it
+        also works when an event loop is already running in the calling thread.
+        Code running inside a coroutine should await download_files_async instead,
+        which does the same work without blocking the loop.
 
         Args:
             remote_dir: Remote directory containing the files
             filenames: List of filenames to download
             local_dir: Local directory where files will be saved
+            verify_not_directory: If True, verify that each name is not a directory
+            max_concurrent: Number of FTP connections to download with
 
         Raises:
             ConnectionError: If connection fails
             FTPActionError: If any download fails
+            FTP_IsADirectoryError: If a name is a directory (when verify_not_directory=True)
             IOError: If local files cannot be written
         """
+        workers = min(max(max_concurrent, 1), len(filenames))
         logger.info(f"Downloading {len(filenames)} files from '{remote_dir}'")
 
+        local_dir = Path(local_dir)
+        pending = self._queue_targets(filenames, local_dir)
+        failed = threading.Event()
+
         try:
-            with self.connect() as ftp:
-                ftp.cwd(remote_dir)
+            if workers == 1:
+                self._download_worker(remote_dir, pending, verify_not_directory, failed)
+            elif workers > 1:
+                # Plain threads rather than asyncio.run, which fails under a running event loop
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ftp-download") as pool:
+                    futures = [
+                        pool.submit(self._download_worker, remote_dir, pending, verify_not_directory, failed)
+                        for _ in range(workers)
+                    ]
+                    for future in futures:
+                        future.result()
+            logger.info("All files downloaded successfully")
+
+        except ftplib.all_errors as e:
+            error_message = f"Failed during batch download: {e}"
+            raise FTPActionError(error_message) from e
+        except IOError as e:
+            error_message = f"Failed to write to '{local_dir}': {e}"
+            raise IOError(error_message) from e
 
-                for filename in filenames:
-                    local_path = local_dir / filename
+    async def download_files_async(
+        self,
+        remote_dir: str,
+        filenames: List[str],
+        local_dir: Path,
+        max_concurrent: int = 5,
+        verify_not_directory: bool = False,
+    ) -> None:
+        """
+        Download multiple files from the same remote directory over parallel connections.
 
-                    # Verify not a directory
-                    try:
-                        ftp.cwd(filename)
-                        ftp.cwd("..")
-                        raise FTP_IsADirectoryError(f"Path '{filename}' is a directory, not a file")
-                    except ftplib.error_perm:
-                        pass
+        Up to max_concurrent workers each borrow one pooled connection, change
+        into remote_dir once and then pull names from a shared queue, so the
+        round-trips of many small files overlap instead of adding up. The first
+        failure stops the remaining workers after their current file.
 
-                    # Download
-                    with open(local_path, "wb") as local_file:
-                        ftp.retrbinary(f"RETR {filename}", local_file.write)
+        Args:
+            remote_dir: Remote directory containing the files
+            filenames: List of filenames to download
+            local_dir: Local directory where files will be saved
+            max_concurrent: Maximum number of simultaneous FTP connections
+            verify_not_directory: If True, verify that each name is not a directory
 
-                    logger.info(f"Downloaded '{filename}'")
+        Raises:
+            ConnectionError: If connection fails
+            FTPActionError: If any download fails
+            FTP_IsADirectoryError: If a name is a directory (when verify_not_directory=True)
+            IOError: If local files cannot be written
+        """
+        workers = min(max(max_concurrent, 1), len(filenames))
+        logger.info(f"Downloading {len(filenames)} files from '{remote_dir}' over {workers} connections")
+
+        local_dir = Path(local_dir)
+        pending = self._queue_targets(filenames, local_dir)
+        failed = threading.Event()
 
+        try:
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(self._download_worker, remote_dir, pending, verify_not_directory, failed)
+                    for _ in range(workers)
+                )
+            )
             logger.info("All files downloaded successfully")
 
         except ftplib.all_errors as e:
@@ -180,26 +432,344 @@ class FTPClient:
             error_message = f"Failed to write to '{local_dir}': {e}"
             raise IOError(error_message) from e
 
+    def _download_worker(
+        self,
+        remote_dir: str,
+        pending: "queue.SimpleQueue[Tuple[str, Path]]",
+        verify_not_directory: bool,
+        failed: threading.Event,
+    ) -> None:
+        """Download queued files over one connection until the queue drains or a worker fails."""
+        try:
+            with self.connect() as ftp:
+                ftp.cwd(remote_dir)
+
+                while not failed.is_set():
+                    try:
+                        filename, local_path = pending.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    # Verify not a directory
+                    if verify_not_directory:
+                        self._check_not_directory(ftp, filename, filename)
+
+                    # Download
+                    self._retrieve(ftp, filename, local_path)
+
+                    logger.info("Downloaded '%s'", filename)
+        except BaseException:
+            failed.set()
+            raise
+
+    @staticmethod
+    def _queue_targets(filenames: List[str], local_dir: Path) -> "queue.SimpleQueue[Tuple[str, Path]]":
+        """Create local_dir and queue every (filename, local_path) pair, before any connection is opened."""
+        local_dir.mkdir(parents=True, exist_ok=True)
+        pending: "queue.SimpleQueue[Tuple[str, Path]]" = queue.SimpleQueue()
+        for filename in filenames:
+            pending.put((filename, local_dir / filename))
+        return pending
+
     def file_exists(self, remote_path: str) -> bool:
         """
         Check if a file exists on the FTP server.
 
+        A directory listing cached within listing_ttl (by list_files or
+        exists_many) answers the check directly. Otherwise a single SIZE is
+        sent, which costs the same regardless of how many entries the directory
+        holds; servers answer it with 550 for missing names and directories.
+
         Args:
             remote_path: Full path to remote file
 
         Returns:
             True if file exists, False otherwise
         """
-        remote_path_obj = Path(remote_path)
-        remote_dir = str(remote_path_obj.parent)
-        remote_filename = remote_path_obj.name
+        remote_dir, remote_filename = self._split_remote_path(remote_path)
+        names = self._fresh_listing(remote_dir)
+        if names is not None:
+            return remote_filename in names
 
         try:
             with self.connect() as ftp:
-                ftp.cwd(remote_dir)
-                files = ftp.nlst()
-                return remote_filename in files
+                # Some servers refuse SIZE in ASCII mode, which a listing may have left set
+                ftp.voidcmd("TYPE I")
+                try:
+                    ftp.size(str(remote_path))
+                except ftplib.error_perm:
+                    # A 550 leaves the session usable, so the connection goes back to the pool
+                    return False
+            return True
         except ftplib.all_errors:
+            # all_errors includes OSError, and so the ConnectionError raised on login failure
             return False
-        except ConnectionError:
-            return False
+
+    def exists_many(self, remote_dir: str, filenames: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check whether several files exist in the same remote directory.
+
+        A single (cached) NLST answers the whole batch, instead of one listing
+        per file_exists call.
+
+        Args:
+            remote_dir: Remote directory containing the files
+            filenames: Names to look for in remote_dir
+
+        Returns:
+            Mapping of each filename to True if it exists. If the directory
+            cannot be listed, every name maps to False.
+        """
+        try:
+            names = self._cached_nlst(remote_dir)
+        except ftplib.all_errors:
+            # all_errors includes OSError, and so the ConnectionError raised on login failure
+            names = set()
+        return {filename: filename in names for filename in filenames}
+
+    def invalidate_cache(self, remote_dir: Optional[str] = None) -> None:
+        """
+        Forget cached directory listings.
+
+        Args:
+            remote_dir: Directory to forget; if None, the whole cache is cleared
+        """
+        if remote_dir is None:
+            self._listing_cache.clear()
+        else:
+            self._listing_cache.pop(remote_dir, None)
+
+    def _cached_nlst(self, remote_dir: str, ttl: Optional[float] = None) -> Set[str]:
+        """Return the names in remote_dir, issuing NLST only when the cached listing is older than ttl."""
+        cached = self._fresh_listing(remote_dir, ttl)
+        if cached is not None:
+            return cached
+
+        with self.connect() as ftp:
+            ftp.cwd(remote_dir)
+            names = set(ftp.nlst())
+        self._listing_cache[remote_dir] = (time.monotonic(), names)
+        return names
+
+    def _fresh_listing(self, remote_dir: str, ttl: Optional[float] = None) -> Optional[Set[str]]:
+        """Return the cached names in remote_dir if the listing is younger than ttl, else None."""
+        ttl = self.listing_ttl if ttl is None else ttl
+        cached = self._listing_cache.get(remote_dir)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        return None
+
+    def _acquire(self) -> ftplib.FTP:
+        """Return a live idle pooled connection, or open and log in a new one."""
+        while True:
+            try:
+                ftp, idle_since = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - idle_since <= self.idle_check:
+                return ftp
+            try:
+                ftp.voidcmd("NOOP")
+                return ftp
+            except ftplib.all_errors:
+                logger.debug(f"Dropping FTP connection to '{self.host}' that timed out while idle")
+                ftp.close()
+
+        logger.debug(f"Opening new FTP connection to '{self.host}'")
+        ftp = _ftp_connection(self.host, self.user, self.password)
+        self._tune_sockets(ftp)
+        return ftp
+
+    def _tune_sockets(self, ftp: ftplib.FTP) -> None:
+        """Apply socket_opts to the control socket and to each data socket ftp opens."""
+        opts = self.socket_opts
+        if not opts:
+            return
+        _apply_socket_opts(ftp.sock, opts)
+
+        # Data sockets are created per transfer in ntransfercmd; wrap it on this instance
+        open_data_connection = ftp.ntransfercmd
+
+        def ntransfercmd(cmd: str, rest: Optional[Union[int, str]] = None) -> Tuple[socket.socket, Optional[int]]:
+            conn, size = open_data_connection(cmd, rest)
+            _apply_socket_opts(conn, opts)
+            return conn, size
+
+        ftp.ntransfercmd = ntransfercmd  # type: ignore[method-assign]
+
+    def _release(self, ftp: ftplib.FTP) -> None:
+        """Return a connection to the pool if there is room, otherwise close it."""
+        # No NOOP here: the block just completed a command on it, and _acquire probes
+        # connections that have been idle longer than idle_check before reusing them
+        try:
+            self._pool.put_nowait((ftp, time.monotonic()))
+        except queue.Full:
+            self._discard(ftp)
+
+    @staticmethod
+    def _discard(ftp: ftplib.FTP) -> None:
+        """Close a connection, falling back to a hard close if QUIT fails."""
+        try:
+            ftp.quit()
+        except ftplib.all_errors:
+            ftp.close()
+
+    def _walk_mlsd(self, remote_dir: str, max_depth: Optional[int], max_concurrent: int) -> List[str]:
+        """Breadth-first MLSD walk of remote_dir, one level at a time; see list_recursive."""
+        files: List[str] = []
+        level = [""]
+        depth = 0
+        while level:
+            listings = self._list_level(remote_dir, level, max_concurrent)
+            next_level: List[str] = []
+            for rel_dir in level:
+                for name, facts in listings[rel_dir]:
+                    kind = facts.get("type", "").lower()
+                    rel_path = posixpath.join(rel_dir, name)
+                    if kind == "file":
+                        files.append(rel_path)
+                    elif kind == "dir" and (max_depth is None or depth < max_depth):
+                        next_level.append(rel_path)
+            level = next_level
+            depth += 1
+        return files
+
+    def _list_level(
+        self, remote_dir: str, rel_dirs: List[str], max_concurrent: int
+    ) -> Dict[str, List[Tuple[str, Dict[str, str]]]]:
+        """MLSD each of rel_dirs (relative to remote_dir), spread over up to max_concurrent connections."""
+        pending: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        for rel_dir in rel_dirs:
+            pending.put(rel_dir)
+        listings: Dict[str, List[Tuple[str, Dict[str, str]]]] = {}
+        failed = threading.Event()
+
+        workers = min(max(max_concurrent, 1), len(rel_dirs))
+        if workers == 1:
+            self._mlsd_worker(remote_dir, pending, listings, failed)
+            return listings
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ftp-list") as pool:
+            futures = [pool.submit(self._mlsd_worker, remote_dir, pending, listings, failed) for _ in range(workers)]
+            for future in futures:
+                future.result()
+        return listings
+
+    def _mlsd_worker(
+        self,
+        remote_dir: str,
+        pending: "queue.SimpleQueue[str]",
+        listings: Dict[str, List[Tuple[str, Dict[str, str]]]],
+        failed: threading.Event,
+    ) -> None:
+        """List queued directories over one connection until the queue drains or a worker fails."""
+        try:
+            with self.connect() as ftp:
+                while not failed.is_set():
+                    try:
+                        rel_dir = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    path = posixpath.join(remote_dir, rel_dir) if rel_dir else remote_dir
+                    # Drain the listing before the next command goes out on the control connection.
+                    # No facts argument: ftplib would send OPTS MLST, which sticks to this pooled
+                    # session and trims later MLSD listings on it; the default facts include type
+                    listings[rel_dir] = list(ftp.mlsd(path))
+        except BaseException:
+            failed.set()
+            raise
+
+    @staticmethod
+    def _walk_nlst(ftp: ftplib.FTP, remote_dir: str, max_depth: Optional[int]) -> List[str]:
+        """Breadth-first NLST walk of remote_dir, telling directories apart with CWD; see list_recursive."""
+        files: List[str] = []
+        pending = deque([("", 0)])
+        while pending:
+            rel_dir, depth = pending.popleft()
+            for name in ftp.nlst(posixpath.join(remote_dir, rel_dir) if rel_dir else remote_dir):
+                # Some servers answer NLST <dir> with full paths
+                rel_path = posixpath.join(rel_dir, posixpath.basename(name))
+                if max_depth is not None and depth >= max_depth:
+                    files.append(rel_path)
+                    continue
+                try:
+                    ftp.cwd(posixpath.join(remote_dir, rel_path))
+                except ftplib.error_perm:
+                    files.append(rel_path)
+                else:
+                    pending.append((rel_path, depth + 1))
+        return files
+
+    @staticmethod
+    def _check_not_directory(ftp: ftplib.FTP, remote_filename: str, remote_path: str) -> Optional[int]:
+        """
+        Make sure a remote name is not a directory and return its size if known.
+
+        A single SIZE answers the common case in one round-trip. Some servers
+        also refuse SIZE for regular files (e.g. while in ASCII mode), so a
+        refusal is confirmed with the slower CWD probe before treating the
+        name as a directory.
+
+        Raises:
+            FTP_IsADirectoryError: If the name is a directory
+        """
+        try:
+            return ftp.size(remote_filename)
+        except ftplib.error_perm:
+            pass
+
+        try:
+            ftp.cwd(remote_filename)
+        except ftplib.error_perm:
+            # Not a directory either; let RETR report the real error
+            return None
+        ftp.cwd("..")
+        raise FTP_IsADirectoryError(f"Path '{remote_path}' is a directory, not a file")
+
+    @staticmethod
+    def _split_remote_path(remote_path: str) -> Tuple[str, str]:
+        """Split a remote (always POSIX) path into its directory and file name."""
+        remote_dir, remote_filename = posixpath.split(str(remote_path))
+        return remote_dir or ".", remote_filename
+
+    def _retrieve(
+        self,
+        ftp: ftplib.FTP,
+        remote_filename: str,
+        local_path: Path,
+        size: Optional[int] = None,
+        hasher: Optional["hashlib._Hash"] = None,
+    ) -> None:
+        """
+        RETR a file from the current remote directory into local_path, block_size bytes at a time.
+
+        Blocks go straight from the data socket to os.write on a raw descriptor,
+        skipping the copy into a Python file buffer. When the size is known (from
+        SIZE) the file is preallocated up front and trimmed to the bytes actually
+        received afterwards, also when the transfer fails partway. If a hasher is
+        given it is fed each block too.
+        """
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+        preallocated = False
+        received = 0
+        try:
+            preallocated = isinstance(size, int) and size > 0 and _preallocate(fd, size)
+
+            def write(block: bytes) -> None:
+                nonlocal received
+                received += len(block)
+                if hasher is not None:
+                    hasher.update(block)
+                view = memoryview(block)
+                while view:
+                    view = view[os.write(fd, view) :]
+
+            ftp.retrbinary(f"RETR {remote_filename}", write, blocksize=self.block_size)
+        finally:
+            try:
+                # A failed RETR must not leave a file of the full remote size with a
+                # zero-filled tail: by size alone it would pass for a complete download
+                if preallocated and received != size:
+                    os.ftruncate(fd, received)
+            finally:
+                os.close(fd)
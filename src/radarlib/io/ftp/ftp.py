@@ -8,14 +8,50 @@ Created on Tue Sep 02 11:05:20 2025
 import asyncio
 import ftplib
 import logging
+import os
+import posixpath
+import queue
 import random
+import re
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Generator, Iterable, List
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Generator, Iterable, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Tamaño del buffer de recepción de RETR. El valor por defecto de ftplib (8 KiB) obliga a
+# una llamada a recv y a write por cada 8 KiB recibidos; con un buffer grande cada llamada
+# vacía todo lo que el socket ya tiene disponible.
+_RETR_BLOCKSIZE = 1 << 18
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# Nombre del radar (antes del primer "_") y fecha-hora (después del último "_") de un nombre BUFR,
+# p. ej. RMA1_0315_03_DBZH_20250925T000534Z.BUFR
+_BUFR_FNAME_RE = re.compile(r"([^_]*)_(?:.*_)?(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})Z\.BUFR")
+
+# Errores que vale la pena reintentar en exponential_backoff_retry: fallos de red y del
+# servidor FTP (ftplib.all_errors incluye OSError) y timeouts.
+_TRANSIENT_ERRORS = ftplib.all_errors + (asyncio.TimeoutError,)
+
+
+def _is_permanent_error(error: Optional[BaseException]) -> bool:
+    """
+    Indica si error es, o fue lanzado al manejar, una respuesta FTP permanente (5xx).
+
+    Sigue la cadena __cause__/__context__ porque los clientes suelen envolver el
+    ftplib.error_perm original en su propia excepción (p. ej. FTPError).
+    """
+    while error is not None:
+        if isinstance(error, ftplib.error_perm):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
 
 class FTPActionError(Exception):
     """Excepción personalizada para errores durante operaciones FTP después de una conexión exitosa."""
@@ -59,11 +95,13 @@ def ftp_connection_manager(host: str, user: str, password: str) -> Generator[ftp
     #     print(f"No se pudo completar la operación FTP: {e}")
     """
     ftp_connection = None
+    exito = False
     try:
         ftp_connection = _ftp_connection(host, user, password)
 
         # Devuelve la conexión al bloque 'with'
         yield ftp_connection
+        exito = True
 
     except ftplib.all_errors as e:
         error_message = f"Error al conectar o autenticar en el servidor FTP '{host}': {e}"
@@ -73,33 +111,205 @@ def ftp_connection_manager(host: str, user: str, password: str) -> Generator[ftp
         # Este bloque SIEMPRE se ejecuta, haya habido error o no.
         if ftp_connection:
             logger.info("Cerrando la conexión FTP.")
-            ftp_connection.quit()
+            _close_connection(ftp_connection, exito)
+
+
+def _close_connection(ftp: ftplib.FTP, ordenado: bool = True) -> None:
+    """
+    Cierra una conexión FTP.
+
+    Con ordenado=True envía QUIT y espera la respuesta del servidor; si el canal de
+    control ya está roto, cae a close() en lugar de lanzar. Con ordenado=False (rutas
+    de error, donde el servidor puede no responder) solo cierra los sockets, sin
+    esperar un round trip que podría demorar o tapar la excepción original.
+    """
+    if ordenado:
+        try:
+            ftp.quit()
+            return
+        except ftplib.all_errors:
+            pass
+    ftp.close()
 
 
 def _ftp_connection(host: str, user: str, password: str) -> ftplib.FTP:
     """
     Función auxiliar para establecer y devolver una conexión FTP autenticada.
     No maneja el cierre de la conexión; el llamador es responsable de ello.
+
+    El canal de control queda con TCP keepalive, para que una conexión reutilizada
+    entre transferencias no sea descartada en silencio por un firewall o NAT.
     """
     try:
         ftp = ftplib.FTP(host)
         ftp.login(user, password)
+        _enable_keepalive(ftp.sock)
         return ftp
     except ftplib.all_errors as e:
         error_message = f"Error al conectar o autenticar en el servidor FTP '{host}': {e}"
         raise ConnectionError(error_message) from e
 
 
-def _download_single_file(ftp: ftplib.FTP, remote_path: Path, local_path: Path):
+def _enable_keepalive(sock: Optional[socket.socket], idle: int = 60, interval: int = 15, count: int = 4) -> None:
+    """
+    Activa TCP keepalive en el canal de control para que una sesión ociosa
+    entre ciclos de polling no sea descartada por firewalls/NAT y para detectar
+    antes un peer caído. Las opciones TCP_KEEP* se aplican solo si la
+    plataforma las soporta.
+    """
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for opt_name, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", interval), ("TCP_KEEPCNT", count)):
+            opt = getattr(socket, opt_name, None)
+            if opt is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+    except OSError as e:
+        logger.debug(f"Could not enable TCP keepalive on FTP control socket: {e}")
+
+
+def _remote_is_dir(ftp: ftplib.FTP, nombre: str) -> bool:
+    """
+    Indica si un nombre remoto es un directorio con un único comando en el caso común.
+
+    Usa MLST, cuyo hecho `type` distingue archivos de directorios. Si el servidor no
+    implementa MLST (500/502), un SIZE exitoso confirma que es un archivo; solo cuando
+    SIZE también es rechazado se recurre a la prueba con CWD. Un nombre inexistente se
+    informa como no-directorio para que RETR reporte el error real.
+    """
+    try:
+        respuesta = ftp.sendcmd(f"MLST {nombre}")
+    except ftplib.error_perm as e:
+        if not str(e).startswith(("500", "502")):
+            return False
+        return _remote_is_dir_without_mlst(ftp, nombre)
+
+    # La respuesta es "250-...", una línea " type=dir;size=...; nombre" y "250 ..."
+    for linea in respuesta.splitlines()[1:]:
+        hechos, _, _ = linea.strip().partition(" ")
+        for hecho in hechos.split(";"):
+            clave, _, valor = hecho.partition("=")
+            if clave.lower() == "type":
+                return valor.lower() in ("dir", "cdir", "pdir")
+    return False
+
+
+def _remote_is_dir_without_mlst(ftp: ftplib.FTP, nombre: str) -> bool:
+    """
+    Variante de _remote_is_dir para servidores sin MLST: SIZE y, si es rechazado, CWD.
+    """
+    try:
+        ftp.size(nombre)
+        return False
+    except ftplib.error_perm:
+        # Algunos servidores rechazan SIZE también para archivos (p. ej. en modo ASCII)
+        pass
+
+    try:
+        # Si podemos entrar en el 'archivo', es un directorio.
+        ftp.cwd(nombre)
+    except ftplib.error_perm:
+        return False
+    ftp.cwd("..")  # ¡Importante! Regresamos al directorio padre.
+    return True
+
+
+def _retr_to_file(
+    ftp: ftplib.FTP,
+    comando: str,
+    local_path: Path,
+    offset: int = 0,
+    blocksize: int = _RETR_BLOCKSIZE,
+    drop_cache: bool = True,
+) -> int:
+    """
+    Ejecuta un RETR binario escribiendo los datos recibidos directamente en local_path.
+
+    A diferencia de retrbinary, no crea un objeto bytes ni invoca un callback de Python
+    por bloque: el socket de datos se lee con recv_into sobre un único buffer reutilizado
+    y cada lectura se escribe con os.write sobre un descriptor sin buffer.
+
+    Con offset > 0 la transferencia se retoma desde ese byte (REST) y los datos se agregan
+    al final de local_path en lugar de truncarlo. Con drop_cache se pide al kernel que
+    descarte del page cache el archivo terminado (ver _fadvise); conviene desactivarlo si
+    el archivo se va a leer enseguida.
+
+    Returns:
+        int: La cantidad de bytes recibidos.
+    """
+    modo = os.O_APPEND if offset else os.O_TRUNC
+    fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | modo | _O_BINARY, 0o644)
+    _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+    try:
+        ftp.voidcmd("TYPE I")
+        buffer = memoryview(bytearray(blocksize))
+        recibidos = 0
+        with ftp.transfercmd(comando, offset) if offset else ftp.transfercmd(comando) as conn:
+            while True:
+                n = conn.recv_into(buffer)
+                if not n:
+                    break
+                recibidos += n
+                # Se escribe cada lectura tal cual: acumular varias en el buffer antes de
+                # escribir (al estilo writev) hace menos syscalls pero resultó más lento
+                pendiente = buffer[:n]
+                while pendiente:
+                    pendiente = pendiente[os.write(fd, pendiente) :]
+        ftp.voidresp()
+        if drop_cache:
+            # Estas funciones copian archivos que no se vuelven a leer enseguida: que no
+            # desplacen del page cache a datos que sí se usan
+            _fadvise(fd, "POSIX_FADV_DONTNEED")
+        return recibidos
+    finally:
+        os.close(fd)
+
+
+def _fadvise(fd: int, consejo: str) -> None:
+    """Aplica posix_fadvise(fd, 0, 0, consejo) donde exista; en otras plataformas no hace nada."""
+    valor = getattr(os, consejo, None)
+    if valor is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, valor)
+    except OSError:
+        pass
+
+
+def _already_downloaded(ftp: ftplib.FTP, remote: str, local_path: Path) -> bool:
+    """
+    Indica si local_path ya tiene el mismo tamaño que el archivo remoto.
+
+    Primero se consulta el disco local: si el archivo no existe no se envía ningún
+    comando. Si el servidor no responde SIZE se asume que hay que descargarlo.
+    """
+    try:
+        tamaño_local = os.stat(local_path).st_size
+    except OSError:
+        return False
+    try:
+        # SIZE solo es confiable en modo binario; varios servidores lo rechazan en ASCII
+        ftp.voidcmd("TYPE I")
+        return ftp.size(remote) == tamaño_local
+    except ftplib.error_perm:
+        return False
+
+
+def _download_single_file(ftp: ftplib.FTP, remote_path: Path, local_path: Path, skip_existing: bool = False):
     """
     Función auxiliar que descarga un único archivo usando una conexión FTP activa.
     Gestiona el archivo local de forma segura con un gestor de contexto.
+
+    Con skip_existing, un archivo local del mismo tamaño que el remoto no se vuelve a descargar.
     """
     try:
-        # Usamos 'with open' para garantizar que el archivo local se cierre siempre.
-        with open(local_path, "wb") as archivo_local:
-            # El comando RETR necesita una cadena, no un objeto Path.
-            ftp.retrbinary(f"RETR {str(remote_path)}", archivo_local.write)
+        if skip_existing and _already_downloaded(ftp, str(remote_path), local_path):
+            logger.debug("    [Archivo] Ya descargado, se omite: '%s'", remote_path)
+            return
+        # _retr_to_file garantiza que el archivo local se cierre siempre.
+        # El comando RETR necesita una cadena, no un objeto Path.
+        _retr_to_file(ftp, f"RETR {str(remote_path)}", local_path)
         logger.info(f"    [Archivo] Descargado: '{remote_path}'")
     except ftplib.all_errors as e:
         logger.error(f"No se pudo descargar el archivo '{remote_path}': {e}")
@@ -109,27 +319,87 @@ def _download_single_file(ftp: ftplib.FTP, remote_path: Path, local_path: Path):
         # En un sistema robusto, podrías registrar este fallo en una lista y continuar.
 
 
-def _copy_folder_recursively(ftp: ftplib.FTP, current_remote_path: Path, current_local_path: Path):
+def _copy_folder_recursively(
+    ftp: ftplib.FTP,
+    current_remote_path: Path,
+    current_local_path: Path,
+    archivos: Optional[List[Tuple[Path, Path]]] = None,
+    skip_existing: bool = False,
+):
     """
     Función auxiliar recursiva.
-    Usa NLST y CWD para compatibilidad con servidores FTP antiguos que no soportan MLSD.
+    Usa MLSD, cuyo hecho `type` distingue archivos de directorios en el mismo listado,
+    así que cada directorio cuesta un único comando. Si el servidor no implementa MLSD
+    (500/502) recurre a _copy_folder_recursively_nlst.
+    Si se pasa `archivos`, los archivos no se descargan: se agregan a esa lista como
+    pares (ruta remota, ruta local) para descargarlos después.
+    Con skip_existing, el hecho `size` del mismo listado permite omitir los archivos que
+    ya existen localmente con ese tamaño sin enviar un SIZE por archivo.
+    """
+    try:
+        entradas = list(ftp.mlsd(str(current_remote_path), facts=["type", "size"]))
+    except ftplib.error_perm as e:
+        if str(e).startswith(("500", "502")):
+            logger.debug("El servidor no soporta MLSD; recorriendo con NLST y CWD")
+            _copy_folder_recursively_nlst(ftp, current_remote_path, current_local_path, archivos)
+        else:
+            logger.error(f"No se pudo listar el contenido del directorio remoto '{current_remote_path}': {e}")
+        return
+
+    for name, facts in entradas:
+        tipo = facts.get("type", "").lower()
+        # Ignoramos las referencias al directorio actual y padre.
+        if tipo in ("cdir", "pdir") or name in (".", ".."):
+            continue
+
+        next_remote_path = current_remote_path / name
+        next_local_path = current_local_path / name
+
+        if tipo == "dir":
+            logger.info(f"[Directorio] Creando y explorando: '{next_local_path}'")
+            next_local_path.mkdir(exist_ok=True)
+            _copy_folder_recursively(ftp, next_remote_path, next_local_path, archivos, skip_existing)
+        elif skip_existing and _same_size(next_local_path, facts.get("size")):
+            logger.debug("    [Archivo] Ya descargado, se omite: '%s'", next_remote_path)
+        # Cualquier otro tipo (file, enlaces) se trata como archivo, igual que en el recorrido con CWD
+        elif archivos is not None:
+            archivos.append((next_remote_path, next_local_path))
+        else:
+            _download_single_file(ftp, next_remote_path, next_local_path)
+
+
+def _same_size(local_path: Path, tamaño_remoto: Optional[str]) -> bool:
+    """Indica si local_path existe con el tamaño informado por el servidor (False si no se informó)."""
+    if not tamaño_remoto:
+        return False
+    try:
+        return os.stat(local_path).st_size == int(tamaño_remoto)
+    except (OSError, ValueError):
+        return False
+
+
+def _copy_folder_recursively_nlst(
+    ftp: ftplib.FTP,
+    current_remote_path: Path,
+    current_local_path: Path,
+    archivos: Optional[List[Tuple[Path, Path]]] = None,
+):
+    """
+    Variante de _copy_folder_recursively para servidores antiguos que no soportan MLSD.
+    Usa NLST y prueba cada nombre con CWD para saber si es un directorio.
     """
     try:
         # 1. Obtenemos la lista de nombres. NLST es universal.
         names = ftp.nlst(str(current_remote_path))
-        # nlst() puede devolver la ruta completa, así que extraemos solo el nombre base.
-        # Esto hace el código más robusto.
-        names = [Path(p).name for p in names]
+        # nlst() puede devolver la ruta completa, así que extraemos solo el nombre base
+        # (sin construir un Path por entrada) y descartamos ".", ".." y vacíos de una vez.
+        names = [n for n in (p.rstrip("/").rsplit("/", 1)[-1] for p in names) if n not in ("", ".", "..")]
 
     except ftplib.error_perm as e:
         logger.error(f"No se pudo listar el contenido del directorio remoto '{current_remote_path}': {e}")
         return
 
     for name in names:
-        # Ignoramos las referencias al directorio actual y padre.
-        if name in [".", ".."]:
-            continue
-
         next_remote_path = current_remote_path / name
         next_local_path = current_local_path / name
 
@@ -142,15 +412,18 @@ def _copy_folder_recursively(ftp: ftplib.FTP, current_remote_path: Path, current
             logger.info(f"[Directorio] Creando y explorando: '{next_local_path}'")
             next_local_path.mkdir(exist_ok=True)
             # Llamada recursiva. Es importante pasarle la ruta completa remota.
-            _copy_folder_recursively(ftp, next_remote_path, next_local_path)
+            _copy_folder_recursively_nlst(ftp, next_remote_path, next_local_path, archivos)
 
             # ¡Importante! Regresamos al directorio padre para continuar con el bucle.
             ftp.cwd(str(current_remote_path))
 
         except ftplib.error_perm:
             # Si CWD falla, asumimos que es un archivo.
-            # Llamamos a nuestra función de descarga de bajo nivel.
-            _download_single_file(ftp, next_remote_path, next_local_path)
+            if archivos is not None:
+                archivos.append((next_remote_path, next_local_path))
+            else:
+                # Llamamos a nuestra función de descarga de bajo nivel.
+                _download_single_file(ftp, next_remote_path, next_local_path)
 
 
 def list_files_in_remote_dir(host: str, user: str, password: str, remote_dir: str, method="nlst") -> Iterable[Any]:
@@ -219,6 +492,70 @@ def list_files_in_remote_dir(host: str, user: str, password: str, remote_dir: st
     # Lo dejamos propagarse al llamador.
 
 
+def iter_files_in_remote_dir(
+    host: str, user: str, password: str, remote_dir: str, method="nlst"
+) -> Generator[Any, None, None]:
+    """
+    Variante en streaming de list_files_in_remote_dir.
+
+    Entrega cada entrada del listado a medida que llega por la conexión de datos,
+    sin armar la lista completa: la memoria no crece con el tamaño del directorio
+    y la primera entrada está disponible tras un round trip. La conexión FTP queda
+    abierta mientras el generador esté vivo, así que hay que agotarlo o cerrarlo
+    (por ejemplo con contextlib.closing) en lugar de abandonarlo a medio recorrer.
+
+    Args:
+        host (str): La dirección IP o el nombre de dominio del servidor FTP.
+        user (str): El nombre de usuario para la autenticación.
+        password (str): La contraseña para la autenticación.
+        remote_dir (str): La ruta del directorio en el servidor FTP a listar.
+        method (str): "nlst" entrega nombres; "mlsd" entrega pares (nombre, hechos)
+                      como ftplib.FTP.mlsd. Por defecto es "nlst".
+
+    Yields:
+        Los nombres de archivo, o pares (nombre, dict de hechos) con "mlsd".
+
+    Raises:
+        ConnectionError: Si falla la conexión inicial o el login al servidor FTP.
+        FTPActionError: Si ocurre un error durante una operación FTP después de conectar.
+    """
+    logger.info(f"Listando en streaming '{remote_dir}' en el host '{host}'...")
+    try:
+        with ftp_connection_manager(host, user, password) as ftp:
+            ftp.cwd(remote_dir)
+            if method == "mlsd":
+                for linea in _iter_listing_lines(ftp, "MLSD"):
+                    yield _parse_mlsd_line(linea)
+            else:
+                yield from _iter_listing_lines(ftp, "NLST")
+    except ftplib.all_errors as e:
+        error_message = f"Una operación FTP falló al intentar listar el directorio '{remote_dir}': {e}"
+        raise FTPActionError(error_message) from e
+
+
+def _iter_listing_lines(ftp: ftplib.FTP, comando: str) -> Generator[str, None, None]:
+    """
+    Entrega las líneas de una transferencia de texto a medida que llegan (un retrlines en streaming).
+
+    ftplib.FTP.mlsd y nlst acumulan el listado completo antes de devolver la primera línea.
+    """
+    ftp.sendcmd("TYPE A")
+    with ftp.transfercmd(comando) as conn, conn.makefile("r", encoding=ftp.encoding) as fp:
+        for linea in fp:
+            yield linea.rstrip("\r\n")
+    ftp.voidresp()
+
+
+def _parse_mlsd_line(linea: str) -> Tuple[str, Dict[str, str]]:
+    """Separa una línea de MLSD ("type=file;size=10; nombre") en (nombre, hechos en minúsculas)."""
+    hechos, _, nombre = linea.partition(" ")
+    entrada: Dict[str, str] = {}
+    for hecho in hechos[:-1].split(";"):
+        clave, _, valor = hecho.partition("=")
+        entrada[clave.lower()] = valor
+    return nombre, entrada
+
+
 def download_file_from_ftp(
     host: str, user: str, password: str, remote_dir: str, remote_filename: str, local_filepath: Path
 ) -> None:
@@ -254,18 +591,7 @@ def download_file_from_ftp(
 
             # --- VERIFICACIÓN DE TIPO (NUEVO BLOQUE DE CÓDIGO) ---
             logger.info(f"Verificando que '{remote_filename}' no sea un directorio...")
-            es_directorio = False
-            try:
-                # Intentamos entrar en el 'archivo'. Si funciona, es un directorio.
-                ftp.cwd(remote_filename)
-                es_directorio = True
-                ftp.cwd("..")  # ¡Importante! Regresamos al directorio padre.
-            except ftplib.error_perm:
-                # Esperamos un error de permiso (ej. 550), lo que confirma que NO es un directorio.
-                # Este es el comportamiento normal y esperado para un archivo.
-                pass
-
-            if es_directorio:
+            if _remote_is_dir(ftp, remote_filename):
                 # Si logramos entrar, lanzamos nuestro error específico.
                 raise FTP_IsADirectoryError(
                     f"La ruta remota '{remote_filename}' es un directorio, no un archivo descargable."
@@ -273,15 +599,13 @@ def download_file_from_ftp(
             # --- FIN DE LA VERIFICACIÓN ---
 
             logger.info(f"Verificación exitosa. '{remote_filename}' es un archivo. Procediendo a descargar.")
-            with open(local_filepath, "wb") as archivo_local:
-
-                # La operación principal de descarga
-                comando = f"RETR {remote_filename}"
-                logger.info(f"Ejecutando comando FTP: '{comando}'")
+            # La operación principal de descarga
+            comando = f"RETR {remote_filename}"
+            logger.info(f"Ejecutando comando FTP: '{comando}'")
 
-                # retrbinary escribe los datos binarios directamente en el
-                # objeto de archivo local que le pasamos.
-                ftp.retrbinary(comando, archivo_local.write)
+            # _retr_to_file escribe los datos binarios directamente en el archivo local
+            # y garantiza que se cierre aunque la transferencia falle.
+            _retr_to_file(ftp, comando, local_filepath)
 
     except ftplib.all_errors as e:
         # Captura errores específicos de FTP (archivo no encontrado, permisos denegados, etc.)
@@ -296,15 +620,25 @@ def download_file_from_ftp(
 
 
 def download_multiple_files_from_ftp(
-    host: str, user: str, password: str, remote_dir: str, remote_filenames: List[str], local_dir: Path
+    host: str,
+    user: str,
+    password: str,
+    remote_dir: str,
+    remote_filenames: List[str],
+    local_dir: Path,
+    concurrency: int = 4,
+    skip_existing: bool = True,
 ) -> None:
     """
     Descarga una lista de archivos de un servidor FTP a un directorio local.
 
-    Abre una única conexión FTP para descargar todos los archivos de forma eficiente.
-    Utiliza gestores de contexto para garantizar el cierre seguro tanto de la
-    conexión FTP como de cada archivo local individualmente. Si la descarga de
-    un archivo falla, la función se detiene y lanza una excepción.
+    Reparte los archivos entre hasta `concurrency` conexiones FTP que descargan
+    en paralelo, cada una reutilizada para todos los archivos que toma, de modo
+    que la latencia de cada RETR se solapa con la de las demás. Utiliza gestores
+    de contexto para garantizar el cierre seguro tanto de las conexiones FTP
+    como de cada archivo local individualmente. Si la descarga de un archivo
+    falla, las demás conexiones dejan de tomar archivos y la función lanza la
+    excepción.
 
     Args:
         host (str): La dirección IP o el nombre de dominio del servidor FTP.
@@ -313,6 +647,12 @@ def download_multiple_files_from_ftp(
         remote_dir (str): El directorio remoto donde se encuentran los archivos.
         remote_filenames (List[str]): Una lista con los nombres de los archivos a descargar.
         local_dir (Path): El directorio local donde se guardarán los archivos.
+        concurrency (int): Número máximo de conexiones FTP simultáneas. No debe superar
+                           el límite de sesiones por IP del servidor (p. ej. MaxClientsPerIP):
+                           las conexiones rechazadas hacen fallar el lote.
+        skip_existing (bool): Si es True, no se descargan los archivos que ya existen en
+                              `local_dir` con el mismo tamaño que en el servidor (SIZE),
+                              de modo que repetir un lote interrumpido solo trae lo que falta.
 
     Raises:
         ConnectionError: Si falla la conexión inicial o el login al servidor FTP.
@@ -321,68 +661,149 @@ def download_multiple_files_from_ftp(
         IOError: Si ocurre un error al escribir un archivo en el disco local.
     """
     logger.info(f"Iniciando descarga por lotes desde '{host}/{remote_dir}'.")
+    pendientes: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+    for nombre_archivo in remote_filenames:
+        pendientes.put(nombre_archivo)
+    fallo = threading.Event()
+    workers = min(max(concurrency, 1), len(remote_filenames))
+
     try:
-        # El gestor de contexto externo maneja la conexión FTP para toda la sesión.
-        # Se conecta una vez, descarga todo y luego se cierra. Es muy eficiente.
+        if workers <= 1:
+            _download_files_worker(host, user, password, remote_dir, local_dir, pendientes, fallo, skip_existing)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ftp-download") as pool:
+                futures = [
+                    pool.submit(
+                        _download_files_worker,
+                        host,
+                        user,
+                        password,
+                        remote_dir,
+                        local_dir,
+                        pendientes,
+                        fallo,
+                        skip_existing,
+                    )
+                    for _ in range(workers)
+                ]
+                for future in futures:
+                    future.result()
+
+    except IOError as e:
+        # Captura errores de escritura en disco.
+        mensaje_error = f"No se pudo escribir en el directorio local '{local_dir}': {e}"
+        raise IOError(mensaje_error) from e
+
+    logger.info("Todas las descargas solicitadas se completaron exitosamente.")
+
+
+def _download_files_worker(
+    host: str,
+    user: str,
+    password: str,
+    remote_dir: str,
+    local_dir: Path,
+    pendientes: "queue.SimpleQueue[str]",
+    fallo: threading.Event,
+    skip_existing: bool = False,
+) -> None:
+    """
+    Descarga archivos de la cola sobre una única conexión hasta vaciarla o hasta que otro worker falle.
+    """
+    try:
+        # El gestor de contexto maneja la conexión FTP de este worker: se conecta una
+        # vez, descarga todos los archivos que toma de la cola y luego se cierra.
         with ftp_connection_manager(host, user, password) as ftp:
             logger.info("Conexión FTP establecida. Navegando al directorio remoto...")
             ftp.cwd(remote_dir)
+            # Un único listado por conexión responde qué nombres son directorios,
+            # en lugar de una consulta al servidor antes de cada RETR
+            directorios = _list_remote_dirs(ftp)
 
-            # Iteramos sobre cada archivo que necesitamos descargar.
-            for nombre_archivo in remote_filenames:
-                # Construimos la ruta local completa de forma segura con pathlib.
-                ruta_archivo_local = local_dir / nombre_archivo
-                logger.info(f"Procesando descarga de '{nombre_archivo}' a '{ruta_archivo_local}'...")
-
-                # --- VERIFICACIÓN DE TIPO (NUEVO BLOQUE DE CÓDIGO) ---
-                logger.info(f"Verificando que '{nombre_archivo}' no sea un directorio...")
-                es_directorio = False
+            while not fallo.is_set():
                 try:
-                    # Intentamos entrar en el 'archivo'. Si funciona, es un directorio.
-                    ftp.cwd(nombre_archivo)
-                    es_directorio = True
-                    ftp.cwd("..")  # ¡Importante! Regresamos al directorio padre.
-                except ftplib.error_perm:
-                    # Esperamos un error de permiso (ej. 550), lo que confirma que NO es un directorio.
-                    # Este es el comportamiento normal y esperado para un archivo.
-                    pass
-
-                if es_directorio:
-                    # Si logramos entrar, lanzamos nuestro error específico.
-                    raise FTP_IsADirectoryError(
-                        f"La ruta remota '{nombre_archivo}' es un directorio, no un archivo descargable."
-                    )
-                # --- FIN DE LA VERIFICACIÓN ---
+                    nombre_archivo = pendientes.get_nowait()
+                except queue.Empty:
+                    return
+                _download_named_file(ftp, nombre_archivo, local_dir, directorios, skip_existing)
+    except BaseException:
+        fallo.set()
+        raise
 
-                try:
-                    # El gestor de contexto interno maneja cada archivo local.
-                    # Garantiza que el archivo se cierre sin importar si la descarga tiene éxito o no.
-                    with open(ruta_archivo_local, "wb") as archivo_local:
-                        comando = f"RETR {nombre_archivo}"
-                        ftp.retrbinary(comando, archivo_local.write)
 
-                    logger.info(f"'{nombre_archivo}' descargado con éxito.")
+def _list_remote_dirs(ftp: ftplib.FTP) -> Optional[Set[str]]:
+    """
+    Devuelve los nombres de los subdirectorios del directorio remoto actual con un solo MLSD.
 
-                except ftplib.all_errors as e:
-                    # Si un archivo falla, lo envolvemos en nuestro error y relanzamos.
-                    # Esto detendrá toda la operación.
-                    mensaje_error = f"Falló la descarga del archivo '{nombre_archivo}': {e}"
-                    raise FTPActionError(mensaje_error) from e
+    Devuelve None si el servidor no puede listar con MLSD; en ese caso cada nombre
+    se verifica por separado con _remote_is_dir.
+    """
+    try:
+        return {name for name, facts in ftp.mlsd(facts=["type"]) if facts.get("type", "").lower() == "dir"}
+    except ftplib.error_perm:
+        return None
 
-    except IOError as e:
-        # Captura errores de escritura en disco.
-        mensaje_error = f"No se pudo escribir en el directorio local '{local_dir}': {e}"
-        raise IOError(mensaje_error) from e
 
-    logger.info("Todas las descargas solicitadas se completaron exitosamente.")
+def _download_named_file(
+    ftp: ftplib.FTP,
+    nombre_archivo: str,
+    local_dir: Path,
+    directorios: Optional[Set[str]] = None,
+    skip_existing: bool = False,
+) -> None:
+    """
+    Descarga un archivo del directorio remoto actual a local_dir, verificando antes que no sea un directorio.
+
+    Si se pasa `directorios` (ver _list_remote_dirs), la verificación no consulta al servidor.
+    Con skip_existing, un archivo local del mismo tamaño que el remoto no se vuelve a descargar.
+    """
+    # Construimos la ruta local completa de forma segura con pathlib.
+    ruta_archivo_local = local_dir / nombre_archivo
+    logger.info(f"Procesando descarga de '{nombre_archivo}' a '{ruta_archivo_local}'...")
+
+    # --- VERIFICACIÓN DE TIPO ---
+    logger.info(f"Verificando que '{nombre_archivo}' no sea un directorio...")
+    if directorios is not None and "/" not in nombre_archivo:
+        es_directorio = nombre_archivo in directorios
+    else:
+        es_directorio = _remote_is_dir(ftp, nombre_archivo)
+    if es_directorio:
+        # Si logramos entrar, lanzamos nuestro error específico.
+        raise FTP_IsADirectoryError(f"La ruta remota '{nombre_archivo}' es un directorio, no un archivo descargable.")
+    # --- FIN DE LA VERIFICACIÓN ---
+
+    try:
+        if skip_existing and _already_downloaded(ftp, nombre_archivo, ruta_archivo_local):
+            logger.info(f"'{nombre_archivo}' ya existe localmente con el mismo tamaño; se omite.")
+            return
+
+        # _retr_to_file garantiza que el archivo local se cierre sin importar si la descarga tiene éxito o no.
+        _retr_to_file(ftp, f"RETR {nombre_archivo}", ruta_archivo_local)
 
+        logger.info(f"'{nombre_archivo}' descargado con éxito.")
 
-def download_ftp_folder(host: str, user: str, password: str, remote_path: Path, local_path: Path):
+    except ftplib.all_errors as e:
+        # Si un archivo falla, lo envolvemos en nuestro error y relanzamos.
+        # Esto detendrá toda la operación.
+        mensaje_error = f"Falló la descarga del archivo '{nombre_archivo}': {e}"
+        raise FTPActionError(mensaje_error) from e
+
+
+def download_ftp_folder(
+    host: str,
+    user: str,
+    password: str,
+    remote_path: Path,
+    local_path: Path,
+    concurrency: int = 4,
+    skip_existing: bool = True,
+):
     """
     Descarga un directorio completo de forma recursiva desde un servidor FTP.
 
-    Esta función establece una única conexión segura y la reutiliza para descargar
-    toda la estructura de directorios y archivos de manera eficiente.
+    Recorre el árbol con una única conexión, creando los directorios locales y
+    reuniendo los archivos a descargar, y después descarga esos archivos en
+    paralelo sobre hasta `concurrency` conexiones.
 
     Args:
         host (str): La dirección IP o el nombre de dominio del servidor FTP.
@@ -390,18 +811,45 @@ def download_ftp_folder(host: str, user: str, password: str, remote_path: Path,
         password (str): La contraseña para la autenticación.
         remote_path (Path): La ruta del directorio en el servidor FTP a descargar.
         local_path (Path): El directorio local donde se guardará el contenido.
+        concurrency (int): Número máximo de conexiones FTP simultáneas para las descargas
+                           (la del recorrido incluida). No debe superar el límite de sesiones
+                           por IP del servidor.
+        skip_existing (bool): Si es True, no se descargan los archivos que ya existen
+                              localmente con el mismo tamaño que en el servidor. El tamaño
+                              sale del mismo listado MLSD del recorrido; solo se consulta
+                              con SIZE si el servidor no lo informa.
 
     Lanza:
         ConnectionError: Si la conexión inicial o el login al servidor FTP fallan.
     """
     logger.info(f"Iniciando copia recursiva de FTP:'{remote_path}' a Local:'{local_path}'...")
     try:
-        # El gestor de contexto establece la conexión que se usará para toda la operación.
+        archivos: List[Tuple[Path, Path]] = []
+        # El gestor de contexto establece la conexión que se usará para recorrer el árbol.
         with ftp_connection_manager(host, user, password) as ftp:
             # Creamos el directorio raíz local donde se guardará todo.
             local_path.mkdir(parents=True, exist_ok=True)
-            # Iniciamos el proceso recursivo.
-            _copy_folder_recursively(ftp, remote_path, local_path)
+            # Iniciamos el proceso recursivo, que solo reúne los archivos.
+            _copy_folder_recursively(ftp, remote_path, local_path, archivos, skip_existing)
+
+            pendientes: "queue.SimpleQueue[Tuple[Path, Path]]" = queue.SimpleQueue()
+            for archivo in archivos:
+                pendientes.put(archivo)
+
+            # La conexión del recorrido ya está autenticada: descarga también, junto a
+            # workers - 1 conexiones nuevas, en lugar de quedar ociosa.
+            workers = min(max(concurrency, 1), len(archivos))
+            if workers <= 1:
+                _drain_folder_queue(ftp, pendientes, skip_existing)
+            else:
+                with ThreadPoolExecutor(max_workers=workers - 1, thread_name_prefix="ftp-download") as pool:
+                    futures = [
+                        pool.submit(_download_folder_worker, host, user, password, pendientes, skip_existing)
+                        for _ in range(workers - 1)
+                    ]
+                    _drain_folder_queue(ftp, pendientes, skip_existing)
+                    for future in futures:
+                        future.result()
 
         logger.info("Copia recursiva completada exitosamente.")
     except ConnectionError as e:
@@ -412,27 +860,56 @@ def download_ftp_folder(host: str, user: str, password: str, remote_path: Path,
         raise
 
 
-def build_ftp_path(fname: str, base_dir: str = "L2") -> Path:
+def _download_folder_worker(
+    host: str,
+    user: str,
+    password: str,
+    pendientes: "queue.SimpleQueue[Tuple[Path, Path]]",
+    skip_existing: bool = False,
+):
+    """
+    Abre una conexión propia y descarga con ella los archivos de la cola hasta vaciarla.
+    """
+    with ftp_connection_manager(host, user, password) as ftp:
+        _drain_folder_queue(ftp, pendientes, skip_existing)
+
+
+def _drain_folder_queue(
+    ftp: ftplib.FTP, pendientes: "queue.SimpleQueue[Tuple[Path, Path]]", skip_existing: bool = False
+):
+    """
+    Descarga pares (ruta remota, ruta local) de la cola sobre la conexión dada hasta vaciarla.
+    """
+    while True:
+        try:
+            ruta_remota, ruta_local = pendientes.get_nowait()
+        except queue.Empty:
+            return
+        _download_single_file(ftp, ruta_remota, ruta_local, skip_existing)
+
+
+def build_ftp_path(fname: str, base_dir: str = "L2") -> PurePosixPath:
     """
     Build the FTP full path from BUFR filename.
 
+    The result is a PurePosixPath: remote paths use "/" on every platform.
+
     Example:
-        build_ftp_path("/L2", "RMA1", "RMA1_0315_03_DBZH_20250925T000534Z.BUFR")
-        -> "/L2/RMA1/2025/09/25/00/0534/RMA1_0315_03_DBZH_20250925T000534Z.BUFR"
+        build_ftp_path("RMA1_0315_03_DBZH_20250925T000534Z.BUFR", "/L2")
+        -> PurePosixPath("/L2/RMA1/2025/09/25/00/0534/RMA1_0315_03_DBZH_20250925T000534Z.BUFR")
     """
-    # extract datetime part of filename
+    # extract radar name and datetime part of filename in one match, without strptime
     # Example fname: RMA1_0315_03_DBZH_20250925T000534Z.BUFR
-    datetime_str = fname.split("_")[-1].replace("Z.BUFR", "")
-    nombre_radar = fname.split("_")[0]
-    dt = datetime.strptime(datetime_str, "%Y%m%dT%H%M%S")
-
-    year = dt.strftime("%Y")
-    month = dt.strftime("%m")
-    day = dt.strftime("%d")
-    hour = dt.strftime("%H")
-    minutesec = dt.strftime("%M%S")
+    match = _BUFR_FNAME_RE.fullmatch(fname)
+    if match is None:
+        raise ValueError(f"'{fname}' is not a BUFR filename ending in _YYYYMMDDTHHMMSSZ.BUFR")
+    nombre_radar, year, month, day, hour, minute, second = match.groups()
+    # Reject impossible dates the way strptime did
+    datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    minutesec = minute + second
 
-    return Path(base_dir) / nombre_radar / year / month / day / hour / minutesec / fname
+    # One join and one path object instead of a chain of seven "/" operators; remote paths are POSIX
+    return PurePosixPath(posixpath.join(base_dir, f"{nombre_radar}/{year}/{month}/{day}/{hour}/{minutesec}/{fname}"))
 
 
 def parse_ftp_path(remote_path: str):
@@ -448,10 +925,11 @@ def parse_ftp_path(remote_path: str):
             "field_type": "DBZH"
         }
     """
-    path = Path(remote_path)
-    fname = path.name
-    radar_code = path.parts[-7]  # e.g. "RMA1"
-    year, month, day, hour, minsec = path.parts[-6:-1]
+    # Las rutas remotas son siempre POSIX: basta con partir la cadena, sin construir un Path por archivo
+    parts = [part for part in remote_path.split("/") if part]
+    fname = parts[-1]
+    radar_code = parts[-7]  # e.g. "RMA1"
+    year, month, day, hour, minsec = parts[-6:-1]
 
     dt = datetime(int(year), int(month), int(day), int(hour), int(minsec[:2]), int(minsec[2:]))
 
@@ -460,30 +938,43 @@ def parse_ftp_path(remote_path: str):
     return {"radar_code": radar_code, "file_name": fname, "datetime": dt, "field_type": field_type}
 
 
-async def exponential_backoff_retry(coro, max_retries: int = 5, base_delay: float = 1, max_delay: float = 60) -> None:
+async def exponential_backoff_retry(
+    coro,
+    max_retries: int = 5,
+    base_delay: float = 1,
+    max_delay: float = 60,
+    retry_on: Tuple[type, ...] = _TRANSIENT_ERRORS,
+) -> Any:
     """
     Retry an async callable (typically an FTP download) with exponential backoff.
 
+    Only exceptions in retry_on are retried; anything else (a programming error,
+    FTP_IsADirectoryError, ...) propagates on the first attempt. Permanent 5xx
+    replies (ftplib.error_perm, also when wrapped in one of retry_on, like a
+    550 "file not found") are never retried either.
+
     :param coro: async coroutine function (callable) with no args or bound via lambda
     :param max_retries: total number of attempts before raising
     :param base_delay: first delay in seconds (default=1)
     :param max_delay: maximum cap for delay
+    :param retry_on: exception types worth retrying (default: ftplib errors, OSError and timeouts)
+    :return: whatever the first successful call of coro returns
     """
+    # The whole schedule is known up front: one capped delay per retry
+    delays = tuple(min(max_delay, base_delay * (1 << i)) for i in range(max(max_retries - 1, 0)))
     attempt = 0
     while True:
         try:
             return await coro()  # run the work
-        except Exception as e:
-            attempt += 1
-            if attempt >= max_retries:
-                raise  # re-raise after too many failures
+        except retry_on as e:
+            if attempt >= len(delays) or _is_permanent_error(e):
+                raise  # re-raise after too many failures, or right away if retrying cannot help
 
-            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            delay = delays[attempt]
+            attempt += 1
             # add jitter so multiple workers don't retry in sync
-            jitter = random.uniform(0, delay / 4)
-            sleep_time = delay + jitter
-            logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {sleep_time:.1f} seconds...")
-            print(f"Retry attempt {attempt} after {sleep_time:.1f}s due to {e}")
+            sleep_time = delay + random.uniform(0, delay / 4)
+            logger.warning("Attempt %d failed: %s. Retrying in %.1f seconds...", attempt, e, sleep_time)
             await asyncio.sleep(sleep_time)
 
 
@@ -2,37 +2,98 @@ import asyncio
 import ftplib
 import logging
 import os
+import posixpath
+import queue
 import re
+import socket
 import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Generator, List, Optional, Tuple
+from pathlib import Path, PurePath
+from typing import Any, AsyncGenerator, Callable, Generator, List, Optional, Tuple, Union
 
 from radarlib.utils.names_utils import build_vol_types_regex
 
+from .client import DEFAULT_SOCKET_OPTS, _apply_socket_opts
+from .ftp import _close_connection, _enable_keepalive, _retr_to_file
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Tamaño de bloque para RETR en modo binario (TYPE I): leer el canal de datos
+# en bloques de 1 MiB (el default de ftplib es 8 KiB) sobre un buffer reutilizado
+# reduce iteraciones Python y syscalls por archivo.
+DOWNLOAD_BLOCKSIZE = 1 << 20
+
 
 class FTPError(Exception):
     """Base class for FTP errors."""
 
 
+def _partial_size(local_path: Path) -> int:
+    """Devuelve el tamaño de una descarga previa en local_path, o 0 si no existe."""
+    try:
+        return os.stat(local_path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _retrieve_into(
+    ftp: ftplib.FTP, fname: str, local_path: Path, offset: int = 0, blocksize: int = DOWNLOAD_BLOCKSIZE
+) -> int:
+    """
+    Descarga fname del directorio remoto actual en local_path y devuelve el tamaño final del archivo.
+
+    Los datos se leen con recv_into sobre un buffer reutilizado y se escriben con os.write
+    (ver _retr_to_file), sin un bytes ni un callback por bloque. Con offset > 0 pide al
+    servidor que retome desde ese byte (REST) y agrega los datos al final del archivo
+    existente, en lugar de truncarlo. El directorio padre se crea solo si falta: en un
+    daemon todos los archivos van al mismo directorio, así que intentar abrir primero
+    evita un mkdir (y su stat) por cada archivo descargado.
+    """
+    comando = f"RETR {fname}"
+    # The processing daemon reads each BUFR back right away, so keep it in the page cache
+    try:
+        recibidos = _retr_to_file(ftp, comando, local_path, offset, blocksize, drop_cache=False)
+    except FileNotFoundError:
+        # Raised by the local open, before anything is sent to the server
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        recibidos = _retr_to_file(ftp, comando, local_path, offset, blocksize, drop_cache=False)
+    return offset + recibidos
+
+
 class RadarFTPClient:
     """
     Efficient FTP client for radar BUFR data retrieval.
     - Maintains a single FTP connection during operations
     - Supports traversal of nested YYYY/MM/DD/HH/MM folder structures
     - Provides methods to list, traverse, and download files
+    - Downloads read block_size bytes per recv (DOWNLOAD_BLOCKSIZE by default)
+    - rcvbuf, if given, sets SO_RCVBUF on every data socket; by default the kernel
+      autotunes it, which an explicit size turns off on Linux
     """
 
-    def __init__(self, host: str, user: str, password: str, base_dir: str = "L2", timeout: int = 30):
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        base_dir: str = "L2",
+        timeout: int = 30,
+        block_size: int = DOWNLOAD_BLOCKSIZE,
+        rcvbuf: Optional[int] = None,
+    ):
         self.host = host
         self.user = user
         self.password = password
         self.base_dir = base_dir
         self.timeout = timeout
+        self.block_size = block_size
+        self.rcvbuf = rcvbuf
         self.ftp: Optional[ftplib.FTP] = None
+        # Cleared the first time the server rejects MLSD; listings then use CWD + NLST
+        self._mlsd_supported = True
 
     def _connect(self) -> None:
         """Establece una nueva conexión FTP y hace login."""
@@ -50,11 +111,30 @@ class RadarFTPClient:
             self.ftp = ftplib.FTP(timeout=self.timeout)
             self.ftp.connect(self.host)
             self.ftp.login(self.user, self.password)
+            _enable_keepalive(self.ftp.sock)
+            self._tune_sockets(self.ftp)
             logger.info(f"Connected to FTP {self.host}")
         except ftplib.all_errors as e:
             self.ftp = None
             raise FTPError(f"Error connecting to FTP {self.host}: {e}")
 
+    def _tune_sockets(self, ftp: ftplib.FTP) -> None:
+        """Apply DEFAULT_SOCKET_OPTS to the control socket and rcvbuf to each data socket ftp opens."""
+        _apply_socket_opts(ftp.sock, DEFAULT_SOCKET_OPTS)
+        if not self.rcvbuf:
+            return
+        data_opts = {(socket.SOL_SOCKET, socket.SO_RCVBUF): self.rcvbuf}
+
+        # Data sockets are created per transfer in ntransfercmd; wrap it on this instance
+        open_data_connection = ftp.ntransfercmd
+
+        def ntransfercmd(cmd: str, rest: Optional[Union[int, str]] = None) -> Tuple[socket.socket, Optional[int]]:
+            conn, size = open_data_connection(cmd, rest)
+            _apply_socket_opts(conn, data_opts)
+            return conn, size
+
+        ftp.ntransfercmd = ntransfercmd  # type: ignore[method-assign]
+
     # ----------------------
     # Context Manager
     # ----------------------
@@ -67,6 +147,16 @@ class RadarFTPClient:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        # if self.ftp:
+        #     try:
+        #         self.ftp.quit()
+        #     except Exception:
+        #         self.ftp.close()
+        # logger.info("FTP connection closed")
+
+    def close(self) -> None:
+        """Cierra la sesión FTP actual (QUIT, o close si el peer ya no responde)."""
         if self.ftp:
             try:
                 self.ftp.quit()
@@ -77,12 +167,6 @@ class RadarFTPClient:
                     pass
         logger.info("FTP connection closed")
         self.ftp = None
-        # if self.ftp:
-        #     try:
-        #         self.ftp.quit()
-        #     except Exception:
-        #         self.ftp.close()
-        # logger.info("FTP connection closed")
 
     def is_connected(self) -> bool:
         """
@@ -120,6 +204,13 @@ class RadarFTPClient:
             time.sleep(backoff * (2 ** (attempt - 1)))
         raise FTPError(f"Could not connect to FTP {self.host} after {retries} attempts: {last_exc}")
 
+    def ensure_connected(self) -> None:
+        """
+        Reutiliza la sesión existente si responde a NOOP; si no, reconecta.
+        Pensado para clientes de larga vida (daemons) que hacen polling periódico.
+        """
+        self._ensure_connection()
+
     # ----------------------
     # Low-level listing
     # ----------------------
@@ -153,6 +244,51 @@ class RadarFTPClient:
         except ftplib.all_errors as e:
             raise FTPError(f"Error listing directory {remote_path}: {e}")
 
+    def list_entries(self, remote_path: str) -> List[Tuple[str, str]]:
+        """
+        List (name, type) pairs of a directory with a single MLSD on the active connection.
+
+        The absolute path goes in the MLSD itself, so no CWD round-trip is needed, and
+        the type fact ("dir", "file", ...) comes in the same listing. Servers without
+        MLSD are listed with CWD + NLST and report an empty type.
+        Reintenta la operación si detecta pérdida de conexión (EOFError).
+        """
+        self._ensure_connection()
+        try:
+            return self._list_entries(remote_path)
+        except EOFError as e:
+            logger.warning(f"EOFError while listing {remote_path}: trying to reconnect and retry: {e}")
+            try:
+                self._ensure_connection()
+                return self._list_entries(remote_path)
+            except Exception as e2:
+                raise FTPError(f"Error listing directory {remote_path} after reconnect: {e2}")
+        except ftplib.all_errors as e:
+            raise FTPError(f"Error listing directory {remote_path}: {e}")
+
+    def _list_entries(self, remote_path: str, ftp: Optional[ftplib.FTP] = None) -> List[Tuple[str, str]]:
+        """list_entries on ftp (the client's own session by default), without reconnect handling."""
+        ftp = ftp or self.ftp
+        if self._mlsd_supported:
+            try:
+                # No facts argument: ftplib would send an extra OPTS MLST per listing, and
+                # the server's default facts already include type
+                listing = ftp.mlsd(remote_path)  # type: ignore
+                entries = [(name, facts.get("type", "").lower()) for name, facts in listing]
+                return [entry for entry in entries if entry[1] not in ("cdir", "pdir")]
+            except ftplib.error_perm as e:
+                # 500/502: command not recognised/implemented; anything else is a real error
+                if not str(e).startswith(("500", "502")):
+                    raise
+                logger.debug(f"MLSD not supported by {self.host}, listing with NLST")
+                self._mlsd_supported = False
+        ftp.cwd(remote_path)  # type: ignore
+        return [(name, "") for name in ftp.nlst()]  # type: ignore
+
+    def _list_names(self, remote_path: str, kind: str) -> List[str]:
+        """Names in remote_path whose type is kind, plus those whose type the server did not report."""
+        return [name for name, type_ in self.list_entries(remote_path) if type_ in (kind, "")]
+
     # ----------------------
     # File download
     # ----------------------
@@ -190,11 +326,9 @@ class RadarFTPClient:
 
     def download_file(self, remote_path: str, local_path: Path) -> Path:
         """Download a single file efficiently using the current session."""
-        local_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            with open(local_path, "wb") as f:
-                self.ftp.retrbinary(f"RETR {remote_path}", f.write)  # type: ignore
-            logger.info(f"Downloaded {remote_path} -> {local_path}")
+            _retrieve_into(self.ftp, remote_path, local_path, blocksize=self.block_size)  # type: ignore
+            logger.info("Downloaded %s -> %s", remote_path, local_path)
             return local_path
         except ftplib.all_errors as e:
             raise FTPError(f"Error downloading {remote_path}: {e}")
@@ -214,9 +348,14 @@ class RadarFTPClient:
         """
         Traverse FTP folders for BUFR files, constrained to dt_start..dt_end.
         Correctly handles boundary pruning at each level.
+
+        Each folder costs one MLSD (see list_entries): only directories are followed
+        at the year..minute levels and only files are reported at the leaves.
         """
         if vol_types is not None and isinstance(vol_types, dict):
             vol_types = build_vol_types_regex(vol_types)
+        # Bound once here instead of looking up .match for every file name
+        match = None if vol_types is None else vol_types.match
 
         base_path = f"/{self.base_dir}/{radar_name}"
         if dt_start is None:
@@ -225,79 +364,61 @@ class RadarFTPClient:
             dt_end = datetime.max.replace(tzinfo=timezone.utc)
 
         try:
-            years = sorted(self.list_dir(base_path))
-            for y in years:
-                yi = int(y)
-                if yi < dt_start.year or yi > dt_end.year:
-                    continue
+            # Each level is sorted numerically and sliced with bisect to the part within
+            # dt_start..dt_end; a bound applies only while on the start/end branch
+            for yi, y in self._in_range(self._list_names(base_path, "dir"), dt_start.year, dt_end.year):
                 year_path = f"{base_path}/{y}"
+                on_start, on_end = yi == dt_start.year, yi == dt_end.year
 
-                months = sorted(self.list_dir(year_path))
-                for m in months:
-                    mi = int(m)
-                    if yi == dt_start.year and mi < dt_start.month:
-                        continue
-                    if yi == dt_end.year and mi > dt_end.month:
-                        continue
+                months = self._list_names(year_path, "dir")
+                lo, hi = dt_start.month if on_start else 0, dt_end.month if on_end else 99
+                for mi, m in self._in_range(months, lo, hi):
                     month_path = f"{year_path}/{m}"
+                    on_start_m, on_end_m = on_start and mi == dt_start.month, on_end and mi == dt_end.month
 
-                    days = sorted(self.list_dir(month_path))
-                    for d in days:
-                        di = int(d)
-                        if yi == dt_start.year and mi == dt_start.month and di < dt_start.day:
-                            continue
-                        if yi == dt_end.year and mi == dt_end.month and di > dt_end.day:
-                            continue
+                    days = self._list_names(month_path, "dir")
+                    lo, hi = dt_start.day if on_start_m else 0, dt_end.day if on_end_m else 99
+                    for di, d in self._in_range(days, lo, hi):
                         day_path = f"{month_path}/{d}"
+                        on_start_d, on_end_d = on_start_m and di == dt_start.day, on_end_m and di == dt_end.day
 
-                        hours = sorted(self.list_dir(day_path))
-                        for h in hours:
-                            hi = int(h)
-                            if (
-                                yi == dt_start.year
-                                and mi == dt_start.month
-                                and di == dt_start.day
-                                and hi < dt_start.hour
-                            ):
-                                continue
-                            if yi == dt_end.year and mi == dt_end.month and di == dt_end.day and hi > dt_end.hour:
-                                continue
+                        hours = self._list_names(day_path, "dir")
+                        lo, hi = dt_start.hour if on_start_d else 0, dt_end.hour if on_end_d else 99
+                        for hi_val, h in self._in_range(hours, lo, hi):
                             hour_path = f"{day_path}/{h}"
 
-                            minutes = sorted(self.list_dir(hour_path))
-                            for ms in minutes:
+                            minutes = []
+                            for ms in self._list_names(hour_path, "dir"):
                                 mi_val = int(ms[:2])
                                 sec_val = int(ms[2:]) if len(ms) > 2 else 0
-                                dt = datetime(yi, mi, di, hi, mi_val, sec_val, tzinfo=timezone.utc)
-
-                                # ---------- INCLUSIVITY LOGIC ----------
-                                if include_start:
-                                    if dt < dt_start:
-                                        continue
-                                else:
-                                    if dt <= dt_start:
-                                        continue
-
-                                if include_end:
-                                    if dt > dt_end:
-                                        continue
-                                else:
-                                    if dt >= dt_end:
-                                        continue
-                                # ---------------------------------------
+                                minutes.append((datetime(yi, mi, di, hi_val, mi_val, sec_val, tzinfo=timezone.utc), ms))
+                            minutes.sort()
+                            times = [dt for dt, _ in minutes]
 
+                            # ---------- INCLUSIVITY LOGIC ----------
+                            first = bisect_left(times, dt_start) if include_start else bisect_right(times, dt_start)
+                            last = bisect_right(times, dt_end) if include_end else bisect_left(times, dt_end)
+                            # ---------------------------------------
+
+                            for dt, ms in minutes[first:last]:
                                 minute_path = f"{hour_path}/{ms}"
-                                files = self.list_dir(minute_path)
+                                files = self._list_names(minute_path, "file")
+                                # Filtrado por vol_types si se proporciona
+                                if match is not None:
+                                    files = filter(match, files)
                                 for fname in files:
-                                    # Filtrado por vol_types si se proporciona
-                                    if vol_types is not None:
-                                        if not vol_types.match(fname):
-                                            continue
                                     full_remote = Path(f"{minute_path}/{fname}")
                                     yield dt, fname, full_remote
         except FTPError as e:
             logger.error(f"Traversal failed for radar {radar_name}: {e}")
 
+    @staticmethod
+    def _in_range(names: List[str], lo: int, hi: int) -> List[Tuple[int, str]]:
+        """(value, name) of the numeric folder names with lo <= value <= hi, in numeric order."""
+        keyed = sorted((int(name), name) for name in names)
+        keys = [key for key, _ in keyed]
+        return keyed[bisect_left(keys, lo) : bisect_right(keys, hi)]
+
     @staticmethod
     def _path_to_datetime(year: str, month: str, day: str, hour: str, minute: str, second: str) -> datetime:
         return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
@@ -307,15 +428,35 @@ class RadarFTPClientAsync(RadarFTPClient):
     """
     Async-enabled wrapper around RadarFTPClient.
 
-    - Traversal & list_dir remain synchronous (from parent class).
+    - Traversal & list_dir remain synchronous (from parent class); traverse_radar_async
+      walks the same tree listing sibling folders concurrently.
     - Async context manager translates __enter__/__exit__ into async friendly version.
-    - Download methods are wrapped with asyncio.to_thread so they run concurrently.
+    - Downloads run on the client's own pool of max_workers threads, so they run
+      concurrently without competing for the event loop's default executor.
+    - Each download checks out a logged-in FTP session from a pool of up to
+      max_workers, so connect + login is paid once per session instead of per file.
+      A session idle for more than idle_check seconds is probed with NOOP first.
     """
 
-    def __init__(self, host: str, user: str, password: str, base_dir: str = "L2", max_workers: int = None):
-        super().__init__(host, user, password, base_dir)
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        base_dir: str = "L2",
+        max_workers: int = None,
+        block_size: int = DOWNLOAD_BLOCKSIZE,
+        rcvbuf: Optional[int] = None,
+        idle_check: float = 15.0,
+    ):
+        super().__init__(host, user, password, base_dir, block_size=block_size, rcvbuf=rcvbuf)
         self._max_workers = max_workers
         self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.idle_check = idle_check
+        # Idle download sessions with the monotonic time they were returned; used LIFO so
+        # the most recently used (least likely timed out) session is picked first
+        self._pool: "queue.LifoQueue[Tuple[ftplib.FTP, float]]" = queue.LifoQueue(maxsize=self.max_workers)
 
     @property
     def max_workers(self):
@@ -323,6 +464,25 @@ class RadarFTPClientAsync(RadarFTPClient):
             self._max_workers = min(32, (os.cpu_count() or 1) + 4)
         return self._max_workers
 
+    def close(self) -> None:
+        """Close the FTP session, the pooled download sessions and the download threads."""
+        super().close()
+        while True:
+            try:
+                ftp, _ = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_connection(ftp)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _download_executor(self) -> ThreadPoolExecutor:
+        # One thread per semaphore slot; created lazily and again after close()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="radar-ftp")
+        return self._executor
+
     # ------------------------------
     # Async context manager
     # ------------------------------
@@ -333,40 +493,279 @@ class RadarFTPClientAsync(RadarFTPClient):
     async def __aexit__(self, exc_type, exc, tb):
         return self.__exit__(exc_type, exc, tb)
 
+    # ------------------------------
+    # Async traversal
+    # ------------------------------
+    async def traverse_radar_async(
+        self,
+        radar_name: str,
+        dt_start: datetime | None = None,
+        dt_end: datetime | None = None,
+        include_start: bool = True,
+        include_end: bool = True,
+        vol_types: Optional[dict] | re.Pattern = None,
+        max_concurrent: int = 4,
+    ) -> AsyncGenerator[Tuple[datetime, str, Path], None]:
+        """
+        Async counterpart of traverse_radar that lists sibling folders concurrently.
+
+        The tree is walked one level at a time (years, months, days, hours, minutes)
+        and every folder of a level is listed at once over up to max_concurrent FTP
+        connections of its own, so a level of N folders costs about
+        N / max_concurrent round-trips instead of N. Keep max_concurrent within the
+        server's per-IP session limit. Files are yielded in the same order as
+        traverse_radar, each minute folder as soon as it and the ones before it
+        have been listed.
+        """
+        if vol_types is not None and isinstance(vol_types, dict):
+            vol_types = build_vol_types_regex(vol_types)
+        match = None if vol_types is None else vol_types.match
+        if dt_start is None:
+            dt_start = datetime.min.replace(tzinfo=timezone.utc)
+        if dt_end is None:
+            dt_end = datetime.max.replace(tzinfo=timezone.utc)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(max_concurrent, 1))
+        idle: "queue.SimpleQueue[ftplib.FTP]" = queue.SimpleQueue()
+        opened: List[ftplib.FTP] = []
+
+        def _list_on_idle_connection(remote_path: str, kind: str) -> List[str]:
+            try:
+                try:
+                    ftp = idle.get_nowait()
+                except queue.Empty:
+                    # Registered before login so the finally below also closes half-open sessions
+                    ftp = ftplib.FTP(timeout=self.timeout)
+                    opened.append(ftp)
+                    ftp.connect(self.host)
+                    ftp.login(self.user, self.password)
+                    self._tune_sockets(ftp)
+                names = [name for name, type_ in self._list_entries(remote_path, ftp) if type_ in (kind, "")]
+            except ftplib.all_errors as e:
+                raise FTPError(f"Error listing directory {remote_path}: {e}")
+            idle.put(ftp)
+            return names
+
+        async def _list(remote_path: str, kind: str) -> List[str]:
+            async with semaphore:
+                executor = self._download_executor()
+                return await loop.run_in_executor(executor, _list_on_idle_connection, remote_path, kind)
+
+        # A folder is kept when its (year, month, ...) prefix lies within the same prefix
+        # of dt_start and dt_end, which is the per-level pruning traverse_radar does
+        start_key = (dt_start.year, dt_start.month, dt_start.day, dt_start.hour)
+        end_key = (dt_end.year, dt_end.month, dt_end.day, dt_end.hour)
+        leaves: List[Tuple[str, datetime]] = []
+        pending: List[asyncio.Task] = []
+        try:
+            level: List[Tuple[str, Tuple[int, ...]]] = [(f"/{self.base_dir}/{radar_name}", ())]
+            for depth in range(1, 5):
+                listings = await asyncio.gather(*(_list(path, "dir") for path, _ in level))
+                level = [
+                    (f"{path}/{name}", key + (int(name),))
+                    for (path, key), names in zip(level, listings)
+                    for name in sorted(names)
+                    if start_key[:depth] <= key + (int(name),) <= end_key[:depth]
+                ]
+
+            listings = await asyncio.gather(*(_list(path, "dir") for path, _ in level))
+            for (hour_path, (yi, mi, di, hi)), minutes in zip(level, listings):
+                for ms in sorted(minutes):
+                    sec_val = int(ms[2:]) if len(ms) > 2 else 0
+                    dt = datetime(yi, mi, di, hi, int(ms[:2]), sec_val, tzinfo=timezone.utc)
+                    if (dt < dt_start if include_start else dt <= dt_start) or (
+                        dt > dt_end if include_end else dt >= dt_end
+                    ):
+                        continue
+                    leaves.append((f"{hour_path}/{ms}", dt))
+
+            pending = [asyncio.create_task(_list(path, "file")) for path, _ in leaves]
+            for (minute_path, dt), task in zip(leaves, pending):
+                files = await task
+                for fname in files if match is None else filter(match, files):
+                    yield dt, fname, Path(f"{minute_path}/{fname}")
+        except FTPError as e:
+            logger.error(f"Traversal failed for radar {radar_name}: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
+            for ftp in opened:
+                ftp.close()
+
     # ------------------------------
     # Async parallel downloads
     # ------------------------------
     async def download_file_async(self, remote_path: str, local_path: Path) -> Path:
         """
-        Each download runs inside its own short-lived FTP connection,
-        dispatched safely in a thread via asyncio.to_thread.
+        Each download runs on one of the client's download threads, over a pooled
+        FTP session that no other download uses at the same time.
+        """
+        await self.fetch_file_async(remote_path, local_path)
+        return local_path
+
+    async def fetch_file_async(self, remote_path: str, local_path: Path, resume: bool = False) -> int:
+        """
+        Like download_file_async, but return the size of the downloaded file.
+
+        The size comes from the final file offset, so callers that record file
+        sizes do not need to stat the file afterwards.
+
+        With resume=True, a partial local_path left by an interrupted attempt is
+        continued with REST from its current size instead of being downloaded
+        again from the start. Only use it for remote files that never change
+        (like BUFR volumes): the existing bytes are trusted as a prefix.
         """
         async with self._semaphore:
-            return await asyncio.to_thread(self._download_with_fresh_connection, remote_path, local_path)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._download_executor(), self._download_with_pooled_connection, remote_path, local_path, resume
+            )
+
+    def _acquire_download_connection(self) -> ftplib.FTP:
+        """Return a live idle pooled session, or open and log in a new one."""
+        while True:
+            try:
+                ftp, idle_since = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - idle_since <= self.idle_check:
+                return ftp
+            try:
+                ftp.voidcmd("NOOP")
+                return ftp
+            except ftplib.all_errors:
+                logger.debug("Dropping FTP session to %s that timed out while idle", self.host)
+                ftp.close()
 
-    def _download_with_fresh_connection(self, remote_path: str, local_path: Path) -> Path:
-        """This is blocking; run per-task in thread for safety."""
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+        ftp = ftplib.FTP(timeout=self.timeout)
+        try:
+            ftp.connect(self.host)
+            ftp.login(self.user, self.password)
+        except ftplib.all_errors:
+            ftp.close()
+            raise
+        _enable_keepalive(ftp.sock)
+        self._tune_sockets(ftp)
+        return ftp
+
+    def _release_download_connection(self, ftp: ftplib.FTP) -> None:
+        """Return a session to the pool, or close it if the pool is already full."""
+        try:
+            self._pool.put_nowait((ftp, time.monotonic()))
+        except queue.Full:
+            _close_connection(ftp)
 
+    def _download_with_pooled_connection(self, remote_path: str, local_path: Path, resume: bool = False) -> int:
+        """This is blocking; run per-task in thread for safety. Returns the size of the local file."""
         try:
-            with ftplib.FTP(self.host) as ftp:
-                ftp.login(self.user, self.password)
-                dir_path = remote_path.parent.as_posix()
-                fname = remote_path.name
-                ftp.cwd(dir_path)
-                with open(local_path, "wb") as f:
-                    ftp.retrbinary(f"RETR {fname}", f.write)
-
-            logger.info(f"Downloaded {remote_path} -> {local_path}")
-            return local_path
+            ftp = self._acquire_download_connection()
+        except ftplib.all_errors as e:
+            raise FTPError(f"Error downloading {remote_path}: {e}")
 
+        try:
+            # Split the POSIX string directly instead of re-parsing a Path for every file
+            remote = remote_path if isinstance(remote_path, str) else PurePath(remote_path).as_posix()
+            dir_path, fname = posixpath.split(remote)
+            ftp.cwd(dir_path or ".")
+
+            offset = _partial_size(local_path) if resume else 0
+            received = None
+            if offset:
+                try:
+                    received = _retrieve_into(ftp, fname, local_path, offset, self.block_size)
+                    logger.debug("Resumed %s at byte %s", remote_path, offset)
+                except (ftplib.error_reply, ftplib.error_perm) as e:
+                    # REST unsupported or past the end of the remote file: start over
+                    logger.debug("Could not resume %s at byte %s (%s); downloading it again", remote_path, offset, e)
+            if received is None:
+                received = _retrieve_into(ftp, fname, local_path, blocksize=self.block_size)
+        except ftplib.error_perm as e:
+            # A clean 5xx reply (e.g. missing file) leaves the session usable
+            self._release_download_connection(ftp)
+            raise FTPError(f"Error downloading {remote_path}: {e}")
         except ftplib.all_errors as e:
+            # The control channel may be out of sync mid-transfer: do not reuse it
+            ftp.close()
             raise FTPError(f"Error downloading {remote_path}: {e}")
+        except BaseException:
+            ftp.close()
+            raise
+
+        # The 226 reply just read by _retr_to_file shows the session is alive; no NOOP needed
+        self._release_download_connection(ftp)
+        logger.info("Downloaded %s -> %s (%s bytes)", remote_path, local_path, received)
+        return received
 
     async def download_files_parallel(self, files: List[Tuple[str, Path]]) -> List[Path]:
-        """Download multiple files asynchronously in parallel."""
-        tasks = [asyncio.create_task(self.download_file_async(remote, local)) for remote, local in files]
-        return await asyncio.gather(*tasks, return_exceptions=False)
+        """
+        Download multiple files asynchronously in parallel.
+
+        A fixed pool of at most ``max_workers`` worker tasks drains a queue of
+        files, instead of creating one task per file that then waits on the
+        semaphore. Results keep the order of ``files``; the first failure is
+        raised and the remaining workers are cancelled.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(files):
+            queue.put_nowait(item)
+        results: List[Optional[Path]] = [None] * len(files)
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    idx, (remote, local) = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[idx] = await self.download_file_async(remote, local)
+
+        workers = [asyncio.create_task(_worker()) for _ in range(min(self.max_workers, len(files)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        return results  # type: ignore[return-value]
+
+    async def download_and_process(
+        self,
+        files: List[Tuple[str, Path]],
+        process_fn: Callable[[Path], Any],
+        max_concurrent_process: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[Any]:
+        """
+        Download files and process each one as soon as its own download finishes.
+
+        Downloads are bounded by the client semaphore (``max_workers``) and
+        processing by ``max_concurrent_process``, so the network and the CPU
+        stay busy at the same time instead of draining all downloads first.
+        ``process_fn`` receives the local path and runs in ``executor``
+        (a ProcessPoolExecutor is created when none is given, so it must be
+        picklable). Results are returned in the same order as ``files``.
+        """
+        own_executor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=max_concurrent_process)
+        process_semaphore = asyncio.Semaphore(max_concurrent_process or self.max_workers)
+        loop = asyncio.get_running_loop()
+
+        async def _pipeline(remote: str, local: Path) -> Any:
+            local_path = await self.download_file_async(remote, local)
+            async with process_semaphore:
+                return await loop.run_in_executor(executor, process_fn, local_path)
+
+        tasks = [asyncio.create_task(_pipeline(remote, local)) for remote, local in files]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
 
 
 # if __name__ == "__main__":
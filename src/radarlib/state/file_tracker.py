@@ -5,7 +5,7 @@ import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,7 @@ class FileStateTracker:
 
             with open(self.state_file, "w") as f:
                 json.dump(self._state, f, indent=2)
-            logger.debug(f"Saved state with {len(self._state)} entries")
+            logger.debug("Saved state with %d entries", len(self._state))
         except IOError as e:
             logger.error(f"Failed to save state file: {e}")
 
@@ -74,6 +74,18 @@ class FileStateTracker:
         """
         return filename in self._state
 
+    def filter_downloaded(self, filenames: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of filenames that have already been downloaded.
+
+        Args:
+            filenames: Names of the files to check
+
+        Returns:
+            Set of the given filenames that have been downloaded
+        """
+        return {filename for filename in filenames if filename in self._state}
+
     def mark_downloaded(self, filename: str, remote_path: str, metadata: Optional[Dict] = None) -> None:
         """
         Mark a file as downloaded.
@@ -89,7 +101,7 @@ class FileStateTracker:
             "metadata": metadata or {},
         }
         self._save_state()
-        logger.debug(f"Marked '{filename}' as downloaded")
+        logger.debug("Marked '%s' as downloaded", filename)
 
     def get_downloaded_files(self) -> Set[str]:
         """
@@ -128,7 +140,7 @@ class FileStateTracker:
         if filename in self._state:
             del self._state[filename]
             self._save_state()
-            logger.debug(f"Removed '{filename}' from state")
+            logger.debug("Removed '%s' from state", filename)
 
     def get_files_by_date_range(self, start_date: datetime, end_date: datetime) -> List[str]:
         """
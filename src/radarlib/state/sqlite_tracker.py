@@ -6,10 +6,16 @@ import logging
 import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+# Names per IN (...) query; SQLite builds before 3.32 allow at most 999 bound parameters
+_SQL_BATCH_SIZE = 500
+
+# Read size for calculate_checksum
+_CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
 
 class SQLiteStateTracker:
     """
@@ -135,6 +141,10 @@ class SQLiteStateTracker:
         if self._conn is None:
             self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
+            # WAL lets readers (other daemons sharing the DB) proceed during writes, and
+            # synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
         return self._conn
 
     def close(self) -> None:
@@ -161,6 +171,36 @@ class SQLiteStateTracker:
         )
         return cursor.fetchone() is not None
 
+    def filter_downloaded(self, filenames: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of filenames that have already been downloaded.
+
+        Looks the names up with indexed IN queries, _SQL_BATCH_SIZE names at a
+        time to stay under SQLite's bound-parameter limit, instead of one query
+        per file.
+
+        Args:
+            filenames: Names of the files to check
+
+        Returns:
+            Set of the given filenames that have been downloaded
+        """
+        names = list(dict.fromkeys(filenames))
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        downloaded: Set[str] = set()
+        for start in range(0, len(names), _SQL_BATCH_SIZE):
+            batch = names[start : start + _SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            # The unary + keeps the planner off idx_status: with a long IN list it would
+            # otherwise scan every completed row instead of probing the filename index
+            cursor.execute(
+                f"SELECT filename FROM downloads WHERE +status = 'completed' AND filename IN ({placeholders})",
+                batch,
+            )
+            downloaded.update(row[0] for row in cursor.fetchall())
+        return downloaded
+
     def mark_downloaded(
         self,
         filename: str,
@@ -215,7 +255,7 @@ class SQLiteStateTracker:
         )
 
         conn.commit()
-        logger.debug(f"Marked '{filename}' as downloaded")
+        logger.debug("Marked '%s' as downloaded", filename)
 
     def mark_failed(
         self,
@@ -268,7 +308,64 @@ class SQLiteStateTracker:
         )
 
         conn.commit()
-        logger.debug(f"Marked '{filename}' as failed")
+        logger.debug("Marked '%s' as failed", filename)
+
+    def mark_downloaded_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Mark several files as successfully downloaded in a single transaction.
+
+        Args:
+            records: One dict per file, with the keyword arguments of mark_downloaded
+        """
+        self._write_downloads(records, "completed")
+
+    def mark_failed_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Mark several files as failed to download in a single transaction.
+
+        Args:
+            records: One dict per file, with the keyword arguments of mark_failed
+        """
+        self._write_downloads(records, "failed")
+
+    def _write_downloads(self, records: Iterable[Dict[str, Any]], status: str) -> None:
+        """Upsert download rows with the given status using one executemany and one commit."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                record["filename"],
+                record["remote_path"],
+                record.get("local_path"),
+                now,
+                record.get("file_size"),
+                record.get("checksum"),
+                record.get("radar_name"),
+                record.get("strategy"),
+                record.get("vol_nr"),
+                record.get("field_type"),
+                record.get("observation_datetime"),
+                status,
+                now,
+                now,
+            )
+            for record in records
+        ]
+        if not rows:
+            return
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO downloads
+                (filename, remote_path, local_path, downloaded_at, file_size, checksum,
+                 radar_name, strategy, vol_nr, field_type, observation_datetime, status,
+                 created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+        logger.debug(f"Marked {len(rows)} files as {status}")
 
     def get_downloaded_files(self) -> Set[str]:
         """
@@ -368,7 +465,7 @@ class SQLiteStateTracker:
         cursor.execute("DELETE FROM downloads WHERE filename = ?", (filename,))
         # cursor.execute("DELETE FROM partial_downloads WHERE filename = ?", (filename,))
         conn.commit()
-        logger.debug(f"Removed '{filename}' from state")
+        logger.debug("Removed '%s' from state", filename)
 
     def clear(self, include_partials: bool = True) -> None:
         """
@@ -395,9 +492,16 @@ class SQLiteStateTracker:
             Hexadecimal checksum string
         """
         sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
+        # Read into one reusable buffer: large blocks keep hashlib (which drops the GIL
+        # on big updates) busy without allocating a bytes object per chunk
+        buffer = bytearray(_CHECKSUM_BLOCK_SIZE)
+        view = memoryview(buffer)
+        with open(file_path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                sha256.update(view[:n])
         return sha256.hexdigest()
 
     def get_latest_downloaded_file(self, radar_name: Optional[str] = None) -> Optional[Dict]:
@@ -437,6 +541,41 @@ class SQLiteStateTracker:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def get_latest_observation_datetime(
+        self,
+        radar_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Optional[str]:
+        """
+        Get the latest observation datetime among a radar's downloaded files.
+
+        Walks idx_radar_datetime backwards and stops at the first completed
+        download, so the cost does not grow with the number of tracked files.
+
+        Args:
+            radar_name: Radar name to filter by
+            start_date: Optional lower bound (inclusive) for the observation datetime
+            end_date: Optional upper bound (inclusive) for the observation datetime
+
+        Returns:
+            Observation datetime as stored (ISO format), or None if no file matches
+        """
+        query = "SELECT observation_datetime FROM downloads WHERE radar_name = ? AND observation_datetime IS NOT NULL"
+        params: List[Any] = [radar_name]
+        if start_date is not None:
+            query += " AND observation_datetime >= ?"
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            query += " AND observation_datetime <= ?"
+            params.append(end_date.isoformat())
+        # The unary + keeps the planner on idx_radar_datetime rather than idx_status
+        query += " AND +status = 'completed' ORDER BY observation_datetime DESC LIMIT 1"
+
+        conn = self._get_connection()
+        row = conn.execute(query, params).fetchone()
+        return row[0] if row else None
+
     # Volume processing methods
 
     def get_volume_id(self, radar_name: str, strategy: str, vol_nr: str, observation_datetime: str) -> str:
@@ -130,22 +130,25 @@ def build_vol_types_regex(vol_types: Dict[str, Dict[str, list]]) -> Optional[re.
     if not vol_types:
         return None
 
-    # Build list of patterns: vol_code_vol_nr_field combinations
-    patterns = []
-
+    # Nest the alternation as vol_code -> vol_nr -> field instead of listing every
+    # _VOLCODE_VOLNR_FIELD_ combination: at each position the engine then tries
+    # one branch per vol_code rather than one per combination.
+    # Using escaped characters to handle special regex chars
+    code_branches = []
     for vol_code, vol_numbers in vol_types.items():
+        nr_branches = []
         for vol_nr, fields in vol_numbers.items():
-            for field in fields:
-                # Create pattern: _VOLCODE_VOLNR_FIELD_
-                # Using escaped characters to handle special regex chars
-                pattern = f"_{re.escape(vol_code)}_{re.escape(vol_nr)}_{re.escape(field)}_"
-                patterns.append(pattern)
+            if fields:
+                field_alts = "|".join(re.escape(field) for field in fields)
+                nr_branches.append(f"{re.escape(vol_nr)}_(?:{field_alts})")
+        if nr_branches:
+            code_branches.append(f"{re.escape(vol_code)}_(?:{'|'.join(nr_branches)})")
 
-    if not patterns:
+    if not code_branches:
         return None
 
-    # Combine all patterns with OR (|)
-    combined_pattern = "|".join(patterns)
+    # Pattern: _VOLCODE_VOLNR_FIELD_
+    combined_pattern = f"_(?:{'|'.join(code_branches)})_"
 
     # Add anchors: match anywhere in filename and end with .BUFR
     full_pattern = f"^.*(?:{combined_pattern}).*\\.BUFR$"
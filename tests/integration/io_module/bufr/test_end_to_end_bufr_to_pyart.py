@@ -137,3 +137,41 @@ def test_end_to_end_bufr_multiple_files_to_pyart_radar(tmp_path: Path):
     print(f"✓ Successfully combined {len(decoded_fields)} BUFR files into single Radar object")
     print(f"  Fields: {list(radar.fields.keys())}")
     print(f"  Radar geometry: {radar.nrays} rays × {radar.ngates} gates × {radar.nsweeps} sweeps")
+
+
+@pytest.mark.integration
+@pytest.mark.filterwarnings("ignore:numpy.ndarray size changed.*:RuntimeWarning")
+def test_bufr_paths_to_pyart_process_pool_matches_serial():
+    data_dir = Path("tests/data/bufr/RMA5")
+    bufr_files = sorted(str(p) for p in data_dir.glob("*.BUFR")) if data_dir.exists() else []
+    if len(bufr_files) < 2:
+        pytest.skip("Need at least two BUFR files in RMA5 directory")
+
+    from radarlib.io.bufr.bufr_to_pyart import bufr_paths_to_pyart
+
+    serial = bufr_paths_to_pyart(bufr_files)
+    pooled = bufr_paths_to_pyart(bufr_files, max_workers=2)
+
+    assert list(pooled.fields) == list(serial.fields)
+    for name in serial.fields:
+        assert (pooled.fields[name]["data"] == serial.fields[name]["data"]).all()
+
+
+@pytest.mark.integration
+@pytest.mark.filterwarnings("ignore:numpy.ndarray size changed.*:RuntimeWarning")
+def test_iter_bufr_volumes_to_pyart_is_lazy(tmp_path: Path):
+    data_dir = Path("tests/data/bufr")
+    volumes = [[str(p)] for p in sorted(data_dir.glob("RMA5/*.BUFR"))]
+    if not volumes:
+        pytest.skip("No BUFR RMA5 test data available")
+
+    from radarlib.io.bufr.bufr_to_pyart import iter_bufr_volumes_to_pyart
+
+    results = iter_bufr_volumes_to_pyart(volumes, save_path=tmp_path)
+    # nothing is decoded until the generator is consumed
+    assert not any(tmp_path.iterdir())
+
+    for (paths, radar), expected in zip(results, volumes):
+        assert paths == expected
+        assert len(radar.fields) == 1
+    assert len(list(tmp_path.glob("*.nc"))) >= 1
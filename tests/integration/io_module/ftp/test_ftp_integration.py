@@ -1,14 +1,44 @@
 """Integration tests for FTP client with mocked FTP server."""
 
 import ftplib
+import os
+import posixpath
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from radarlib.io.ftp import FTPClient
+from radarlib.io.ftp import FTP_IsADirectoryError, FTPActionError, FTPClient
 from radarlib.state import FileStateTracker
 
 
+class _FakeDataConnection:
+    """Data socket that hands out its payload through recv_into."""
+
+    def __init__(self, payload, buffer_sizes):
+        self.payload = payload
+        self.buffer_sizes = buffer_sizes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def recv_into(self, buffer):
+        self.buffer_sizes.add(len(buffer))
+        n = min(len(buffer), len(self.payload), 3)
+        buffer[:n] = self.payload[:n]
+        self.payload = self.payload[n:]
+        return n
+
+
+def _serve_retr(mock_ftp, retr, buffer_sizes=None):
+    """Answer RETR on mock_ftp through transfercmd: retr(command, rest) is the data sent."""
+    buffer_sizes = set() if buffer_sizes is None else buffer_sizes
+    mock_ftp.transfercmd.side_effect = lambda cmd, rest=None: _FakeDataConnection(retr(cmd, rest), buffer_sizes)
+    return buffer_sizes
+
+
 @pytest.mark.integration
 class TestFTPClientIntegration:
     """Integration tests for FTPClient with mocked server."""
@@ -24,7 +54,7 @@ class TestFTPClientIntegration:
             "readme.txt",  # Non-BUFR file
         ]
 
-        def mock_retrbinary(cmd, callback):
+        def mock_retrbinary(cmd, callback, blocksize=8192):
             # Simulate file download
             callback(b"mock BUFR data")
 
@@ -144,3 +174,1211 @@ class TestFTPClientIntegration:
         assert tracker3.count() == 2
         assert tracker3.is_downloaded("file1.BUFR")
         assert tracker3.is_downloaded("file2.BUFR")
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_connection_is_pooled_across_operations(self, mock_ftp_class):
+        """Consecutive operations reuse one authenticated connection until close()."""
+        mock_ftp = MagicMock()
+        mock_ftp.nlst.return_value = ["file1.BUFR"]
+        mock_ftp.cwd.side_effect = lambda path: None
+        mock_ftp_class.return_value = mock_ftp
+
+        with FTPClient(host="test.ftp.com", user="test", password="test") as client:
+            client.list_files("/L2/RMA1")
+            client.list_files("/L2/RMA2")
+            assert client.file_exists("/L2/RMA1/file1.BUFR")
+
+            assert mock_ftp_class.call_count == 1
+            assert mock_ftp.login.call_count == 1
+            mock_ftp.quit.assert_not_called()
+
+        mock_ftp.quit.assert_called_once()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_failed_operation_discards_connection(self, mock_ftp_class):
+        """A connection that errors mid-operation is not handed out again."""
+        mock_ftp = MagicMock()
+        mock_ftp.cwd.side_effect = [ftplib.error_temp("421 Timeout"), None]
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        with pytest.raises(FTPActionError):
+            client.list_files("/L2/RMA1")
+        client.list_files("/L2/RMA1")
+
+        assert mock_ftp_class.call_count == 2
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_stale_idle_connection_is_replaced_on_checkout(self, mock_ftp_class):
+        """A pooled connection the server dropped while idle is swapped for a new one, not used."""
+        stale, fresh = MagicMock(), MagicMock()
+        stale.nlst.return_value = fresh.nlst.return_value = ["a.BUFR"]
+        mock_ftp_class.side_effect = [stale, fresh]
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test", idle_check=0)
+        client.list_files("/L2/RMA1")
+        stale.voidcmd.side_effect = EOFError()
+
+        assert client.list_files("/L2/RMA1") == ["a.BUFR"]
+        assert stale.nlst.call_count == 1
+        assert fresh.nlst.call_count == 1
+        # A connection that failed NOOP is closed without waiting on QUIT
+        stale.close.assert_called_once()
+        stale.quit.assert_not_called()
+
+        # Recently used connections are handed out and returned without a probe
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        mock_ftp_class.side_effect = None
+        mock_ftp_class.return_value = fresh
+        fresh.voidcmd.reset_mock()
+        client.list_files("/L2/RMA1")
+        client.list_files("/L2/RMA1")
+        assert fresh.voidcmd.call_count == 0
+        assert mock_ftp_class.call_count == 3
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_file_probes_with_single_size(self, mock_ftp_class, tmp_path):
+        """The directory check costs one SIZE instead of a CWD round-trip pair."""
+        mock_ftp = MagicMock()
+        mock_ftp.size.return_value = 14
+        mock_ftp.retrbinary.side_effect = lambda cmd, callback, blocksize=8192: callback(b"mock BUFR data")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.download_file("/L2/RMA1/file1.BUFR", tmp_path / "file1.BUFR")
+
+        mock_ftp.size.assert_called_once_with("file1.BUFR")
+        mock_ftp.cwd.assert_called_once_with("/L2/RMA1")
+        assert (tmp_path / "file1.BUFR").read_bytes() == b"mock BUFR data"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_file_exists_reuses_cached_listing(self, mock_ftp_class):
+        """Existence checks in a directory listed within the TTL issue no further commands."""
+        mock_ftp = MagicMock()
+        mock_ftp.nlst.return_value = ["a.BUFR", "b.BUFR"]
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.list_files("/L2/RMA1")
+        assert client.file_exists("/L2/RMA1/a.BUFR")
+        assert client.file_exists("/L2/RMA1/b.BUFR")
+        assert not client.file_exists("/L2/RMA1/c.BUFR")
+        assert mock_ftp.nlst.call_count == 1
+        mock_ftp.size.assert_not_called()
+
+        # Once the listing is invalidated, the check falls back to SIZE
+        client.invalidate_cache("/L2/RMA1")
+        assert client.file_exists("/L2/RMA1/c.BUFR")
+        mock_ftp.size.assert_called_once_with("/L2/RMA1/c.BUFR")
+        assert mock_ftp.nlst.call_count == 1
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_file_exists_probes_with_size(self, mock_ftp_class):
+        """Without a cached listing a single SIZE answers the check, never an NLST."""
+        mock_ftp = MagicMock()
+        mock_ftp.size.side_effect = [10, ftplib.error_perm("550 No such file")]
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        assert client.file_exists("/L2/RMA1/a.BUFR")
+        assert not client.file_exists("/L2/RMA1/missing.BUFR")
+
+        mock_ftp.voidcmd.assert_any_call("TYPE I")
+        mock_ftp.nlst.assert_not_called()
+        # A 550 reply does not cost the pooled connection
+        assert mock_ftp_class.call_count == 1
+
+        mock_ftp.size.side_effect = ftplib.error_temp("421 Timeout")
+        assert not client.file_exists("/L2/RMA1/a.BUFR")
+
+    @staticmethod
+    def _streaming_listing(mock_ftp, text):
+        """Make transfercmd() serve text over a fake data connection."""
+        import io
+
+        conn = MagicMock()
+        conn.__enter__.return_value = conn
+        conn.makefile.return_value = io.StringIO(text)
+        mock_ftp.transfercmd.return_value = conn
+        mock_ftp.encoding = "utf-8"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_iter_files_streams_nlst(self, mock_ftp_class):
+        """iter_files yields names as they arrive and returns the connection when drained."""
+        mock_ftp = MagicMock()
+        self._streaming_listing(mock_ftp, "a.BUFR\r\nb.BUFR\r\n")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        assert list(client.iter_files("/L2/RMA1")) == ["a.BUFR", "b.BUFR"]
+
+        mock_ftp.transfercmd.assert_called_once_with("NLST")
+        mock_ftp.voidresp.assert_called_once()
+        mock_ftp.nlst.assert_not_called()
+        mock_ftp.quit.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_iter_files_parses_mlsd_and_discards_abandoned_listing(self, mock_ftp_class):
+        """MLSD facts are parsed per line; stopping early drops the mid-transfer connection."""
+        mock_ftp = MagicMock()
+        self._streaming_listing(mock_ftp, "type=file;size=10; a.BUFR\r\ntype=dir; sub\r\n")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        entries = client.iter_files("/L2/RMA1", method="mlsd")
+        assert next(entries) == ("a.BUFR", {"type": "file", "size": "10"})
+        entries.close()
+
+        mock_ftp.voidresp.assert_not_called()
+        # Dropped without QUIT, which would wait on a control channel still mid-transfer
+        mock_ftp.close.assert_called_once()
+        mock_ftp.quit.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_iter_files_in_remote_dir_streams_mlsd(self, mock_ftp_class):
+        """The module-level streaming listing yields MLSD entries and closes its connection when done."""
+        from radarlib.io.ftp import iter_files_in_remote_dir
+
+        mock_ftp = MagicMock()
+        self._streaming_listing(mock_ftp, "type=file;size=10; a.BUFR\r\ntype=dir; sub\r\n")
+        mock_ftp_class.return_value = mock_ftp
+
+        entries = iter_files_in_remote_dir("test.ftp.com", "test", "test", "/L2/RMA1", method="mlsd")
+        mock_ftp_class.assert_not_called()  # nothing happens until the first entry is requested
+        assert list(entries) == [("a.BUFR", {"type": "file", "size": "10"}), ("sub", {"type": "dir"})]
+
+        mock_ftp.cwd.assert_called_once_with("/L2/RMA1")
+        mock_ftp.transfercmd.assert_called_once_with("MLSD")
+        mock_ftp.mlsd.assert_not_called()
+        mock_ftp.quit.assert_called_once()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_exists_many_uses_one_listing(self, mock_ftp_class):
+        """A batch of existence checks costs a single NLST."""
+        mock_ftp = MagicMock()
+        mock_ftp.nlst.return_value = ["a.BUFR", "b.BUFR"]
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        result = client.exists_many("/L2/RMA1", ["a.BUFR", "c.BUFR", "b.BUFR"])
+
+        assert result == {"a.BUFR": True, "c.BUFR": False, "b.BUFR": True}
+        assert mock_ftp.nlst.call_count == 1
+        assert client.file_exists("/L2/RMA1/b.BUFR")
+        assert mock_ftp.nlst.call_count == 1
+
+        mock_ftp.cwd.side_effect = ftplib.error_perm("550 No such directory")
+        assert client.exists_many("/L2/RMA9", ["a.BUFR"]) == {"a.BUFR": False}
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_trims_preallocated_file_to_received_bytes(self, mock_ftp_class, tmp_path):
+        """A file preallocated from SIZE ends up exactly as long as the data received."""
+        mock_ftp = MagicMock()
+        mock_ftp.size.return_value = 100
+
+        def retrbinary(cmd, callback, blocksize=8192):
+            callback(b"abc")
+            callback(b"de")
+
+        mock_ftp.retrbinary.side_effect = retrbinary
+        mock_ftp_class.return_value = mock_ftp
+        local = tmp_path / "file1.BUFR"
+        local.write_bytes(b"previous, longer content")
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.download_file("/L2/RMA1/file1.BUFR", local)
+
+        assert local.read_bytes() == b"abcde"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_failed_download_does_not_leave_a_full_size_preallocated_file(self, mock_ftp_class, tmp_path):
+        """A RETR that fails partway trims the preallocated tail instead of leaving zeros."""
+        mock_ftp = MagicMock()
+        mock_ftp.size.return_value = 100
+
+        def retrbinary(cmd, callback, blocksize=8192):
+            callback(b"abc")
+            raise OSError("connection reset")
+
+        mock_ftp.retrbinary.side_effect = retrbinary
+        mock_ftp_class.return_value = mock_ftp
+        local = tmp_path / "file1.BUFR"
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        with pytest.raises(FTPActionError):
+            client.download_file("/L2/RMA1/file1.BUFR", local)
+
+        assert local.stat().st_size != 100
+        assert local.read_bytes() == b"abc"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_file_feeds_hasher_while_writing(self, mock_ftp_class, tmp_path):
+        """A hasher passed to download_file sees exactly the bytes written to disk."""
+        import hashlib
+
+        def retrbinary(cmd, callback, blocksize=8192):
+            callback(b"mock ")
+            callback(b"BUFR data")
+
+        mock_ftp = MagicMock()
+        mock_ftp.size.return_value = 14
+        mock_ftp.retrbinary.side_effect = retrbinary
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        hasher = hashlib.sha256()
+        local = tmp_path / "file1.BUFR"
+        client.download_file("/L2/RMA1/file1.BUFR", local, hasher=hasher)
+
+        assert hasher.hexdigest() == hashlib.sha256(local.read_bytes()).hexdigest()
+        assert hasher.hexdigest() == hashlib.sha256(b"mock BUFR data").hexdigest()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_socket_opts_apply_to_control_and_data_sockets(self, mock_ftp_class, tmp_path):
+        """Socket options are set on the control socket and on each data connection."""
+        import socket
+
+        data_conn = MagicMock()
+        mock_ftp = MagicMock()
+        mock_ftp.ntransfercmd.return_value = (data_conn, 10)
+        mock_ftp_class.return_value = mock_ftp
+
+        opts = {(socket.IPPROTO_TCP, socket.TCP_NODELAY): 1, (socket.SOL_SOCKET, socket.SO_RCVBUF): 1 << 20}
+        client = FTPClient(host="test.ftp.com", user="test", password="test", socket_opts=opts)
+        with client.connect() as ftp:
+            assert ftp.ntransfercmd("RETR a.BUFR") == (data_conn, 10)
+
+        mock_ftp.sock.setsockopt.assert_any_call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data_conn.setsockopt.assert_any_call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data_conn.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_new_connections_enable_keepalive_on_control_socket(self, mock_ftp_class):
+        """Pooled connections keep the control channel alive across idle periods."""
+        import socket
+
+        mock_ftp = MagicMock()
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        with client.connect():
+            pass
+
+        mock_ftp.sock.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_uses_configured_block_size(self, mock_ftp_class, tmp_path):
+        """RETR reads block_size bytes per callback instead of ftplib's 8 KiB default."""
+        mock_ftp = MagicMock()
+        mock_ftp.retrbinary.side_effect = lambda cmd, callback, blocksize=8192: callback(b"x")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.download_files("/L2/RMA1", ["a.BUFR"], tmp_path)
+        assert mock_ftp.retrbinary.call_args.kwargs["blocksize"] == 262144
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test", block_size=65536)
+        client.download_file("/L2/RMA1/a.BUFR", tmp_path / "a.BUFR")
+        assert mock_ftp.retrbinary.call_args.kwargs["blocksize"] == 65536
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_file_rejects_directory(self, mock_ftp_class, tmp_path):
+        """A SIZE refusal confirmed by CWD is reported as a directory."""
+        mock_ftp = MagicMock()
+        mock_ftp.size.side_effect = ftplib.error_perm("550 Not a regular file")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        with pytest.raises(FTP_IsADirectoryError):
+            client.download_file("/L2/RMA1/2024", tmp_path / "2024")
+
+        mock_ftp.retrbinary.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_files_skips_directory_probe(self, mock_ftp_class, tmp_path):
+        """Batch downloads of listed names issue only CWD once and one RETR per file."""
+        mock_ftp = MagicMock()
+        mock_ftp.retrbinary.side_effect = lambda cmd, callback, blocksize=8192: callback(cmd.encode())
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.download_files("/L2/RMA1", ["a.BUFR", "b.BUFR"], tmp_path)
+
+        mock_ftp.size.assert_not_called()
+        mock_ftp.cwd.assert_called_once_with("/L2/RMA1")
+        assert (tmp_path / "b.BUFR").read_bytes() == b"RETR b.BUFR"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_files_spreads_batch_over_connections(self, mock_ftp_class, tmp_path):
+        """max_concurrent > 1 downloads every file over a bounded set of connections."""
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+        connections = []
+
+        def make_connection(host):
+            ftp = MagicMock()
+            ftp.retrbinary.side_effect = lambda cmd, callback, blocksize=8192: callback(cmd.encode())
+            # Every worker has to be connected at once for the barrier to open
+            ftp.cwd.side_effect = lambda path: barrier.wait()
+            connections.append(ftp)
+            return ftp
+
+        mock_ftp_class.side_effect = make_connection
+
+        names = [f"RMA1_0315_01_DBZH_20240101T1200{i:02d}Z.BUFR" for i in range(10)]
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        client.download_files("/L2/RMA1", names, tmp_path, max_concurrent=3)
+
+        assert len(connections) == 3
+        assert sum(ftp.retrbinary.call_count for ftp in connections) == len(names)
+        for name in names:
+            assert (tmp_path / name).read_bytes() == f"RETR {name}".encode()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_files_works_under_a_running_event_loop(self, mock_ftp_class, tmp_path):
+        """The sync batch download can be called from code that already runs an event loop."""
+        import asyncio
+
+        mock_ftp_class.side_effect = lambda host: MagicMock(
+            retrbinary=MagicMock(side_effect=lambda cmd, callback, blocksize=8192: callback(cmd.encode()))
+        )
+        names = ["a.BUFR", "b.BUFR", "c.BUFR"]
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+
+        async def caller():
+            client.download_files("/L2/RMA1", names, tmp_path, max_concurrent=2)
+
+        asyncio.run(caller())
+        for name in names:
+            assert (tmp_path / name).read_bytes() == f"RETR {name}".encode()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_list_recursive_walks_tree_on_one_connection(self, mock_ftp_class):
+        """A recursive MLSD walk lists every file below a directory over a single connection."""
+        tree = {
+            "/L2/RMA1/2024/01/01/12": [
+                ("0000", {"type": "dir"}),
+                ("0500", {"type": "dir"}),
+                (".", {"type": "cdir"}),
+            ],
+            "/L2/RMA1/2024/01/01/12/0000": [("a.BUFR", {"type": "file"}), ("sub", {"type": "dir"})],
+            "/L2/RMA1/2024/01/01/12/0500": [("b.BUFR", {"type": "file"})],
+            "/L2/RMA1/2024/01/01/12/0000/sub": [("c.BUFR", {"type": "file"})],
+        }
+        mock_ftp = MagicMock()
+        # Takes no facts: OPTS MLST would stick to the pooled session
+        mock_ftp.mlsd.side_effect = lambda path: iter(tree[path])
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        hour = "/L2/RMA1/2024/01/01/12"
+        assert client.list_recursive(hour) == ["0000/a.BUFR", "0500/b.BUFR", "0000/sub/c.BUFR"]
+        assert client.list_recursive(hour, max_depth=1) == ["0000/a.BUFR", "0500/b.BUFR"]
+        assert mock_ftp_class.call_count == 1
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_list_recursive_lists_a_level_in_parallel(self, mock_ftp_class):
+        """With max_concurrent > 1 the directories of one level are listed over that many connections at once."""
+        import threading
+
+        minutes = ["0000", "0100", "0200", "0300"]
+        barrier = threading.Barrier(len(minutes), timeout=5)
+
+        def mlsd(path):
+            if path == "/L2/H":
+                return iter([(m, {"type": "dir"}) for m in minutes])
+            # Every minute listing must be in flight at the same time for the barrier to release
+            barrier.wait()
+            return iter([(f"{posixpath.basename(path)}.BUFR", {"type": "file"})])
+
+        mock_ftp_class.side_effect = lambda *args, **kwargs: MagicMock(mlsd=MagicMock(side_effect=mlsd))
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test", pool_size=4)
+        assert client.list_recursive("/L2/H", max_concurrent=4) == [f"{m}/{m}.BUFR" for m in minutes]
+        assert mock_ftp_class.call_count == 4
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_list_recursive_falls_back_to_nlst(self, mock_ftp_class):
+        """Servers without MLSD are walked with NLST, probing names with CWD."""
+        listings = {"/L2/H": ["/L2/H/0000", "/L2/H/x.BUFR"], "/L2/H/0000": ["a.BUFR"]}
+
+        def cwd(path):
+            if path not in listings:
+                raise ftplib.error_perm("550 Not a directory")
+
+        mock_ftp = MagicMock()
+        mock_ftp.mlsd.side_effect = ftplib.error_perm("500 Unknown command")
+        mock_ftp.nlst.side_effect = lambda path: listings[path]
+        mock_ftp.cwd.side_effect = cwd
+        mock_ftp_class.return_value = mock_ftp
+
+        client = FTPClient(host="test.ftp.com", user="test", password="test")
+        assert client.list_recursive("/L2/H") == ["x.BUFR", "0000/a.BUFR"]
+
+        mock_ftp.mlsd.side_effect = ftplib.error_perm("550 No such directory")
+        with pytest.raises(FTPActionError):
+            client.list_recursive("/L2/missing")
+
+
+@pytest.mark.integration
+class TestRadarFTPClientAsyncPipeline:
+    """Download/process pipeline of RadarFTPClientAsync with a mocked server."""
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_download_and_process_preserves_order(self, mock_ftp_class, tmp_path):
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        from pathlib import Path
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, lambda cmd, rest: cmd.encode())
+        mock_ftp_class.return_value = mock_ftp
+
+        names = [f"RMA1_0315_01_DBZH_20240101T1200{i:02d}Z.BUFR" for i in range(5)]
+        files = [(Path(f"/L2/RMA1/2024/01/01/12/00/{n}"), tmp_path / n) for n in names]
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = asyncio.run(
+                client.download_and_process(
+                    files, lambda p: p.read_bytes(), max_concurrent_process=2, executor=executor
+                )
+            )
+
+        assert results == [f"RETR {n}".encode() for n in names]
+
+
+@pytest.mark.integration
+class TestRadarFTPClientConnectionReuse:
+    """Connection lifecycle of RadarFTPClient with a mocked server."""
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_ensure_connected_reuses_live_session(self, mock_ftp_class):
+        import socket
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test")
+        client.ensure_connected()
+        client.ensure_connected()
+
+        # one login, the second call only probes with NOOP
+        assert mock_ftp.login.call_count == 1
+        mock_ftp.voidcmd.assert_called_with("NOOP")
+        mock_ftp.sock.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        client.close()
+        assert client.ftp is None
+        mock_ftp.quit.assert_called_once()
+
+
+    @staticmethod
+    def _tree_server(mock_ftp, tree):
+        """Serve MLSD listings of absolute paths from {path: [(name, type), ...]}."""
+
+        def mlsd(path="", facts=None):
+            return iter((name, {"type": kind}) for name, kind in tree[path])
+
+        mock_ftp.mlsd.side_effect = mlsd
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_traverse_radar_lists_each_folder_with_one_mlsd(self, mock_ftp_class):
+        from datetime import datetime, timezone
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        self._tree_server(
+            mock_ftp,
+            {
+                "/L2/RMA1": [(".", "cdir"), ("2024", "dir"), ("README", "file")],
+                "/L2/RMA1/2024": [("01", "dir")],
+                "/L2/RMA1/2024/01": [("01", "dir")],
+                "/L2/RMA1/2024/01/01": [("12", "dir")],
+                "/L2/RMA1/2024/01/01/12": [("0000", "dir"), ("0500", "dir")],
+                "/L2/RMA1/2024/01/01/12/0000": [("a.BUFR", "file"), ("tmp", "dir")],
+                "/L2/RMA1/2024/01/01/12/0500": [("b.BUFR", "file")],
+            },
+        )
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test")
+        entries = list(client.traverse_radar("RMA1", datetime(2024, 1, 1, tzinfo=timezone.utc)))
+
+        assert [(dt.minute, fname, str(remote)) for dt, fname, remote in entries] == [
+            (0, "a.BUFR", "/L2/RMA1/2024/01/01/12/0000/a.BUFR"),
+            (5, "b.BUFR", "/L2/RMA1/2024/01/01/12/0500/b.BUFR"),
+        ]
+        assert mock_ftp.mlsd.call_count == 7
+        mock_ftp.cwd.assert_not_called()
+        mock_ftp.nlst.assert_not_called()
+        mock_ftp.sendcmd.assert_not_called()  # no OPTS MLST per listing
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_traverse_radar_filters_files_by_vol_types_dict(self, mock_ftp_class):
+        import asyncio
+        from datetime import datetime, timezone
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        names = [
+            "RMA1_0315_01_DBZH_20240101T120000Z.BUFR",
+            "RMA1_0315_01_ZDR_20240101T120000Z.BUFR",
+            "RMA1_0315_02_VRAD_20240101T120000Z.BUFR",
+            "RMA1_0200_01_DBZH_20240101T120000Z.BUFR",
+        ]
+        mock_ftp = MagicMock()
+        self._tree_server(
+            mock_ftp,
+            {
+                "/L2/RMA1": [("2024", "dir")],
+                "/L2/RMA1/2024": [("01", "dir")],
+                "/L2/RMA1/2024/01": [("01", "dir")],
+                "/L2/RMA1/2024/01/01": [("12", "dir")],
+                "/L2/RMA1/2024/01/01/12": [("0000", "dir")],
+                "/L2/RMA1/2024/01/01/12/0000": [(name, "file") for name in names],
+            },
+        )
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test")
+        vol_types = {"0315": {"01": ["DBZH"], "02": ["VRAD"]}}
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        expected = [names[0], names[2]]
+
+        assert [fname for _, fname, _ in client.traverse_radar("RMA1", start, vol_types=vol_types)] == expected
+
+        async def collect():
+            return [fname async for _, fname, _ in client.traverse_radar_async("RMA1", start, vol_types=vol_types)]
+
+        assert asyncio.run(collect()) == expected
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_traverse_radar_prunes_to_the_datetime_window(self, mock_ftp_class):
+        """Boundaries at every level, sync and async traversals agree."""
+        import asyncio
+        from datetime import datetime, timezone
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        tree = {"/L2/RMA1": [("2023", "dir"), ("2024", "dir")]}
+        for y, months in (("2023", ("12",)), ("2024", ("01", "02"))):
+            tree[f"/L2/RMA1/{y}"] = [(m, "dir") for m in months]
+            for m in months:
+                tree[f"/L2/RMA1/{y}/{m}"] = [("01", "dir"), ("31", "dir")]
+                for d in ("01", "31"):
+                    tree[f"/L2/RMA1/{y}/{m}/{d}"] = [("00", "dir"), ("23", "dir")]
+                    for h in ("00", "23"):
+                        tree[f"/L2/RMA1/{y}/{m}/{d}/{h}"] = [("0500", "dir"), ("0000", "dir"), ("5500", "dir")]
+                        for ms in ("0000", "0500", "5500"):
+                            tree[f"/L2/RMA1/{y}/{m}/{d}/{h}/{ms}"] = [(f"{y}{m}{d}{h}{ms}.BUFR", "file")]
+
+        mock_ftp = MagicMock()
+        self._tree_server(mock_ftp, tree)
+        mock_ftp_class.return_value = mock_ftp
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=2)
+
+        async def collect_async(*args, **kwargs):
+            return [entry async for entry in client.traverse_radar_async("RMA1", *args, **kwargs)]
+
+        utc = timezone.utc
+        start, end = datetime(2023, 12, 31, 23, 5, tzinfo=utc), datetime(2024, 1, 31, 0, 5, tzinfo=utc)
+        for include_start in (True, False):
+            for include_end in (True, False):
+                entries = list(client.traverse_radar("RMA1", start, end, include_start, include_end))
+                dts = [dt for dt, _, _ in entries]
+                assert dts == sorted(dts)
+                assert (dts[0] == start) is include_start and (dts[-1] == end) is include_end
+                assert all(start <= dt <= end for dt in dts)
+                assert asyncio.run(collect_async(start, end, include_start, include_end)) == entries
+
+        # 2023-12-31 23:05 and 23:55, all six of 2024-01-01, 2024-01-31 00:00 and 00:05
+        assert len(list(client.traverse_radar("RMA1", start, end))) == 2 + 6 + 2
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_traverse_radar_async_lists_siblings_concurrently(self, mock_ftp_class):
+        import asyncio
+        import re
+        import threading
+        from datetime import datetime, timezone
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        tree = {
+            "/L2/RMA1": [("2024", "dir")],
+            "/L2/RMA1/2024": [("01", "dir")],
+            "/L2/RMA1/2024/01": [("01", "dir"), ("02", "dir")],
+            "/L2/RMA1/2024/01/01": [("23", "dir")],
+            "/L2/RMA1/2024/01/02": [("00", "dir")],
+            "/L2/RMA1/2024/01/01/23": [("5500", "dir")],
+            "/L2/RMA1/2024/01/02/00": [("0000", "dir"), ("0500", "dir")],
+            "/L2/RMA1/2024/01/01/23/5500": [("a_DBZH.BUFR", "file")],
+            "/L2/RMA1/2024/01/02/00/0000": [("b_DBZH.BUFR", "file"), ("b_VRAD.BUFR", "file")],
+            "/L2/RMA1/2024/01/02/00/0500": [("c_DBZH.BUFR", "file")],
+        }
+        # Both day folders, and then all three minute folders, must be in flight together
+        barriers = {2: threading.Barrier(2, timeout=5), 3: threading.Barrier(3, timeout=5)}
+        waits = {"/L2/RMA1/2024/01/01": 2, "/L2/RMA1/2024/01/02": 2}
+        waits.update({path: 3 for path in tree if path.count("/") == 8})
+
+        connections = []
+
+        def new_connection(timeout=None):
+            conn = MagicMock()
+            connections.append(conn)
+
+            def mlsd(path="", facts=None):
+                if path in waits:
+                    barriers[waits[path]].wait()
+                return iter((name, {"type": kind}) for name, kind in tree[path])
+
+            conn.mlsd.side_effect = mlsd
+            return conn
+
+        mock_ftp_class.side_effect = new_connection
+
+        async def collect():
+            client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=4)
+            start = datetime(2024, 1, 1, 23, 0, tzinfo=timezone.utc)
+            return [
+                (dt, fname, str(remote))
+                async for dt, fname, remote in client.traverse_radar_async(
+                    "RMA1", start, include_start=False, vol_types=re.compile(r".*_DBZH"), max_concurrent=3
+                )
+            ]
+
+        entries = asyncio.run(collect())
+
+        assert [(dt.day, dt.hour, dt.minute, fname) for dt, fname, _ in entries] == [
+            (1, 23, 55, "a_DBZH.BUFR"),
+            (2, 0, 0, "b_DBZH.BUFR"),
+            (2, 0, 5, "c_DBZH.BUFR"),
+        ]
+        assert entries[1][2] == "/L2/RMA1/2024/01/02/00/0000/b_DBZH.BUFR"
+        # Listing sessions are capped by max_concurrent and all closed at the end
+        assert 1 < len(connections) <= 3
+        assert all(conn.close.called for conn in connections)
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_list_entries_falls_back_to_nlst_once(self, mock_ftp_class):
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp.mlsd.side_effect = ftplib.error_perm("500 Unknown command")
+        mock_ftp.nlst.return_value = ["a.BUFR"]
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test")
+        assert client.list_entries("/L2/RMA1/x") == [("a.BUFR", "")]
+        assert client.list_entries("/L2/RMA1/y") == [("a.BUFR", "")]
+
+        assert mock_ftp.mlsd.call_count == 1
+        mock_ftp.cwd.assert_called_with("/L2/RMA1/y")
+
+
+@pytest.mark.integration
+class TestRadarFTPClientAsyncParallel:
+    """Parallel downloads of RadarFTPClientAsync with a mocked server."""
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_download_files_parallel_uses_bounded_workers(self, mock_ftp_class, tmp_path):
+        import asyncio
+        import threading
+        import time
+        from pathlib import Path
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def retr(cmd, rest):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.01)
+            with lock:
+                active["now"] -= 1
+            return cmd.encode()
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        buffer_sizes = _serve_retr(mock_ftp, retr)
+        mock_ftp_class.return_value = mock_ftp
+
+        names = [f"RMA1_0315_01_DBZH_20240101T1200{i:02d}Z.BUFR" for i in range(10)]
+        files = [(Path(f"/L2/RMA1/{n}"), tmp_path / n) for n in names]
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=3)
+        results = asyncio.run(client.download_files_parallel(files))
+
+        assert results == [local for _, local in files]
+        assert all(p.read_bytes() == f"RETR {p.name}".encode() for p in results)
+        assert active["peak"] <= 3
+        assert buffer_sizes == {1 << 20}
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_fetch_file_async_returns_transferred_bytes(self, mock_ftp_class, tmp_path):
+        import asyncio
+        from pathlib import Path
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, lambda cmd, rest: b"abcdefg")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1)
+        local = tmp_path / "file.BUFR"
+        size = asyncio.run(client.fetch_file_async(Path("/L2/RMA1/file.BUFR"), local))
+
+        assert size == 7
+        assert local.read_bytes() == b"abcdefg"
+        mock_ftp.cwd.assert_called_with("/L2/RMA1")
+
+        # Plain POSIX strings are split the same way
+        asyncio.run(client.fetch_file_async("/L2/RMA2/file.BUFR", local))
+        mock_ftp.cwd.assert_called_with("/L2/RMA2")
+        mock_ftp.transfercmd.assert_called_with("RETR file.BUFR")
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_block_size_is_configurable(self, mock_ftp_class, tmp_path):
+        import asyncio
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        buffer_sizes = _serve_retr(mock_ftp, lambda cmd, rest: b"data")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1, block_size=1 << 16)
+        asyncio.run(client.fetch_file_async("/L2/RMA1/a.BUFR", tmp_path / "a.BUFR"))
+        mock_ftp.transfercmd.assert_called_with("RETR a.BUFR")
+
+        client.ftp = mock_ftp
+        client.download_file("/L2/RMA1/b.BUFR", tmp_path / "b.BUFR")
+        mock_ftp.transfercmd.assert_called_with("RETR /L2/RMA1/b.BUFR")
+        assert (tmp_path / "b.BUFR").read_bytes() == b"data"
+        assert buffer_sizes == {1 << 16}
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_downloads_reuse_pooled_sessions(self, mock_ftp_class, tmp_path):
+        """Sessions are logged in once and reused; a session that fails mid-transfer is dropped."""
+        import asyncio
+        import time
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+        from radarlib.io.ftp.ftp_client import FTPError
+
+        sessions = []
+
+        def new_session(*args, **kwargs):
+            ftp = MagicMock()
+            _serve_retr(ftp, lambda cmd, rest: cmd.encode())
+            sessions.append(ftp)
+            return ftp
+
+        mock_ftp_class.side_effect = new_session
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=2)
+        files = [(f"/L2/RMA1/f{i}.BUFR", tmp_path / f"f{i}.BUFR") for i in range(10)]
+        asyncio.run(client.download_files_parallel(files))
+
+        assert all((tmp_path / f"f{i}.BUFR").read_bytes() == f"RETR f{i}.BUFR".encode() for i in range(10))
+        assert 1 <= len(sessions) <= 2
+        assert all(ftp.login.call_count == 1 for ftp in sessions)
+
+        # A broken data connection closes the session instead of returning it to the pool
+        broken, _ = client._pool.get_nowait()
+        while not client._pool.empty():
+            client._pool.get_nowait()
+        broken.transfercmd.side_effect = OSError("connection reset")
+        client._pool.put_nowait((broken, time.monotonic()))
+        with pytest.raises(FTPError):
+            asyncio.run(client.fetch_file_async("/L2/RMA1/x.BUFR", tmp_path / "x.BUFR"))
+        broken.close.assert_called_once()
+        assert client._pool.empty()
+
+        asyncio.run(client.fetch_file_async("/L2/RMA1/y.BUFR", tmp_path / "y.BUFR"))
+        client.close()
+        sessions[-1].quit.assert_called_once()
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_rcvbuf_applies_to_data_sockets_only_when_set(self, mock_ftp_class):
+        """rcvbuf sizes every data socket; without it the kernel keeps autotuning the buffer."""
+        import socket
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        data_conn = MagicMock()
+        mock_ftp = MagicMock()
+        mock_ftp.ntransfercmd.return_value = (data_conn, None)
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1, rcvbuf=4 << 20)
+        client._connect()
+        assert client.ftp.ntransfercmd("RETR a.BUFR") == (data_conn, None)
+        data_conn.setsockopt.assert_called_once_with(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        mock_ftp.sock.setsockopt.assert_any_call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        data_conn.reset_mock()
+        mock_ftp_class.return_value = MagicMock(ntransfercmd=MagicMock(return_value=(data_conn, None)))
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1)
+        client._connect()
+        client.ftp.ntransfercmd("RETR a.BUFR")
+        data_conn.setsockopt.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_fetch_file_async_resumes_partial_file(self, mock_ftp_class, tmp_path):
+        import asyncio
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        data = b"abcdefg"
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, lambda cmd, rest: data[rest or 0 :])
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1)
+        local = tmp_path / "file.BUFR"
+        local.write_bytes(b"abc")
+        size = asyncio.run(client.fetch_file_async("/L2/RMA1/file.BUFR", local, resume=True))
+
+        assert size == 7
+        assert local.read_bytes() == data
+        mock_ftp.transfercmd.assert_called_once_with("RETR file.BUFR", 3)
+
+        # Without resume a leftover file is overwritten from the start
+        local.write_bytes(b"xyz")
+        assert asyncio.run(client.fetch_file_async("/L2/RMA1/file.BUFR", local)) == 7
+        assert local.read_bytes() == data
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_fetch_file_async_restarts_when_rest_is_refused(self, mock_ftp_class, tmp_path):
+        import asyncio
+        import ftplib
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        def retr(cmd, rest):
+            if rest:
+                raise ftplib.error_perm("502 REST not implemented")
+            return b"abcdefg"
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, retr)
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1)
+        local = tmp_path / "file.BUFR"
+        local.write_bytes(b"abc")
+        size = asyncio.run(client.fetch_file_async("/L2/RMA1/file.BUFR", local, resume=True))
+
+        assert size == 7
+        assert local.read_bytes() == b"abcdefg"
+        assert mock_ftp.transfercmd.call_count == 2
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_fetch_file_async_creates_missing_local_dir(self, mock_ftp_class, tmp_path):
+        import asyncio
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, lambda cmd, rest: b"data")
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=1)
+        local = tmp_path / "RMA1" / "2024" / "file.BUFR"
+        asyncio.run(client.fetch_file_async("/L2/RMA1/file.BUFR", local))
+        assert local.read_bytes() == b"data"
+
+        # Once the directory exists, later downloads into it do not call mkdir
+        with patch("pathlib.Path.mkdir") as mkdir:
+            asyncio.run(client.fetch_file_async("/L2/RMA1/other.BUFR", local.with_name("other.BUFR")))
+        mkdir.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp_client.ftplib.FTP")
+    def test_async_client_runs_max_workers_downloads_at_once(self, mock_ftp_class, tmp_path):
+        """Downloads use the client's own threads, so max_workers is not capped by the default executor."""
+        import asyncio
+        import threading
+
+        from radarlib.io.ftp import RadarFTPClientAsync
+
+        workers = 40
+        barrier = threading.Barrier(workers, timeout=5)
+        threads = set()
+
+        def retr(cmd, rest):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return b"x"
+
+        mock_ftp = MagicMock()
+        mock_ftp.__enter__.return_value = mock_ftp
+        _serve_retr(mock_ftp, retr)
+        mock_ftp_class.return_value = mock_ftp
+
+        client = RadarFTPClientAsync("test.ftp.com", "test", "test", max_workers=workers)
+        files = [(f"/L2/RMA1/f{i}.BUFR", tmp_path / f"f{i}.BUFR") for i in range(workers)]
+        asyncio.run(client.download_files_parallel(files))
+
+        assert len(threads) == workers
+        assert all(name.startswith("radar-ftp") for name in threads)
+        client.close()
+        assert client._executor is None
+
+
+@pytest.mark.integration
+class TestFTPModuleParallelDownloads:
+    """Tests for the parallel batch downloads of the low-level ftp module."""
+
+    @classmethod
+    def _fake_ftp(cls, retr, buffer_sizes=None):
+        """A connection whose RETR of a name returns retr(command) as the file content."""
+        buffer_sizes = set() if buffer_sizes is None else buffer_sizes
+
+        def cwd(path):
+            if str(path).endswith(".BUFR"):
+                raise ftplib.error_perm("550 Not a directory")
+
+        def sendcmd(cmd):
+            kind = "file" if cmd.endswith(".BUFR") else "dir"
+            return f"250-Listing\n type={kind};size=4; {cmd[5:]}\n250 End"
+
+        def transfercmd(cmd):
+            return _FakeDataConnection(retr(cmd), buffer_sizes)
+
+        return MagicMock(
+            cwd=MagicMock(side_effect=cwd),
+            transfercmd=MagicMock(side_effect=transfercmd),
+            sendcmd=MagicMock(side_effect=sendcmd),
+        )
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_multiple_files_runs_connections_in_parallel(self, mock_ftp_class, tmp_path):
+        """Files are spread over `concurrency` connections that transfer at the same time."""
+        import threading
+
+        from radarlib.io.ftp import download_multiple_files_from_ftp
+
+        barrier = threading.Barrier(3, timeout=5)
+        buffer_sizes = set()
+
+        def retr(cmd):
+            # Each round of three RETRs only completes if all three are in flight together
+            barrier.wait()
+            return cmd.encode()
+
+        mock_ftp_class.side_effect = lambda host: self._fake_ftp(retr, buffer_sizes)
+        names = [f"file{i}.BUFR" for i in range(6)]
+
+        download_multiple_files_from_ftp("ftp.example.com", "user", "pass", "/L2", names, tmp_path, concurrency=3)
+
+        assert mock_ftp_class.call_count == 3
+        assert all((tmp_path / name).read_bytes() == f"RETR {name}".encode() for name in names)
+        # The data socket is read into one large buffer instead of ftplib's 8 KiB blocks
+        assert buffer_sizes == {1 << 18}
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_multiple_files_stops_on_first_failure(self, mock_ftp_class, tmp_path):
+        """A failed RETR stops the batch and surfaces as FTPActionError."""
+        from radarlib.io.ftp import download_multiple_files_from_ftp
+
+        def retr(cmd):
+            if cmd == "RETR bad.BUFR":
+                raise ftplib.error_perm("550 No such file")
+            return b"data"
+
+        mock_ftp_class.side_effect = lambda host: self._fake_ftp(retr)
+
+        with pytest.raises(FTPActionError, match="bad.BUFR"):
+            download_multiple_files_from_ftp(
+                "ftp.example.com", "user", "pass", "/L2", ["bad.BUFR", "ok.BUFR"], tmp_path, concurrency=1
+            )
+        assert not (tmp_path / "ok.BUFR").exists()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_multiple_files_checks_directories_with_one_listing(self, mock_ftp_class, tmp_path):
+        """Each connection lists the directory once instead of probing every name before RETR."""
+        from radarlib.io.ftp import download_multiple_files_from_ftp
+
+        ftp = self._fake_ftp(lambda cmd: b"data")
+        ftp.mlsd.side_effect = lambda facts: iter([("0000", {"type": "dir"}), ("a.BUFR", {"type": "file"})])
+        mock_ftp_class.return_value = ftp
+        names = ["a.BUFR", "b.BUFR", "c.BUFR"]
+
+        download_multiple_files_from_ftp("ftp.example.com", "user", "pass", "/L2", names, tmp_path, concurrency=1)
+
+        assert all((tmp_path / name).read_bytes() == b"data" for name in names)
+        assert ftp.mlsd.call_count == 1
+        ftp.sendcmd.assert_not_called()
+        ftp.size.assert_not_called()
+
+        with pytest.raises(FTP_IsADirectoryError):
+            download_multiple_files_from_ftp("ftp.example.com", "user", "pass", "/L2", ["0000"], tmp_path)
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_ftp_folder_walks_once_and_downloads_in_parallel(self, mock_ftp_class, tmp_path):
+        """The tree is walked with one MLSD per directory on one connection, and downloaded over several."""
+        from pathlib import Path
+
+        from radarlib.io.ftp import download_ftp_folder
+
+        listings = {
+            "/L2/H": [(".", {"type": "cdir"}), ("0000", {"type": "dir"}), ("a.BUFR", {"type": "file"})],
+            "/L2/H/0000": [("b.BUFR", {"type": "file"}), ("c.BUFR", {"type": "file"})],
+        }
+        connections = []
+
+        def make_ftp(host):
+            ftp = self._fake_ftp(lambda cmd: cmd.encode())
+            ftp.mlsd.side_effect = lambda path, facts: iter(listings[path])
+            connections.append(ftp)
+            return ftp
+
+        mock_ftp_class.side_effect = make_ftp
+
+        download_ftp_folder("ftp.example.com", "user", "pass", Path("/L2/H"), tmp_path / "H", concurrency=2)
+
+        assert (tmp_path / "H" / "a.BUFR").read_bytes() == b"RETR /L2/H/a.BUFR"
+        assert (tmp_path / "H" / "0000" / "b.BUFR").read_bytes() == b"RETR /L2/H/0000/b.BUFR"
+        assert (tmp_path / "H" / "0000" / "c.BUFR").read_bytes() == b"RETR /L2/H/0000/c.BUFR"
+        # The walking connection downloads too, so concurrency=2 needs only one more login
+        assert len(connections) == 2
+        assert connections[0].mlsd.call_count == 2
+        connections[0].cwd.assert_not_called()
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_multiple_files_skips_files_already_present(self, mock_ftp_class, tmp_path):
+        """A local file with the remote SIZE is not transferred again; mismatched or missing ones are."""
+        from radarlib.io.ftp import download_multiple_files_from_ftp
+
+        ftp = self._fake_ftp(lambda cmd: cmd.encode())
+        ftp.size.side_effect = lambda name: len(f"RETR {name}")
+        mock_ftp_class.return_value = ftp
+        (tmp_path / "a.BUFR").write_bytes(b"x" * len("RETR a.BUFR"))
+        (tmp_path / "b.BUFR").write_bytes(b"partial")
+
+        names = ["a.BUFR", "b.BUFR", "c.BUFR"]
+        download_multiple_files_from_ftp("ftp.example.com", "user", "pass", "/L2", names, tmp_path, concurrency=1)
+
+        assert [c.args[0] for c in ftp.transfercmd.call_args_list] == ["RETR b.BUFR", "RETR c.BUFR"]
+        assert (tmp_path / "a.BUFR").read_bytes() == b"x" * len("RETR a.BUFR")
+        assert (tmp_path / "b.BUFR").read_bytes() == b"RETR b.BUFR"
+        # No SIZE is sent for a file that does not exist locally
+        assert [c.args[0] for c in ftp.size.call_args_list] == ["a.BUFR", "b.BUFR"]
+
+        ftp.transfercmd.reset_mock()
+        download_multiple_files_from_ftp(
+            "ftp.example.com", "user", "pass", "/L2", names, tmp_path, concurrency=1, skip_existing=False
+        )
+        assert ftp.transfercmd.call_count == 3
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_ftp_folder_skips_files_already_present(self, mock_ftp_class, tmp_path):
+        from pathlib import Path
+
+        from radarlib.io.ftp import download_ftp_folder
+
+        ftp = self._fake_ftp(lambda cmd: cmd.encode())
+        listing = [("a.BUFR", {"type": "file"}), ("b.BUFR", {"type": "file"})]
+        ftp.mlsd.side_effect = lambda path, facts=None: iter(listing)
+        ftp.size.side_effect = lambda path: len(f"RETR {path}")
+        mock_ftp_class.return_value = ftp
+        (tmp_path / "H").mkdir()
+        (tmp_path / "H" / "a.BUFR").write_bytes(b"RETR /L2/H/a.BUFR")
+
+        download_ftp_folder("ftp.example.com", "user", "pass", Path("/L2/H"), tmp_path / "H", concurrency=1)
+
+        assert [c.args[0] for c in ftp.transfercmd.call_args_list] == ["RETR /L2/H/b.BUFR"]
+        assert (tmp_path / "H" / "b.BUFR").read_bytes() == b"RETR /L2/H/b.BUFR"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_ftp_folder_skips_by_mlsd_size_without_size_commands(self, mock_ftp_class, tmp_path):
+        """The size fact of the walk's own MLSD listing decides what to skip; no SIZE per file."""
+        from pathlib import Path
+
+        from radarlib.io.ftp import download_ftp_folder
+
+        ftp = self._fake_ftp(lambda cmd: cmd.encode())
+        listing = [("a.BUFR", {"type": "file", "size": "17"}), ("b.BUFR", {"type": "file", "size": "17"})]
+        ftp.mlsd.side_effect = lambda path, facts=None: iter(listing)
+        mock_ftp_class.return_value = ftp
+        (tmp_path / "H").mkdir()
+        (tmp_path / "H" / "a.BUFR").write_bytes(b"RETR /L2/H/a.BUFR")
+
+        download_ftp_folder("ftp.example.com", "user", "pass", Path("/L2/H"), tmp_path / "H", concurrency=1)
+
+        assert ftp.mlsd.call_args.kwargs["facts"] == ["type", "size"]
+        assert [c.args[0] for c in ftp.transfercmd.call_args_list] == ["RETR /L2/H/b.BUFR"]
+        ftp.size.assert_not_called()
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+    def test_retr_to_file_hints_sequential_write_and_drops_cache(self, tmp_path):
+        from radarlib.io.ftp.ftp import _retr_to_file
+
+        ftp = self._fake_ftp(lambda cmd: b"payload")
+        with patch("os.posix_fadvise") as fadvise:
+            assert _retr_to_file(ftp, "RETR a.BUFR", tmp_path / "a.BUFR") == 7
+
+        advice = [c.args[1:] for c in fadvise.call_args_list]
+        assert advice == [(0, 0, os.POSIX_FADV_SEQUENTIAL), (0, 0, os.POSIX_FADV_DONTNEED)]
+        assert (tmp_path / "a.BUFR").read_bytes() == b"payload"
+
+    @patch("radarlib.io.ftp.ftp.ftplib.FTP")
+    def test_download_ftp_folder_falls_back_to_nlst(self, mock_ftp_class, tmp_path):
+        """Servers without MLSD are walked with NLST, probing each name with CWD."""
+        from pathlib import Path
+
+        from radarlib.io.ftp import download_ftp_folder
+
+        listings = {"/L2/H": ["/L2/H/.", "/L2/H/..", "/L2/H/0000", "/L2/H/a.BUFR"], "/L2/H/0000": ["b.BUFR"]}
+        ftp = self._fake_ftp(lambda cmd: cmd.encode())
+        ftp.mlsd.side_effect = ftplib.error_perm("500 Unknown command")
+        ftp.nlst.side_effect = lambda path: listings[path]
+        mock_ftp_class.return_value = ftp
+
+        download_ftp_folder("ftp.example.com", "user", "pass", Path("/L2/H"), tmp_path / "H", concurrency=1)
+
+        assert (tmp_path / "H" / "a.BUFR").read_bytes() == b"RETR /L2/H/a.BUFR"
+        assert (tmp_path / "H" / "0000" / "b.BUFR").read_bytes() == b"RETR /L2/H/0000/b.BUFR"
+        assert ftp.mlsd.call_count == 1
+        # "." and ".." are dropped from the listing instead of being probed with CWD
+        assert not any(c.args[0].endswith((".", "..")) for c in ftp.cwd.call_args_list)
+
+    def test_remote_is_dir_uses_one_mlst(self):
+        """MLST answers file-or-directory in one command; SIZE and CWD are only fallbacks."""
+        from radarlib.io.ftp.ftp import _remote_is_dir
+
+        ftp = self._fake_ftp(None)
+        assert _remote_is_dir(ftp, "0000") is True
+        assert _remote_is_dir(ftp, "a.BUFR") is False
+        ftp.cwd.assert_not_called()
+        ftp.size.assert_not_called()
+
+        # Missing names are left for RETR to report
+        ftp.sendcmd.side_effect = ftplib.error_perm("550 No such file")
+        assert _remote_is_dir(ftp, "missing.BUFR") is False
+
+        # Without MLST a successful SIZE settles it, and a refused SIZE falls back to CWD
+        ftp.sendcmd.side_effect = ftplib.error_perm("500 Unknown command")
+        assert _remote_is_dir(ftp, "a.BUFR") is False
+        ftp.cwd.assert_not_called()
+        ftp.size.side_effect = ftplib.error_perm("550 Not a regular file")
+        assert _remote_is_dir(ftp, "0000") is True
+        assert _remote_is_dir(ftp, "a.BUFR") is False
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the daemons module using the new organization."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -96,3 +96,470 @@ class TestDownloadDaemon:
         with patch("radarlib.daemons.download_daemon.SQLiteStateTracker"):
             daemon = DownloadDaemon(config)
             assert daemon.radar_name == "RMA1"
+
+    def test_download_candidates_streams_with_bounded_concurrency(self, temp_dirs):
+        """Test that candidates are downloaded with at most max_concurrent_downloads in flight."""
+        import asyncio
+        from datetime import datetime, timezone
+        from pathlib import PurePosixPath
+
+        from radarlib.daemons import DownloadDaemon, DownloadDaemonConfig
+        from radarlib.io.ftp.ftp_client import FTPError
+
+        bufr_dir, state_db = temp_dirs
+        config = DownloadDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            radar_name="RMA1",
+            remote_base_path="/L2",
+            local_bufr_dir=bufr_dir,
+            state_db=state_db,
+            max_concurrent_downloads=2,
+            bufr_download_max_retries=1,
+        )
+        daemon = DownloadDaemon(config)
+        active = {"now": 0, "peak": 0}
+
+        class FakeClient:
+            async def fetch_file_async(self, remote_path, local_path, resume=False):
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                await asyncio.sleep(0.01)
+                active["now"] -= 1
+                if "VRAD" in remote_path.name:
+                    raise FTPError("550 gone")
+                return 100
+
+        dt = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).isoformat()
+        names = [f"RMA1_0315_01_DBZH_20240101T1200{i:02d}Z.BUFR" for i in range(5)]
+        names.append("RMA1_0315_02_VRAD_20240101T120000Z.BUFR")
+        candidates = iter([(PurePosixPath(f"/L2/RMA1/{n}"), bufr_dir / n, n, dt, "new") for n in names])
+
+        processed = asyncio.run(daemon._download_candidates(FakeClient(), candidates))
+
+        assert processed == 6
+        assert active["peak"] <= 2
+        assert daemon.state_tracker.count() == 5
+        assert daemon.state_tracker.count(status="failed") == 1
+        assert daemon.state_tracker.get_file_info(names[0])["file_size"] == 100
+        daemon.state_tracker.close()
+
+    def test_new_bufr_files_skips_downloaded(self, temp_dirs):
+        """Test that files already recorded by the state tracker are not downloaded again."""
+        from unittest.mock import MagicMock
+
+        from radarlib.daemons import DownloadDaemon, DownloadDaemonConfig
+
+        bufr_dir, state_db = temp_dirs
+        config = DownloadDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            radar_name="RMA1",
+            remote_base_path="/L2",
+            local_bufr_dir=bufr_dir,
+            state_db=state_db,
+        )
+        daemon = DownloadDaemon(config)
+        names = [f"RMA1_0315_01_DBZH_20240101T12{i:02d}00Z.BUFR" for i in range(100)]
+        for name in names[:50:2]:
+            daemon.state_tracker.mark_downloaded(name, f"/L2/RMA1/{name}")
+        client = MagicMock()
+        client.traverse_radar.return_value = iter(("2024-01-01T12:00:00", n, f"/L2/RMA1/{n}") for n in names)
+
+        candidates = list(daemon.new_bufr_files(client))
+
+        assert [c[2] for c in candidates] == names[1:50:2] + names[50:]
+        assert candidates[0][1] == bufr_dir / names[1]
+        daemon.state_tracker.close()
+
+    def test_idle_sends_keepalive_noops(self, temp_dirs):
+        """Test that the sleep between polls keeps the shared FTP session alive."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        from radarlib.daemons import DownloadDaemon, DownloadDaemonConfig
+
+        bufr_dir, state_db = temp_dirs
+        config = DownloadDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            radar_name="RMA1",
+            remote_base_path="/L2",
+            local_bufr_dir=bufr_dir,
+            state_db=state_db,
+            ftp_keepalive_interval=0.02,
+        )
+        daemon = DownloadDaemon(config)
+        client = MagicMock()
+        client.is_connected.return_value = True
+
+        asyncio.run(daemon._idle(client, 0.07))
+
+        assert 2 <= client.is_connected.call_count <= 3
+        daemon.state_tracker.close()
+
+
+class TestFTPDaemon:
+    """Tests for the legacy FTPDaemon."""
+
+    def test_config_defaults(self, tmp_path):
+        """Test the FTPDaemonConfig defaults."""
+        from radarlib.daemons import FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+        )
+
+        assert config.poll_interval == 60
+        assert config.max_concurrent_downloads == 16
+
+    def test_discover_new_files_uses_file_pattern(self, tmp_path):
+        """Test that file discovery honours glob patterns from the config."""
+        import asyncio
+
+        from radarlib.daemons import FTPDaemon, FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            file_pattern="*_2024*.BUFR",
+        )
+        daemon = FTPDaemon(config)
+        listing = [
+            "RMA1_0315_01_DBZH_20240101T120000Z.BUFR",
+            "RMA1_0315_01_DBZH_20231231T235000Z.BUFR",
+            "RMA1_0315_01_DBZH_20240101T120000Z.BUFR.tmp",
+            "readme.txt",
+        ]
+
+        with patch.object(daemon.client, "iter_files", return_value=iter(listing)):
+            new_files = asyncio.run(daemon._discover_new_files())
+
+        assert new_files == ["/L2/RMA1_0315_01_DBZH_20240101T120000Z.BUFR"]
+
+    def test_discover_new_files_skips_files_in_state_db(self, tmp_path):
+        """Test that a shared SQLite state database filters already-downloaded files."""
+        import asyncio
+
+        from radarlib.daemons import FTPDaemon, FTPDaemonConfig
+        from radarlib.state import SQLiteStateTracker
+
+        state_db = tmp_path / "state.db"
+        tracker = SQLiteStateTracker(state_db)
+        downloaded = "RMA1_0315_01_DBZH_20240101T120000Z.BUFR"
+        tracker.mark_downloaded(downloaded, f"/L2/{downloaded}")
+        tracker.close()
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            state_db=state_db,
+        )
+        daemon = FTPDaemon(config)
+        listing = [
+            "RMA1_0315_01_DBZH_20240101T120000Z.BUFR",
+            "RMA1_0315_01_VRAD_20240101T120000Z.BUFR",
+        ]
+
+        with patch.object(daemon.client, "iter_files", return_value=iter(listing)):
+            new_files = asyncio.run(daemon._discover_new_files())
+
+        assert new_files == ["/L2/RMA1_0315_01_VRAD_20240101T120000Z.BUFR"]
+        assert isinstance(daemon.state_tracker, SQLiteStateTracker)
+        assert not (tmp_path / "state.json").exists()
+        daemon.state_tracker.close()
+
+    def test_config_precompiles_file_pattern(self, tmp_path):
+        """Test that FTPDaemonConfig translates the glob once, outside the init arguments."""
+        from radarlib.daemons import FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            file_pattern="RMA1_*.BUFR",
+        )
+
+        assert config.file_regex.match("RMA1_0315_01_DBZH_20240101T120000Z.BUFR")
+        assert not config.file_regex.match("RMA2_0315_01_DBZH_20240101T120000Z.BUFR")
+        assert "file_regex" not in repr(config)
+
+    def test_run_downloads_on_own_executor(self, tmp_path):
+        """Test that FTP and state tracker calls run on the daemon's own threads, which stop after run()."""
+        import asyncio
+        import threading
+
+        from radarlib.daemons import FTPDaemon, FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            poll_interval=0,
+        )
+        daemon = FTPDaemon(config)
+        threads = []
+
+        async def check_once():
+            await daemon._download_file_async("/L2/RMA1_0315_01_DBZH_20240101T120000Z.BUFR")
+            daemon.stop()
+
+        def download_file(remote_path, local_path):
+            threads.append(threading.current_thread().name)
+
+        def mark_downloaded(filename, remote_path):
+            threads.append(threading.current_thread().name)
+            original_mark_downloaded(filename, remote_path)
+
+        original_mark_downloaded = daemon.state_tracker.mark_downloaded
+        with patch.object(daemon.client, "download_file", side_effect=download_file):
+            with patch.object(daemon.state_tracker, "mark_downloaded", side_effect=mark_downloaded):
+                with patch.object(daemon, "_check_and_download_new_files", side_effect=check_once):
+                    asyncio.run(daemon.run())
+
+        assert threads[0].startswith("ftp-daemon_")
+        assert threads[1].startswith("ftp-daemon-state")
+        assert daemon._executor is None
+        assert daemon._state_executor is None
+        assert daemon.state_tracker.is_downloaded("RMA1_0315_01_DBZH_20240101T120000Z.BUFR")
+
+    def test_run_polls_at_a_fixed_rate(self, tmp_path):
+        """Test that the check cycle's own duration is absorbed into poll_interval rather than added to it."""
+        import asyncio
+
+        from radarlib.daemons import FTPDaemon, FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            poll_interval=0.2,
+        )
+        daemon = FTPDaemon(config)
+        starts = []
+
+        async def slow_check():
+            starts.append(asyncio.get_running_loop().time())
+            if len(starts) == 3:
+                daemon.stop()
+            await asyncio.sleep(0.15)
+
+        with patch.object(daemon, "_check_and_download_new_files", side_effect=slow_check):
+            asyncio.run(daemon.run())
+
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert all(0.19 <= gap < 0.3 for gap in gaps)
+
+    def test_check_and_download_keeps_task_count_bounded(self, tmp_path, caplog):
+        """Test that only max_concurrent_downloads download tasks exist at any time."""
+        import asyncio
+        import logging
+
+        from radarlib.daemons import FTPDaemon, FTPDaemonConfig
+
+        config = FTPDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            local_download_dir=tmp_path / "downloads",
+            state_file=tmp_path / "state.json",
+            max_concurrent_downloads=2,
+        )
+        daemon = FTPDaemon(config)
+        new_files = [f"/L2/file{i}.BUFR" for i in range(7)]
+        live = {"now": 0, "peak": 0}
+
+        async def download(remote_path):
+            live["now"] += 1
+            live["peak"] = max(live["peak"], live["now"])
+            await asyncio.sleep(0.001)
+            live["now"] -= 1
+            return remote_path != "/L2/file3.BUFR"
+
+        with (
+            patch.object(daemon, "_discover_new_files", AsyncMock(return_value=new_files)),
+            patch.object(daemon, "_download_file_async", side_effect=download) as download_mock,
+            caplog.at_level(logging.INFO),
+        ):
+            asyncio.run(daemon._check_and_download_new_files())
+
+        assert download_mock.call_count == 7
+        assert live["peak"] == 2
+        assert "6 succeeded, 1 failed" in caplog.text
+
+
+class TestDateBasedFTPDaemon:
+    """Tests for the legacy DateBasedFTPDaemon."""
+
+    @pytest.fixture
+    def daemon(self, tmp_path):
+        """Create a daemon with a throwaway state database."""
+        from datetime import datetime, timezone
+
+        from radarlib.daemons import DateBasedDaemonConfig, DateBasedFTPDaemon
+
+        config = DateBasedDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            radar_code="RMA1",
+            local_download_dir=tmp_path / "downloads",
+            state_db=tmp_path / "state.db",
+            start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        daemon = DateBasedFTPDaemon(config)
+        yield daemon
+        daemon.state_tracker.close()
+
+    def test_list_hour_files_groups_one_listing_by_minute(self, daemon):
+        """Test that an hour is listed once and its BUFR files grouped by MMSS directory."""
+        entries = [
+            "0500/RMA1_0315_01_VRAD_20240101T120500Z.BUFR",
+            "0000/RMA1_0315_01_DBZH_20240101T120000Z.BUFR",
+            "0000/notes.txt",
+            "tmp/RMA1_0315_01_DBZH_20240101T120000Z.BUFR",
+            "stray.BUFR",
+        ]
+
+        with patch.object(daemon.client, "list_recursive", return_value=entries) as list_recursive:
+            grouped = daemon._list_hour_files("/L2/RMA1/2024/01/01/12")
+
+        list_recursive.assert_called_once_with("/L2/RMA1/2024/01/01/12", max_depth=1, max_concurrent=5)
+        assert grouped == {
+            "0000": ["RMA1_0315_01_DBZH_20240101T120000Z.BUFR"],
+            "0500": ["RMA1_0315_01_VRAD_20240101T120500Z.BUFR"],
+        }
+        assert list(grouped) == ["0000", "0500"]
+
+    def test_filter_files_by_volume(self, tmp_path):
+        """Test that only files whose volume code, number and field are configured are kept."""
+        from datetime import datetime, timezone
+
+        from radarlib.daemons import DateBasedDaemonConfig, DateBasedFTPDaemon
+
+        config = DateBasedDaemonConfig(
+            host="ftp.example.com",
+            username="user",
+            password="pass",
+            remote_base_path="/L2",
+            radar_code="RMA1",
+            local_download_dir=tmp_path / "downloads",
+            state_db=tmp_path / "state.db",
+            start_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            volume_types={"0315": {"01": ["DBZH", "DBZV"], "02": ["VRAD"]}},
+        )
+        daemon = DateBasedFTPDaemon(config)
+        filenames = [
+            "RMA1_0315_01_DBZH_20250925T000534Z.BUFR",
+            "RMA1_0315_01_VRAD_20250925T000534Z.BUFR",
+            "RMA1_0315_02_VRAD_20250925T000534Z.BUFR",
+            "RMA1_0200_01_DBZH_20250925T000534Z.BUFR",
+            "RMA1_0315_01.BUFR",
+        ]
+
+        assert daemon._filter_files_by_volume(filenames) == [filenames[0], filenames[2]]
+        daemon.state_tracker.close()
+
+    def test_scan_skips_downloaded_files_with_one_lookup(self, daemon):
+        """Test that an hour scan checks the tracker once and only downloads new files."""
+        import asyncio
+        from datetime import datetime, timezone
+
+        done = "RMA1_0315_01_DBZH_20240101T120000Z.BUFR"
+        new = "RMA1_0315_01_DBZH_20240101T120500Z.BUFR"
+        daemon.state_tracker.mark_downloaded(done, f"/L2/RMA1/2024/01/01/12/0000/{done}")
+        hour = {"0000": [done], "0500": [new]}
+        record = {"filename": new, "remote_path": f"/L2/RMA1/2024/01/01/12/0500/{new}"}
+
+        with (
+            patch.object(daemon, "_list_hour_files", return_value=hour),
+            patch.object(daemon, "_download_file_async", AsyncMock(return_value=(True, record))) as download,
+            patch.object(daemon.state_tracker, "is_downloaded") as is_downloaded,
+        ):
+            count = asyncio.run(daemon._scan_and_download_date(datetime(2024, 1, 1, 12, tzinfo=timezone.utc)))
+
+        assert count == 1
+        download.assert_awaited_once_with(f"/L2/RMA1/2024/01/01/12/0500/{new}", new)
+        is_downloaded.assert_not_called()
+
+    def test_scan_records_downloads_in_one_transaction(self, daemon):
+        """Test that a scan's downloads are written to the tracker together, with streamed checksums."""
+        import asyncio
+        import hashlib
+        from datetime import datetime, timezone
+
+        good = "RMA1_0315_01_DBZH_20240101T120000Z.BUFR"
+        bad = "RMA1_0315_01_DBZH_20240101T120500Z.BUFR"
+
+        def download_file(remote_path, local_path, hasher=None):
+            if remote_path.endswith(bad):
+                raise OSError("connection reset")
+            local_path.write_bytes(b"bufr")
+            hasher.update(b"bufr")
+
+        async def scan():
+            daemon._download_semaphore = asyncio.Semaphore(2)
+            return await daemon._scan_and_download_date(datetime(2024, 1, 1, 12, tzinfo=timezone.utc))
+
+        tracker = daemon.state_tracker
+        with (
+            patch.object(daemon, "_list_hour_files", return_value={"0000": [good], "0500": [bad]}),
+            patch.object(daemon.client, "download_file", side_effect=download_file),
+            patch.object(tracker, "mark_downloaded_many", wraps=tracker.mark_downloaded_many) as many,
+        ):
+            assert asyncio.run(scan()) == 2
+
+        many.assert_called_once()
+        info = daemon.state_tracker.get_file_info(good)
+        assert info["status"] == "completed"
+        assert info["checksum"] == hashlib.sha256(b"bufr").hexdigest()
+        assert info["file_size"] == 4
+        assert info["radar_name"] == "RMA1"
+        assert info["observation_datetime"] == "2024-01-01T12:00:00"
+        assert daemon.state_tracker.get_file_info(bad)["status"] == "failed"
+
+    def test_resume_date_from_latest_download(self, daemon):
+        """Test that scanning resumes at the newest downloaded observation for the radar."""
+        from datetime import datetime, timezone
+
+        assert daemon._get_resume_date() == daemon.config.start_date
+
+        daemon.state_tracker.mark_downloaded_many(
+            [
+                {
+                    "filename": "RMA1_0315_01_DBZH_20240102T030500Z.BUFR",
+                    "remote_path": "/L2/RMA1/2024/01/02/03/0500/RMA1_0315_01_DBZH_20240102T030500Z.BUFR",
+                    "radar_name": "RMA1",
+                    "observation_datetime": "2024-01-02T03:05:00",
+                }
+            ]
+        )
+
+        assert daemon._get_resume_date() == datetime(2024, 1, 2, 3, 5, tzinfo=timezone.utc)
@@ -42,3 +42,109 @@ def test_align_field_to_reference():
     assert aligned["data"].shape == (5, ref_ngates)
     # check that values were placed starting at gate 1 (index 1 because offset 100 / gate_size 100)
     assert aligned["data"][0, 1] == 5.0
+
+
+def test_align_field_to_reference_drops_info():
+    field = make_field("R_1_DBZH_1.BUFR", 50, 5, 0, 100, 1.0)
+    aligned = bufr_to_pyart_module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=80)
+    assert "info" not in aligned
+    assert aligned["tipo_producto"] == "DBZH"
+    # the input field is left untouched
+    assert "info" in field
+    assert field["data"].shape == (5, 50)
+
+
+def test_align_field_to_reference_masks_padding():
+    field = make_field("R_1_DBZH_1.BUFR", 50, 5, 100, 100, 1.0)
+    aligned = bufr_to_pyart_module._align_field_to_reference(
+        field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=200
+    )
+    data = aligned["data"]
+    assert isinstance(data, np.ma.MaskedArray)
+    assert data.dtype == np.float32
+    assert data.mask[:, 0].all()
+    assert data.mask[:, 51:].all()
+    assert not data.mask[:, 1:51].any()
+
+
+def test_align_field_to_reference_keeps_source_mask():
+    field = make_field("R_1_DBZH_1.BUFR", 50, 5, 0, 100, 1.0)
+    field["data"][2, 10] = np.ma.masked
+    aligned = bufr_to_pyart_module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=60)
+    assert aligned["data"].mask[2, 10]
+    assert aligned["data"][2, 11] == 5.0
+    # source array is not modified nor shared
+    assert field["data"][2, 11] == 5.0
+    assert not np.shares_memory(aligned["data"].data, field["data"].data)
+
+
+def test_fields_geometry():
+    f1 = make_field("R_1_DBZH_1.BUFR", 100, 10, 0, 100, 1.0)
+    f2 = make_field("R_1_VRAD_1.BUFR", 150, 12, 250, 100, 1.0)
+    empty = {"info": {"sweeps": pd.DataFrame()}}
+    geometry = bufr_to_pyart_module._fields_geometry([f1, f2, empty])
+    assert geometry["gate_offset"].tolist() == [0, 250, 0]
+    assert geometry["nrayos"].tolist() == [10, 12, 0]
+    assert geometry["last_gate"].tolist() == [10_000, 15_250, -1]
+    assert bufr_to_pyart_module._find_reference_field([f1, f2, empty], geometry) == 1
+
+
+def test_save_radar_to_cfradial_chunks_fields(tmp_path):
+    import netCDF4
+    import pyart
+
+    radar = pyart.testing.make_target_radar()
+    out_file = bufr_to_pyart_module.save_radar_to_cfradial(radar, tmp_path / "out.nc", chunk_rays=64, complevel=2)
+
+    with netCDF4.Dataset(out_file) as ds:
+        var = ds.variables["reflectivity"]
+        assert var.chunking() == [64, min(radar.ngates, 1024)]
+        assert var.filters()["complevel"] == 2
+        assert var.filters()["shuffle"]
+    # write options are not left behind on the radar fields
+    assert "_ChunkSizes" not in radar.fields["reflectivity"]
+
+
+def test_aligned_empty():
+    for shape in [(5, 7), (360, 1001), (1, 1)]:
+        arr = bufr_to_pyart_module._aligned_empty(shape, dtype=np.float32, align=64)
+        assert arr.shape == shape
+        assert arr.dtype == np.float32
+        assert arr.flags["C_CONTIGUOUS"] and arr.flags["WRITEABLE"]
+        assert arr.ctypes.data % 64 == 0
+
+
+def test_align_field_to_reference_same_grid_float32_is_not_copied():
+    field = make_field("R_1_DBZH_1.BUFR", 50, 5, 0, 100, 1.0)
+    field["data"] = field["data"].astype(np.float32)
+    aligned = bufr_to_pyart_module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=50)
+    assert aligned["data"] is field["data"]
+
+    field["data"] = field["data"].astype(np.float64)
+    aligned = bufr_to_pyart_module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=50)
+    assert aligned["data"].dtype == np.float32
+    assert not np.shares_memory(aligned["data"].data, field["data"].data)
+
+
+def test_align_kernel_matches_numpy_path(monkeypatch):
+    import pytest
+
+    pytest.importorskip("numba")
+
+    rng = np.random.default_rng(0)
+    for module in (bufr_to_pyart_module, pyart_writer):
+        # ragged fields: fewer gates than the reference, at several offsets, with NaN gates
+        for ngates, gate_offset in [(37, 0), (50, 300), (1, 1900), (163, 100)]:
+            field = make_field("R_1_DBZH_1.BUFR", ngates, 11, gate_offset, 100, 1.0)
+            data = rng.normal(20, 10, size=(11, ngates))
+            data[rng.random(data.shape) < 0.1] = np.nan
+            field["data"] = data
+
+            monkeypatch.setattr(module, "NUMBA_AVAILABLE", True)
+            jit = module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=200)
+            monkeypatch.setattr(module, "NUMBA_AVAILABLE", False)
+            ref = module._align_field_to_reference(field, ref_gate_offset=0, ref_gate_size=100, ref_ngates=200)
+
+            assert jit["data"].dtype == ref["data"].dtype == np.float32
+            np.testing.assert_array_equal(jit["data"].mask, ref["data"].mask)
+            np.testing.assert_array_equal(jit["data"].filled(-1), ref["data"].filled(-1))
@@ -0,0 +1,67 @@
+from radarlib.io.bufr.xml_scan import read_xml_estrategia2
+
+XML = """<?xml version="1.0"?>
+<estrategia nombre="0315">
+  <volumen tipo="ppi" longitud_celda_m="300">
+    <procesamiento tipo="intensidad">
+      <barrido>
+        <grupo pulsos="38" prp_us="800" pw_ns="1000" alcance_km="120"/>
+      </barrido>
+    </procesamiento>
+    <procesamiento tipo="staggered">
+      <barrido conjuntos="12">
+        <grupo prp_us="1000" pw_ns="500" alcance_km="150"/>
+        <grupo prp_us="1250" pw_ns="500" alcance_km="187"/>
+      </barrido>
+    </procesamiento>
+  </volumen>
+  <volumen tipo="ppi" longitud_celda_m="250"/>
+</estrategia>
+"""
+
+
+def test_read_xml_estrategia2_intensidad(tmp_path):
+    path = tmp_path / "estrategia.xml"
+    path.write_text(XML)
+    info = read_xml_estrategia2(path, nvol=0, nsweep=0)
+    assert info == {
+        "scan_strategy": "ppi",
+        "processing_type": "intensidad",
+        "longitud_celda": "300",
+        "prp1": 800,
+        "pw1": 1000,
+        "max_range1": 120,
+        "npulses": 38,
+        "prp2": 0,
+        "pw2": 0,
+        "max_range2": 0,
+        "nconjuntos": 0,
+    }
+
+
+def test_read_xml_estrategia2_staggered(tmp_path):
+    path = tmp_path / "estrategia.xml"
+    path.write_text(XML)
+    info = read_xml_estrategia2(str(path), nvol=0, nsweep=1)
+    assert info["processing_type"] == "staggered"
+    # scan strategy attributes are taken from vol_list[nsweep]
+    assert info["longitud_celda"] == "250"
+    assert (info["prp1"], info["prp2"]) == (1000, 1250)
+    assert (info["max_range1"], info["max_range2"]) == (150, 187)
+    assert info["nconjuntos"] == 12
+    assert info["npulses"] == 0
+
+
+def test_read_xml_estrategia2_cache_returns_copies_and_tracks_mtime(tmp_path):
+    import os
+
+    path = tmp_path / "estrategia.xml"
+    path.write_text(XML)
+    first = read_xml_estrategia2(path)
+    first["prp1"] = -1
+    assert read_xml_estrategia2(path)["prp1"] == 800
+
+    path.write_text(XML.replace('prp_us="800"', 'prp_us="900"'))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert read_xml_estrategia2(path)["prp1"] == 900
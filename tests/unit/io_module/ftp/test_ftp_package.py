@@ -0,0 +1,159 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[4] / "src"
+
+
+def test_package_exports_resolve():
+    import radarlib.io.ftp as ftp_pkg
+    from radarlib.io.ftp import client, ftp, ftp_client
+
+    assert ftp_pkg.FTPClient is client.FTPClient
+    assert ftp_pkg.RadarFTPClientAsync is ftp_client.RadarFTPClientAsync
+    assert ftp_pkg.FTP_IsADirectoryError is ftp.FTP_IsADirectoryError
+    for name in ftp_pkg.__all__:
+        assert getattr(ftp_pkg, name) is not None
+        assert name in dir(ftp_pkg)
+
+    with pytest.raises(AttributeError):
+        ftp_pkg.does_not_exist
+
+
+def test_package_import_is_lazy():
+    code = (
+        "import sys, radarlib.io.ftp; "
+        "print(any(m in sys.modules for m in ('radarlib.io.ftp.client', 'radarlib.io.ftp.ftp_client')))"
+    )
+    env = {**os.environ, "PYART_QUIET": "1", "PYTHONPATH": str(SRC_DIR)}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_parse_ftp_path_splits_remote_path():
+    from datetime import datetime
+
+    from radarlib.io.ftp import parse_ftp_path
+
+    parsed = parse_ftp_path("/L2//RMA1/2025/09/25/00/0534/RMA1_0315_03_DBZH_20250925T000534Z.BUFR")
+
+    assert parsed == {
+        "radar_code": "RMA1",
+        "file_name": "RMA1_0315_03_DBZH_20250925T000534Z.BUFR",
+        "datetime": datetime(2025, 9, 25, 0, 5, 34),
+        "field_type": "DBZH",
+    }
+
+
+def test_build_ftp_path_from_filename():
+    from radarlib.io.ftp import build_ftp_path
+
+    fname = "RMA1_0315_03_DBZH_20250925T000534Z.BUFR"
+
+    from pathlib import PurePosixPath
+
+    assert build_ftp_path(fname, "/L2") == PurePosixPath(f"/L2/RMA1/2025/09/25/00/0534/{fname}")
+    assert str(build_ftp_path(fname)) == f"L2/RMA1/2025/09/25/00/0534/{fname}"
+    assert str(build_ftp_path(fname, "/")) == f"/RMA1/2025/09/25/00/0534/{fname}"
+    assert str(build_ftp_path(fname, "")) == f"RMA1/2025/09/25/00/0534/{fname}"
+    assert str(build_ftp_path(fname, "L2/")) == f"L2/RMA1/2025/09/25/00/0534/{fname}"
+    with pytest.raises(ValueError):
+        build_ftp_path("RMA1_0315_03_DBZH_20251325T000534Z.BUFR")
+    with pytest.raises(ValueError):
+        build_ftp_path("readme.txt")
+
+
+def test_exponential_backoff_retry_only_retries_transient_errors(monkeypatch):
+    import asyncio
+    import ftplib
+
+    from radarlib.io.ftp import ftp
+
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(ftp.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(ftp.random, "uniform", lambda a, b: 0)
+
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ftplib.error_temp("421 busy")
+        return "ok"
+
+    assert asyncio.run(ftp.exponential_backoff_retry(flaky, max_retries=5, base_delay=1, max_delay=60)) == "ok"
+    assert sleeps == [1, 2]
+
+    async def always_fails():
+        calls.append(1)
+        raise ConnectionResetError()
+
+    calls.clear()
+    sleeps.clear()
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(ftp.exponential_backoff_retry(always_fails, max_retries=4, base_delay=1, max_delay=3))
+    assert len(calls) == 4
+    assert sleeps == [1, 2, 3]
+
+    async def bug():
+        calls.append(1)
+        raise TypeError("not a network problem")
+
+    calls.clear()
+    with pytest.raises(TypeError):
+        asyncio.run(ftp.exponential_backoff_retry(bug, max_retries=5))
+    assert len(calls) == 1
+
+    class WrappedError(Exception):
+        pass
+
+    async def missing_file():
+        calls.append(1)
+        try:
+            raise ftplib.error_perm("550 No such file")
+        except ftplib.error_perm as e:
+            raise WrappedError(str(e))
+
+    # Permanent replies fail fast, also when wrapped in one of retry_on
+    calls.clear()
+    sleeps.clear()
+    with pytest.raises(WrappedError):
+        asyncio.run(ftp.exponential_backoff_retry(missing_file, max_retries=5, retry_on=(WrappedError,)))
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_ftp_connection_manager_only_sends_quit_on_clean_exit():
+    import ftplib
+    from unittest.mock import MagicMock, patch
+
+    from radarlib.io.ftp import ftp
+
+    conn = MagicMock()
+    with patch.object(ftp.ftplib, "FTP", return_value=conn):
+        with ftp.ftp_connection_manager("ftp.example.com", "user", "pass"):
+            pass
+        conn.quit.assert_called_once()
+        conn.close.assert_not_called()
+
+        # On an error the sockets are just closed and the original error is reported
+        conn.reset_mock()
+        with pytest.raises(ConnectionError, match="550"):
+            with ftp.ftp_connection_manager("ftp.example.com", "user", "pass"):
+                raise ftplib.error_perm("550 No such file")
+        conn.quit.assert_not_called()
+        conn.close.assert_called_once()
+
+        # A control channel that breaks on QUIT does not turn a clean exit into an error
+        conn.reset_mock()
+        conn.quit.side_effect = EOFError()
+        with ftp.ftp_connection_manager("ftp.example.com", "user", "pass"):
+            pass
+        conn.close.assert_called_once()
@@ -48,6 +48,97 @@ class TestSQLiteTrackerNewLocation:
 
         tracker.close()
 
+    def test_sqlite_tracker_filter_downloaded_batches(self, tmp_path):
+        """Test batched membership lookups across more names than one IN query holds."""
+        from radarlib.state import SQLiteStateTracker
+
+        tracker = SQLiteStateTracker(tmp_path / "state.db")
+        for i in range(0, 1200, 3):
+            tracker.mark_downloaded(f"file{i}.BUFR", f"/L2/file{i}.BUFR")
+        tracker.mark_failed("file1.BUFR", "/L2/file1.BUFR", "/tmp/file1.BUFR")
+
+        names = [f"file{i}.BUFR" for i in range(1200)]
+        downloaded = tracker.filter_downloaded(names)
+
+        assert downloaded == {f"file{i}.BUFR" for i in range(0, 1200, 3)}
+        assert tracker.filter_downloaded([]) == set()
+
+        tracker.close()
+
+    def test_sqlite_tracker_filter_downloaded_uses_filename_index(self, tmp_path):
+        """Test that a full IN batch probes the filename index instead of scanning by status."""
+        from radarlib.state import SQLiteStateTracker
+
+        tracker = SQLiteStateTracker(tmp_path / "state.db")
+        tracker.mark_downloaded_many({"filename": f"file{i}.BUFR", "remote_path": "/L2"} for i in range(1000))
+        conn = tracker._get_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        names = [f"new{i}.BUFR" for i in range(500)]
+
+        assert tracker.filter_downloaded(names) == set()
+
+        conn.set_trace_callback(None)
+        query = next(sql for sql in statements if sql.startswith("SELECT filename"))
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert "idx_status" not in plan
+        tracker.close()
+
+    def test_sqlite_tracker_latest_observation_datetime(self, tmp_path):
+        """Test the newest completed observation per radar, optionally within a range."""
+        from datetime import datetime
+
+        from radarlib.state import SQLiteStateTracker
+
+        tracker = SQLiteStateTracker(tmp_path / "state.db")
+        tracker.mark_downloaded_many(
+            {"filename": f"RMA1_{h}.BUFR", "remote_path": "/L2", "radar_name": "RMA1", "observation_datetime": dt}
+            for h, dt in [(1, "2024-01-01T01:00:00"), (5, "2024-01-01T05:00:00"), (3, "2024-01-01T03:00:00")]
+        )
+        failed = {"filename": "RMA1_9.BUFR", "remote_path": "/L2", "radar_name": "RMA1"}
+        tracker.mark_failed_many([dict(failed, observation_datetime="2024-01-01T09:00:00")])
+
+        assert tracker.get_latest_observation_datetime("RMA1") == "2024-01-01T05:00:00"
+        latest_before_4 = tracker.get_latest_observation_datetime("RMA1", end_date=datetime(2024, 1, 1, 4))
+        assert latest_before_4 == "2024-01-01T03:00:00"
+        assert tracker.get_latest_observation_datetime("RMA1", start_date=datetime(2024, 1, 1, 6)) is None
+        assert tracker.get_latest_observation_datetime("RMA2") is None
+        tracker.close()
+
+    def test_sqlite_tracker_mark_many_in_one_transaction(self, tmp_path):
+        """Test batched completed/failed writes and the WAL journal mode."""
+        from radarlib.state import SQLiteStateTracker
+
+        tracker = SQLiteStateTracker(tmp_path / "state.db")
+        tracker.mark_downloaded_many(
+            {"filename": f"file{i}.BUFR", "remote_path": f"/L2/file{i}.BUFR", "file_size": i, "radar_name": "RMA1"}
+            for i in range(3)
+        )
+        tracker.mark_failed_many([{"filename": "bad.BUFR", "remote_path": "/L2/bad.BUFR"}])
+        tracker.mark_failed_many([])
+
+        assert tracker.count() == 3
+        assert tracker.count(status="failed") == 1
+        assert tracker.get_file_info("file2.BUFR")["file_size"] == 2
+        assert tracker.get_file_info("file2.BUFR")["radar_name"] == "RMA1"
+        assert tracker._get_connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        tracker.close()
+
+    def test_sqlite_tracker_calculate_checksum(self, tmp_path):
+        """Test checksums of files spanning several read blocks and of empty files."""
+        import hashlib
+
+        from radarlib.state import SQLiteStateTracker
+
+        data = bytes(range(256)) * 9000
+        path = tmp_path / "file.BUFR"
+        path.write_bytes(data)
+        empty = tmp_path / "empty.BUFR"
+        empty.write_bytes(b"")
+
+        assert SQLiteStateTracker.calculate_checksum(path) == hashlib.sha256(data).hexdigest()
+        assert SQLiteStateTracker.calculate_checksum(empty) == hashlib.sha256(b"").hexdigest()
 
 class TestFileTrackerNewLocation:
     """Tests for FileStateTracker using the new location."""
@@ -72,3 +163,12 @@ class TestFileTrackerNewLocation:
 
         assert tracker.is_downloaded("file1.BUFR")
         assert tracker.count() == 1
+
+    def test_file_tracker_filter_downloaded(self, tmp_path):
+        """Test returning the already-downloaded subset of a listing."""
+        from radarlib.state import FileStateTracker
+
+        tracker = FileStateTracker(tmp_path / "state.json")
+        tracker.mark_downloaded("file1.BUFR", "/L2/file1.BUFR")
+
+        assert tracker.filter_downloaded(["file1.BUFR", "file2.BUFR"]) == {"file1.BUFR"}
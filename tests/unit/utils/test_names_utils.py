@@ -187,3 +187,24 @@ class TestTimezones:
         """Test that Argentina timezone constant is defined."""
         assert hasattr(names_utils, "tz_arg")
         assert names_utils.tz_arg is not None
+
+
+class TestBuildVolTypesRegex:
+    """Test build_vol_types_regex function."""
+
+    def test_matches_only_listed_combinations(self):
+        """Test that only vol_code/vol_nr/field combinations in vol_types match."""
+        vol_types = {"0302": {"01": ["TH", "TV", "DBZH"]}, "0303": {"01": ["RHOHV", "KDP"], "02": ["VRAD"]}}
+        regex = names_utils.build_vol_types_regex(vol_types)
+
+        assert regex.match("RMA11_0302_01_TH_20251120T120000Z.BUFR")
+        assert regex.match("RMA11_0303_02_VRAD_20251120T120000Z.bufr")
+        assert not regex.match("RMA11_0302_01_ZDR_20251120T120000Z.BUFR")
+        assert not regex.match("RMA11_0303_01_VRAD_20251120T120000Z.BUFR")
+        assert not regex.match("RMA11_0302_01_THX_20251120T120000Z.BUFR")
+        assert not regex.match("RMA11_0302_01_TH_20251120T120000Z.nc")
+
+    def test_empty_vol_types(self):
+        """Test that empty vol_types (or empty field lists) give no regex."""
+        assert names_utils.build_vol_types_regex({}) is None
+        assert names_utils.build_vol_types_regex({"0302": {"01": []}}) is None